@@ -7,6 +7,8 @@ from typing import Optional
 from datetime import datetime, timedelta
 import json
 
+from services.analytics_store import analytics_store
+
 router = APIRouter()
 
 class SearchEvent(BaseModel):
@@ -29,20 +31,12 @@ class AnalyticsResponse(BaseModel):
     total_map_loads: int
     map_loads_by_day: list
 
-# In-memory analytics store (in production, use Redis or database)
-analytics_store = {
-    'searches': [],
-    'map_loads': [],
-    'filter_usage': {},
-    'municipality_searches': {},
-    'total_results': 0
-}
-
 @router.post("/track-search")
 async def track_search(event: SearchEvent, request: Request):
     """Track a search event for analytics"""
-    # Store search event
-    analytics_store['searches'].append({
+    # Store search event (filter/municipality counters are updated with it; only the
+    # most recent searches are kept)
+    analytics_store.record_search({
         'timestamp': datetime.now().isoformat(),
         'query': event.query,
         'filter_type': event.filter_type,
@@ -51,22 +45,6 @@ async def track_search(event: SearchEvent, request: Request):
         'ip': request.client.host if request.client else None
     })
     
-    # Track filter usage
-    if event.filter_type:
-        analytics_store['filter_usage'][event.filter_type] = \
-            analytics_store['filter_usage'].get(event.filter_type, 0) + 1
-    
-    # Track municipality searches
-    if event.municipality:
-        analytics_store['municipality_searches'][event.municipality] = \
-            analytics_store['municipality_searches'].get(event.municipality, 0) + 1
-    
-    analytics_store['total_results'] += event.result_count
-    
-    # Keep only last 1000 searches in memory
-    if len(analytics_store['searches']) > 1000:
-        analytics_store['searches'] = analytics_store['searches'][-1000:]
-    
     return {"status": "tracked"}
 
 @router.post("/track-map-load")
@@ -87,11 +65,8 @@ async def track_map_load(event: MapLoadEvent, request: Request):
         map_load_data['fallback'] = True
         print(f"⚠️ Map fallback tracked: {event.fallback_reason}")
     
-    analytics_store['map_loads'].append(map_load_data)
-    
-    # Keep only last 5000 map loads in memory
-    if len(analytics_store['map_loads']) > 5000:
-        analytics_store['map_loads'] = analytics_store['map_loads'][-5000:]
+    # Only the most recent map loads are kept
+    analytics_store.record_map_load(map_load_data)
     
     return {"status": "tracked"}
 
@@ -104,10 +79,7 @@ async def get_analytics(
     cutoff_date = datetime.now() - timedelta(days=days)
     
     # Filter recent searches
-    recent_searches = [
-        s for s in analytics_store['searches']
-        if datetime.fromisoformat(s['timestamp']) >= cutoff_date
-    ]
+    recent_searches = analytics_store.searches_since(cutoff_date)
     
     total_searches = len(recent_searches)
     
@@ -118,24 +90,13 @@ async def get_analytics(
         avg_results = total_results / total_searches
     
     # Get popular filters
-    popular_filters = sorted(
-        analytics_store['filter_usage'].items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:10]
+    popular_filters = analytics_store.top_counts('filter_usage', 10)
     
     # Get popular municipalities
-    popular_municipalities = sorted(
-        analytics_store['municipality_searches'].items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:10]
+    popular_municipalities = analytics_store.top_counts('municipality_searches', 10)
     
     # Filter recent map loads
-    recent_map_loads = [
-        m for m in analytics_store['map_loads']
-        if datetime.fromisoformat(m['timestamp']) >= cutoff_date
-    ]
+    recent_map_loads = analytics_store.map_loads_since(cutoff_date)
     
     total_map_loads = len(recent_map_loads)
     
@@ -165,10 +126,7 @@ async def get_popular_searches(days: int = 7):
     """Get popular search queries"""
     cutoff_date = datetime.now() - timedelta(days=days)
     
-    recent_searches = [
-        s for s in analytics_store['searches']
-        if datetime.fromisoformat(s['timestamp']) >= cutoff_date and s['query']
-    ]
+    recent_searches = [s for s in analytics_store.searches_since(cutoff_date) if s['query']]
     
     # Count query frequency
     query_counts = {}
@@ -186,10 +144,7 @@ async def get_map_usage(days: int = 30):
     """Get map usage statistics for cost estimation"""
     cutoff_date = datetime.now() - timedelta(days=days)
     
-    recent_map_loads = [
-        m for m in analytics_store['map_loads']
-        if datetime.fromisoformat(m['timestamp']) >= cutoff_date
-    ]
+    recent_map_loads = analytics_store.map_loads_since(cutoff_date)
     
     total_loads = len(recent_map_loads)
     
@@ -1,17 +1,21 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct, or_, text
-from sqlalchemy.exc import OperationalError
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, distinct, or_, select, text
 from typing import List, Optional
-import json
-from datetime import datetime
-from pathlib import Path
-from database import get_db
-from models import Property
+import asyncio
+import functools
+import logging
+from database import get_async_read_db, async_read_session
+from models import Property, DistinctAddress, DistinctOwner, DistinctOwnerMailing
 from pydantic import BaseModel
 from services.options_cache import options_cache
+from services.query_cancellation import TaskCanceller, wait_or_cancel
+from services.statement_cache import any_of
+from services.statement_timeouts import StatementTimeout, statement_timeouts
+from services.tracing import trace
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 class AutocompleteSuggestion(BaseModel):
     type: str  # 'address', 'town', 'state', 'owner', or 'owner_address'
@@ -25,81 +29,53 @@ class AutocompleteSuggestion(BaseModel):
 class AutocompleteResponse(BaseModel):
     suggestions: List[AutocompleteSuggestion]
 
-@router.get("/", response_model=AutocompleteResponse)
-async def autocomplete(
-    q: str = Query(..., min_length=2, description="Search query"),
-    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
-    search_type: Optional[str] = Query(None, description="Limit to: address, town, owner, owner_address, or address_town (address + town only). Omit for all types (slower)."),
-    municipality: Optional[str] = Query(None, description="Filter suggestions to these towns (comma-separated). When set, address/owner suggestions are scoped to selected town(s)."),
-    db: Session = Depends(get_db)
-):
-    """
-    Autocomplete suggestions for addresses, towns, and owners.
-    Use search_type=address|town|owner|address_town to run fewer queries (faster). Omit for all.
-    address_town = address and town only (no owner), for a combined main search bar.
-    When municipality is set, address and owner suggestions are limited to those towns.
-    """
-    suggestions: List[AutocompleteSuggestion] = []
-    search_term = f"%{q}%"
-    want_address = search_type is None or search_type == "address" or search_type == "address_town"
-    want_town = search_type is None or search_type == "town" or search_type == "address_town"
-    want_owner = search_type is None or search_type == "owner"
-    want_owner_address_only = search_type == "owner_address"
+# Per-source time budgets (seconds). Each source runs concurrently on its own pooled async
+# connection with a matching statement_timeout, so a source that misses its budget is
+# cancelled in Postgres too instead of holding the connection after we stop waiting.
+SOURCE_BUDGET_SECONDS = {
+    "address": 2.0,
+    "town": 2.0,
+    "owner": 2.0,
+    "owner_address": 2.0,
+    "state": 1.0,
+    "fuzzy": 1.5,
+}
+# Overall deadline for one autocomplete request: return whatever finished by then
+AUTOCOMPLETE_DEADLINE_SECONDS = 2.5
 
-    # Normalize municipality filter: comma-separated list, stripped, lowercased for filtering
-    municipality_filter = None
-    if municipality and str(municipality).strip():
-        municipality_filter = [m.strip().lower() for m in str(municipality).split(",") if m.strip()]
+# Minimum pg_trgm word similarity (0-1) for a fuzzy match; pg_trgm's default of 0.6 misses
+# common typos in short queries ("Torington", "Pearl Stret")
+FUZZY_WORD_SIMILARITY_THRESHOLD = 0.4
 
-    # Get matching addresses (only when type is None or address)
-    if want_address:
-        # Match "224 oak ave torrington" against address + municipality (e.g. "224 OAK AVE" + "Torrington")
-        address_plus_town = func.concat(
-            func.coalesce(Property.address, ''),
-            ' ',
-            func.coalesce(Property.municipality, '')
-        )
-        # Use first property's centroid instead of averaging all (more accurate for specific addresses)
-        # This prevents incorrect centers when multiple properties with same address exist in different locations
-        address_filters = [
-            or_(Property.address.ilike(search_term), address_plus_town.ilike(search_term)),
-            Property.address.isnot(None),
-            Property.address != ''
-        ]
-        if municipality_filter:
-            address_filters.append(func.lower(func.trim(Property.municipality)).in_(municipality_filter))
-        address_subquery = db.query(
-            Property.address,
-            Property.municipality,
-            func.min(Property.id).label('first_property_id'),
-            func.count(Property.id).label('count')
-        ).filter(
-            *address_filters
-        ).group_by(
-            Property.address,
-            Property.municipality
-        ).having(
-            func.count(Property.id) > 0
-        ).subquery()
-
-        address_results = db.query(
-            address_subquery.c.address,
-            address_subquery.c.municipality,
-            address_subquery.c.count,
-            func.ST_Y(func.ST_Centroid(Property.geometry)).label('center_lat'),
-            func.ST_X(func.ST_Centroid(Property.geometry)).label('center_lng')
-        ).join(
-            Property, Property.id == address_subquery.c.first_property_id
-        ).order_by(
-            address_subquery.c.count.desc()
-        ).limit(limit).all()
-
-        for result in address_results:
-            # Log for debugging Bridgeport vs Torrington
-            log_data = {
-            "location": "autocomplete.py:55",
-            "message": "Address autocomplete result",
-            "data": {
+
+def _municipality_clause(municipality_filter: List[str]):
+    return Property.municipality_norm == any_of(municipality_filter)
+
+
+async def _address_suggestions(db: AsyncSession, q: str, municipality_filter: Optional[List[str]], limit: int) -> List[AutocompleteSuggestion]:
+    """Addresses matching q, from the distinct_addresses dictionary (one row per address and town)."""
+    search_term = f"%{q}%"
+    # search_text is "address municipality", so "224 oak ave torrington" matches "224 OAK AVE" in Torrington
+    query = select(
+        DistinctAddress.address,
+        DistinctAddress.municipality,
+        DistinctAddress.property_count.label('count'),
+        DistinctAddress.center_lat,
+        DistinctAddress.center_lng
+    ).filter(
+        DistinctAddress.search_text.ilike(search_term)
+    )
+    if municipality_filter:
+        query = query.filter(func.lower(DistinctAddress.municipality) == any_of(municipality_filter))
+    address_results = (await db.execute(query.order_by(DistinctAddress.property_count.desc()).limit(limit))).all()
+
+    suggestions = []
+    for result in address_results:
+        # Trace for debugging Bridgeport vs Torrington (no-op unless TRACE_LEVEL is set)
+        trace(
+            "autocomplete.address",
+            "Address autocomplete result",
+            lambda result=result: {
                 "query": q,
                 "address": result.address,
                 "municipality": result.municipality,
@@ -107,260 +83,402 @@ async def autocomplete(
                 "center_lat": float(result.center_lat) if result.center_lat else None,
                 "center_lng": float(result.center_lng) if result.center_lng else None,
             },
-            "timestamp": int(datetime.now().timestamp() * 1000),
-            "sessionId": "debug-session",
-            "runId": "run1",
-            "hypothesisId": "F"
-            }
-            try:
-                log_file = Path("/Users/jacobmermelstein/Desktop/CT Maps/.cursor/debug.log")
-                with open(log_file, "a") as f:
-                    f.write(json.dumps(log_data) + "\n")
-            except:
-                pass  # Don't fail if logging fails
-
-            suggestions.append(AutocompleteSuggestion(
-                type='address',
-                value=result.address,
-                display=f"{result.address}, {result.municipality or 'CT'}" if result.municipality else result.address,
-                count=result.count,
-                center_lat=float(result.center_lat) if result.center_lat else None,
-                center_lng=float(result.center_lng) if result.center_lng else None,
-                municipality=(result.municipality or '').strip() or None
-            ))
-
-    # Get matching towns/municipalities (only when type is None or town)
-    # Group by TRIM(municipality) so "Danbury" and "Danbury " show as one suggestion with combined count
-    if want_town:
-        town_filters = [
-            Property.municipality.ilike(search_term),
-            Property.municipality.isnot(None),
-            func.trim(Property.municipality) != ''
-        ]
-        if municipality_filter:
-            town_filters.append(func.lower(func.trim(Property.municipality)).in_(municipality_filter))
-        town_results = db.query(
-            func.trim(Property.municipality).label('municipality'),
-            func.count(Property.id).label('count'),
-            func.ST_Y(func.ST_Centroid(func.ST_Collect(Property.geometry))).label('center_lat'),
-            func.ST_X(func.ST_Centroid(func.ST_Collect(Property.geometry))).label('center_lng')
-        ).filter(
-            *town_filters
-        ).group_by(
-            func.trim(Property.municipality)
-        ).order_by(
-            func.count(Property.id).desc()
-        ).limit(limit).all()
-
-        for result in town_results:
-            suggestions.append(AutocompleteSuggestion(
-                type='town',
-                value=result.municipality or '',
-                display=f"{result.municipality}, CT ({result.count:,} properties)",
-                count=result.count,
-                center_lat=float(result.center_lat) if result.center_lat else None,
-                center_lng=float(result.center_lng) if result.center_lng else None
-            ))
-
-    # Get matching owner mailing addresses only (when search_type=owner_address)
-    if want_owner_address_only:
-        owner_addr_filters = [
-            or_(
-                Property.owner_address.ilike(search_term),
-                func.concat(
-                    func.coalesce(Property.owner_address, ''),
-                    ', ',
-                    func.coalesce(Property.owner_city, ''),
-                    ', ',
-                    func.coalesce(Property.owner_state, '')
-                ).ilike(search_term)
-            ),
-            Property.owner_address.isnot(None),
-            Property.owner_address != ''
-        ]
-        if municipality_filter:
-            owner_addr_filters.append(func.lower(func.trim(Property.municipality)).in_(municipality_filter))
-        owner_address_results = db.query(
-            Property.owner_address,
-            Property.owner_city,
-            Property.owner_state,
+        )
+
+        suggestions.append(AutocompleteSuggestion(
+            type='address',
+            value=result.address,
+            display=f"{result.address}, {result.municipality or 'CT'}" if result.municipality else result.address,
+            count=result.count,
+            center_lat=float(result.center_lat) if result.center_lat else None,
+            center_lng=float(result.center_lng) if result.center_lng else None,
+            municipality=(result.municipality or '').strip() or None
+        ))
+    return suggestions
+
+
+async def _town_suggestions(db: AsyncSession, q: str, municipality_filter: Optional[List[str]], limit: int) -> List[AutocompleteSuggestion]:
+    """Towns matching q. Grouped by TRIM(municipality) so "Danbury" and "Danbury " show as one suggestion."""
+    search_term = f"%{q}%"
+    town_filters = [
+        Property.municipality.ilike(search_term),
+        Property.municipality.isnot(None),
+        func.trim(Property.municipality) != ''
+    ]
+    if municipality_filter:
+        town_filters.append(_municipality_clause(municipality_filter))
+    town_results = (await db.execute(select(
+        func.trim(Property.municipality).label('municipality'),
+        func.count(Property.id).label('count'),
+        func.ST_Y(func.ST_Centroid(func.ST_Collect(Property.geometry))).label('center_lat'),
+        func.ST_X(func.ST_Centroid(func.ST_Collect(Property.geometry))).label('center_lng')
+    ).filter(
+        *town_filters
+    ).group_by(
+        func.trim(Property.municipality)
+    ).order_by(
+        func.count(Property.id).desc()
+    ).limit(limit))).all()
+
+    return [
+        AutocompleteSuggestion(
+            type='town',
+            value=result.municipality or '',
+            display=f"{result.municipality}, CT ({result.count:,} properties)",
+            count=result.count,
+            center_lat=float(result.center_lat) if result.center_lat else None,
+            center_lng=float(result.center_lng) if result.center_lng else None
+        )
+        for result in town_results
+    ]
+
+
+async def _owner_name_suggestions(db: AsyncSession, q: str, municipality_filter: Optional[List[str]], limit: int) -> List[AutocompleteSuggestion]:
+    """Owner names matching q. Statewide counts come from distinct_owners; town-scoped counts are grouped live."""
+    search_term = f"%{q}%"
+    if municipality_filter:
+        # distinct_owners counts span all towns, so per-town counts still need the properties table
+        owner_name_results = (await db.execute(select(
+            Property.owner_name,
             func.count(Property.id).label('count'),
             func.ST_Y(func.ST_Centroid(func.ST_Collect(Property.geometry))).label('center_lat'),
             func.ST_X(func.ST_Centroid(func.ST_Collect(Property.geometry))).label('center_lng')
         ).filter(
-            *owner_addr_filters
-        ).group_by(
-            Property.owner_address,
-            Property.owner_city,
-            Property.owner_state
-        ).having(
-            func.count(Property.id) > 0
-        ).order_by(
-            func.count(Property.id).desc()
-        ).limit(limit).all()
-
-        for result in owner_address_results:
-            address_parts = [result.owner_address]
-            if result.owner_city:
-                address_parts.append(result.owner_city)
-            if result.owner_state:
-                address_parts.append(result.owner_state)
-            full_address = ', '.join(address_parts)
-
-            suggestions.append(AutocompleteSuggestion(
-                type='owner_address',
-                value=full_address,
-                display=f"{full_address} ({result.count} properties)",
-                count=result.count,
-                center_lat=float(result.center_lat) if result.center_lat else None,
-                center_lng=float(result.center_lng) if result.center_lng else None
-            ))
-
-    # Get matching owner names (only when type is None or owner; skip when owner_address only)
-    if want_owner and not want_owner_address_only:
-        owner_name_filters = [
             Property.owner_name.ilike(search_term),
             Property.owner_name.isnot(None),
-            Property.owner_name != ''
-        ]
-        if municipality_filter:
-            owner_name_filters.append(func.lower(func.trim(Property.municipality)).in_(municipality_filter))
-        owner_name_results = db.query(
-            Property.owner_name,
-            func.count(Property.id).label('count'),
-            func.ST_Y(func.ST_Centroid(func.ST_Collect(Property.geometry))).label('center_lat'),
-            func.ST_X(func.ST_Centroid(func.ST_Collect(Property.geometry))).label('center_lng')
-        ).filter(
-            *owner_name_filters
+            Property.owner_name != '',
+            _municipality_clause(municipality_filter)
         ).group_by(
             Property.owner_name
-        ).having(
-            func.count(Property.id) > 0
         ).order_by(
             func.count(Property.id).desc()
-        ).limit(5).all()
-
-        for result in owner_name_results:
-            suggestions.append(AutocompleteSuggestion(
-                type='owner',
-                value=result.owner_name,
-                display=f"{result.owner_name} ({result.count} properties)",
-                count=result.count,
-                center_lat=float(result.center_lat) if result.center_lat else None,
-                center_lng=float(result.center_lng) if result.center_lng else None
-            ))
-
-        # Get matching owner mailing addresses (same request as owner)
-        owner_addr_filters_owner = [
-            or_(
-                Property.owner_address.ilike(search_term),
-                func.concat(
-                    func.coalesce(Property.owner_address, ''),
-                    ', ',
-                    func.coalesce(Property.owner_city, ''),
-                    ', ',
-                    func.coalesce(Property.owner_state, '')
-                ).ilike(search_term)
-            ),
-            Property.owner_address.isnot(None),
-            Property.owner_address != ''
-        ]
-        if municipality_filter:
-            owner_addr_filters_owner.append(func.lower(func.trim(Property.municipality)).in_(municipality_filter))
-        owner_address_results = db.query(
+        ).limit(limit))).all()
+    else:
+        owner_name_results = (await db.execute(select(
+            DistinctOwner.owner_name,
+            DistinctOwner.property_count.label('count'),
+            DistinctOwner.center_lat,
+            DistinctOwner.center_lng
+        ).filter(
+            DistinctOwner.owner_name.ilike(search_term)
+        ).order_by(
+            DistinctOwner.property_count.desc()
+        ).limit(limit))).all()
+
+    return [
+        AutocompleteSuggestion(
+            type='owner',
+            value=result.owner_name,
+            display=f"{result.owner_name} ({result.count} properties)",
+            count=result.count,
+            center_lat=float(result.center_lat) if result.center_lat else None,
+            center_lng=float(result.center_lng) if result.center_lng else None
+        )
+        for result in owner_name_results
+    ]
+
+
+async def _owner_address_suggestions(db: AsyncSession, q: str, municipality_filter: Optional[List[str]], limit: int) -> List[AutocompleteSuggestion]:
+    """
+    Owner mailing addresses matching q (address column or full "address, city, state").
+    Statewide counts come from distinct_owner_mailing; town-scoped counts are grouped live.
+    """
+    search_term = f"%{q}%"
+    if municipality_filter:
+        full_address = func.concat_ws(
+            ', ',
             Property.owner_address,
-            Property.owner_city,
-            Property.owner_state,
+            func.nullif(Property.owner_city, ''),
+            func.nullif(Property.owner_state, '')
+        )
+        owner_address_results = (await db.execute(select(
+            full_address.label('full_address'),
             func.count(Property.id).label('count'),
             func.ST_Y(func.ST_Centroid(func.ST_Collect(Property.geometry))).label('center_lat'),
             func.ST_X(func.ST_Centroid(func.ST_Collect(Property.geometry))).label('center_lng')
         ).filter(
-            *owner_addr_filters_owner
+            full_address.ilike(search_term),
+            Property.owner_address.isnot(None),
+            Property.owner_address != '',
+            _municipality_clause(municipality_filter)
         ).group_by(
             Property.owner_address,
             Property.owner_city,
             Property.owner_state
-        ).having(
-            func.count(Property.id) > 0
         ).order_by(
             func.count(Property.id).desc()
-        ).limit(5).all()
-
-        for result in owner_address_results:
-            address_parts = [result.owner_address]
-            if result.owner_city:
-                address_parts.append(result.owner_city)
-            if result.owner_state:
-                address_parts.append(result.owner_state)
-            full_address = ', '.join(address_parts)
-
-            suggestions.append(AutocompleteSuggestion(
-                type='owner_address',
-                value=full_address,
-                display=f"{full_address} ({result.count} properties)",
-                count=result.count,
-                center_lat=float(result.center_lat) if result.center_lat else None,
-                center_lng=float(result.center_lng) if result.center_lng else None
-            ))
-
-    # Add state suggestions (CT, Connecticut) when full search or address_town
-    if search_type is None or search_type == "address_town":
+        ).limit(limit))).all()
+    else:
+        owner_address_results = (await db.execute(select(
+            DistinctOwnerMailing.full_address,
+            DistinctOwnerMailing.property_count.label('count'),
+            DistinctOwnerMailing.center_lat,
+            DistinctOwnerMailing.center_lng
+        ).filter(
+            DistinctOwnerMailing.full_address.ilike(search_term)
+        ).order_by(
+            DistinctOwnerMailing.property_count.desc()
+        ).limit(limit))).all()
+
+    return [
+        AutocompleteSuggestion(
+            type='owner_address',
+            value=result.full_address,
+            display=f"{result.full_address} ({result.count} properties)",
+            count=result.count,
+            center_lat=float(result.center_lat) if result.center_lat else None,
+            center_lng=float(result.center_lng) if result.center_lng else None
+        )
+        for result in owner_address_results
+    ]
+
+
+async def _state_suggestions(db: AsyncSession, q: str, municipality_filter: Optional[List[str]], limit: int) -> List[AutocompleteSuggestion]:
+    """Connecticut itself (CT, Conn, Connecticut) with the total property count."""
+    total_count = (await db.scalar(select(func.count(Property.id)))) or 0
+    if total_count <= 0:
+        return []
+    return [AutocompleteSuggestion(
+        type='state',
+        value='CT',
+        display=f'Connecticut ({total_count:,} properties)',
+        count=total_count,
+        center_lat=41.6,
+        center_lng=-72.7
+    )]
+
+
+# Fuzzy lookup per suggestion kind: each is a KNN scan of one dictionary's GiST trigram index.
+# Towns come from distinct_addresses.municipality (a few hundred groups after the index filter).
+_FUZZY_QUERIES = {
+    "address": """
+        SELECT 'address' AS kind, address AS value, municipality, property_count,
+               center_lat, center_lng, :q <<-> search_text AS distance
+        FROM distinct_addresses
+        WHERE :q <% search_text {municipality_scope}
+        ORDER BY :q <<-> search_text
+        LIMIT :limit
+    """,
+    "town": """
+        SELECT 'town' AS kind, municipality AS value, municipality, SUM(property_count) AS property_count,
+               AVG(center_lat) AS center_lat, AVG(center_lng) AS center_lng, MIN(:q <<-> municipality) AS distance
+        FROM distinct_addresses
+        WHERE :q <% municipality {municipality_scope}
+        GROUP BY municipality
+        ORDER BY distance
+        LIMIT :limit
+    """,
+    "owner": """
+        SELECT 'owner' AS kind, owner_name AS value, NULL AS municipality, property_count,
+               center_lat, center_lng, :q <<-> owner_name AS distance
+        FROM distinct_owners
+        WHERE :q <% owner_name
+        ORDER BY :q <<-> owner_name
+        LIMIT :limit
+    """,
+    "owner_address": """
+        SELECT 'owner_address' AS kind, full_address AS value, NULL AS municipality, property_count,
+               center_lat, center_lng, :q <<-> full_address AS distance
+        FROM distinct_owner_mailing
+        WHERE :q <% full_address
+        ORDER BY :q <<-> full_address
+        LIMIT :limit
+    """,
+}
+
+
+async def _fuzzy_suggestions(db: AsyncSession, q: str, municipality_filter: Optional[List[str]], limit: int, kinds: List[str]) -> List[AutocompleteSuggestion]:
+    """
+    Typo-tolerant suggestions from the dictionary tables.
+    Uses pg_trgm word similarity (<%) with KNN ordering (<<->) so each GiST trigram index
+    returns its closest keys directly; results come back ordered by similarity across kinds.
+    """
+    await db.execute(text(f"SET LOCAL pg_trgm.word_similarity_threshold = {FUZZY_WORD_SIMILARITY_THRESHOLD}"))
+    if municipality_filter:
+        # Owner dictionaries are not tied to one town, so they cannot be scoped
+        kinds = [k for k in kinds if k in ("address", "town")]
+        if not kinds:
+            return []
+    params = {"q": q, "limit": limit}
+    municipality_scope = ""
+    if municipality_filter:
+        municipality_scope = "AND LOWER(municipality) = ANY(:municipalities)"
+        params["municipalities"] = municipality_filter
+    union = " UNION ALL ".join(
+        f"({_FUZZY_QUERIES[kind].format(municipality_scope=municipality_scope)})" for kind in kinds
+    )
+    rows = (await db.execute(text(f"""
+        SELECT kind, value, municipality, property_count, center_lat, center_lng
+        FROM ({union}) matches
+        ORDER BY distance
+        LIMIT :limit
+    """), params)).fetchall()
+
+    suggestions = []
+    for row in rows:
+        if row.kind == 'address':
+            display = f"{row.value}, {row.municipality}" if row.municipality else row.value
+        elif row.kind == 'town':
+            display = f"{row.value}, CT ({row.property_count:,} properties)"
+        else:
+            display = f"{row.value} ({row.property_count} properties)"
+        suggestions.append(AutocompleteSuggestion(
+            type=row.kind,
+            value=row.value,
+            display=display,
+            count=row.property_count,
+            center_lat=float(row.center_lat) if row.center_lat is not None else None,
+            center_lng=float(row.center_lng) if row.center_lng is not None else None,
+            municipality=row.municipality if row.kind == 'address' else None
+        ))
+    return suggestions
+
+
+async def _run_source(source, budget_seconds: float, q: str, municipality_filter: Optional[List[str]], limit: int) -> List[AutocompleteSuggestion]:
+    """Run one suggestion source on its own async session (cancelling the task cancels its statement)."""
+    async with async_read_session() as db:
+        async with statement_timeouts.scope(db, "autocomplete", budget_ms=int(budget_seconds * 1000)):
+            return await source(db, q, municipality_filter, limit)
+
+
+async def _collect_sources(request: Request, sources, q: str, municipality_filter: Optional[List[str]]) -> List[AutocompleteSuggestion]:
+    """
+    Run (name, source, limit) entries concurrently and return their suggestions in source
+    order, without duplicates. Sources that fail or miss their budget are left out.
+    If the client disconnects (user kept typing), all running source queries are cancelled.
+    """
+    futures = [
+        asyncio.ensure_future(asyncio.wait_for(
+            _run_source(source, SOURCE_BUDGET_SECONDS[name], q, municipality_filter, source_limit),
+            timeout=SOURCE_BUDGET_SECONDS[name]
+        ))
+        for name, source, source_limit in sources
+    ]
+    missed = set()
+    if futures:
+        _done, missed = await wait_or_cancel(request, TaskCanceller(futures), futures, timeout=AUTOCOMPLETE_DEADLINE_SECONDS)
+        for future in missed:
+            future.cancel()
+        if missed:
+            # A cancelled task is still pending until it has unwound (statement cancelled,
+            # session closed); wait for that before reading any results
+            await asyncio.wait(missed)
+
+    suggestions: List[AutocompleteSuggestion] = []
+    seen = set()
+    for (name, _source, _limit), future in zip(sources, futures):
+        if future in missed:
+            logger.warning("Autocomplete source %s missed the %.1fs deadline", name, AUTOCOMPLETE_DEADLINE_SECONDS)
+            if not future.cancelled():
+                future.exception()  # Retrieved so asyncio does not log it
+            continue
+        exc = future.exception()
+        if exc is not None:
+            logger.warning("Autocomplete source %s dropped: %s", name, type(exc).__name__ if isinstance(exc, asyncio.TimeoutError) else exc)
+            continue
+        for suggestion in future.result():
+            key = (suggestion.type, suggestion.value.lower(), (suggestion.municipality or '').lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            suggestions.append(suggestion)
+    return suggestions
+
+
+@router.get("/", response_model=AutocompleteResponse)
+async def autocomplete(
+    request: Request,
+    q: str = Query(..., min_length=2, description="Search query"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+    search_type: Optional[str] = Query(None, description="Limit to: address, town, owner, owner_address, or address_town (address + town only). Omit for all types (slower)."),
+    municipality: Optional[str] = Query(None, description="Filter suggestions to these towns (comma-separated). When set, address/owner suggestions are scoped to selected town(s)."),
+    fuzzy: Optional[bool] = Query(None, description="true = typo-tolerant trigram matching only; false = substring matching only. Omit to fall back to fuzzy matching when nothing contains the query."),
+):
+    """
+    Autocomplete suggestions for addresses, towns, and owners.
+    Use search_type=address|town|owner|address_town to run fewer queries (faster). Omit for all.
+    address_town = address and town only (no owner), for a combined main search bar.
+    When municipality is set, address and owner suggestions are limited to those towns.
+    Sources run concurrently, each with its own time budget; sources that have not finished
+    by the deadline are left out instead of delaying the response, and all of them are
+    cancelled in Postgres if the client disconnects.
+    Address and statewide owner suggestions read the deduplicated dictionary tables
+    (distinct_addresses, distinct_owners, distinct_owner_mailing) instead of grouping every parcel.
+    Fuzzy matching ("Torington", "Pearl Stret") is a trigram index lookup on those dictionaries.
+    """
+    want_address = search_type is None or search_type == "address" or search_type == "address_town"
+    want_town = search_type is None or search_type == "town" or search_type == "address_town"
+    want_owner = search_type is None or search_type == "owner"
+    want_owner_address = search_type is None or search_type == "owner" or search_type == "owner_address"
+    want_state = search_type is None or search_type == "address_town"
+    fuzzy_kinds = [
+        kind for kind, wanted in (
+            ("address", want_address), ("town", want_town),
+            ("owner", want_owner), ("owner_address", want_owner_address),
+        ) if wanted
+    ]
+
+    # Normalize municipality filter: comma-separated list, stripped, lowercased for filtering
+    municipality_filter = None
+    if municipality and str(municipality).strip():
+        municipality_filter = [m.strip().lower() for m in str(municipality).split(",") if m.strip()]
+
+    # (name, source, limit) - one entry per source; owner + owner_address share the owner limit of 5
+    sources = []
+    if want_address:
+        sources.append(("address", _address_suggestions, limit))
+    if want_town:
+        sources.append(("town", _town_suggestions, limit))
+    if want_owner:
+        sources.append(("owner", _owner_name_suggestions, 5))
+    if want_owner_address:
+        sources.append(("owner_address", _owner_address_suggestions, limit if search_type == "owner_address" else 5))
+    if want_state:
         state_query = q.upper().strip()
         if state_query in ['CT', 'CONN', 'CONNECTICUT'] or 'connecticut' in q.lower():
-            total_count = db.query(func.count(Property.id)).scalar() or 0
-            if total_count > 0:
-                suggestions.append(AutocompleteSuggestion(
-                    type='state',
-                    value='CT',
-                    display=f'Connecticut ({total_count:,} properties)',
-                    count=total_count,
-                    center_lat=41.6,
-                    center_lng=-72.7
-                ))
+            sources.append(("state", _state_suggestions, 1))
+
+    fuzzy_source = ("fuzzy", functools.partial(_fuzzy_suggestions, kinds=fuzzy_kinds), limit)
+    if fuzzy:
+        # Fuzzy only: keep similarity order from the index instead of re-sorting
+        suggestions = await _collect_sources(request, [fuzzy_source], q, municipality_filter) if fuzzy_kinds else []
+        return AutocompleteResponse(suggestions=suggestions[:limit])
+
+    suggestions = await _collect_sources(request, sources, q, municipality_filter)
+    if not suggestions and fuzzy is None and fuzzy_kinds:
+        # Nothing contains the query (likely a typo): one trigram lookup instead of a retype
+        suggestions = await _collect_sources(request, [fuzzy_source], q, municipality_filter)
+        return AutocompleteResponse(suggestions=suggestions[:limit])
 
     # Sort by relevance (exact matches first, then by count)
     def sort_key(s: AutocompleteSuggestion):
         exact_match = s.value.lower().startswith(q.lower()) or s.display.lower().startswith(q.lower())
         return (not exact_match, -s.count if s.count else 0)
-    
+
     suggestions.sort(key=sort_key)
-    
+
     return AutocompleteResponse(suggestions=suggestions[:limit])
 
 @router.get("/towns", response_model=List[str])
 async def get_towns(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get list of all unique towns/municipalities. Cached 10 min; 10s timeout; returns [] on timeout."""
+    """Get list of all unique towns/municipalities. Cached 10 min; options time budget; returns [] on timeout."""
     cached = options_cache.get("towns")
     if cached is not None:
         return cached
+    query = select(Property.municipality).filter(
+        Property.municipality.isnot(None),
+        Property.municipality != ''
+    ).distinct().order_by(Property.municipality)
     try:
-        db.execute(text("SET statement_timeout = '10s'"))
-        try:
-            query = db.query(Property).filter(
-                Property.municipality.isnot(None),
-                Property.municipality != ''
-            ).with_entities(Property.municipality).distinct().order_by(Property.municipality)
-            rows = query.all()
-            result = [r[0] for r in rows if r[0]]
-            options_cache.set("towns", result)
-            return result
-        except OperationalError as oe:
-            err = str(oe).lower()
-            if "canceling" in err or "timeout" in err or "statement_timeout" in err:
-                return []
-            raise
-        finally:
-            try:
-                db.execute(text("SET statement_timeout = '0'"))
-            except Exception:
-                pass
-    except OperationalError as oe:
-        err = str(oe).lower()
-        if "canceling" in err or "timeout" in err or "statement_timeout" in err:
-            return []
-        raise
+        async with statement_timeouts.scope(db, "options"):
+            rows = (await db.execute(query)).all()
+    except StatementTimeout:
+        return []
+    result = [r[0] for r in rows if r[0]]
+    options_cache.set("towns", result)
+    return result
 
 @router.get("/owner-cities", response_model=List[str])
 async def get_owner_cities(
@@ -371,13 +489,13 @@ async def get_owner_cities(
     time_since_sale: Optional[str] = Query(None, description="Filter by time since sale"),
     annual_tax: Optional[str] = Query(None, description="Filter by annual tax range"),
     owner_state: Optional[str] = Query(None, description="Filter by owner mailing state"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get list of all unique owner mailing cities, optionally filtered by other selections"""
     from api.routes.search import apply_filters_to_query
     
-    # Build query on full Property table to allow filtering
-    query = db.query(Property).filter(
+    # Build query on the Property table to allow filtering
+    query = select(Property.owner_city).filter(
         Property.owner_city.isnot(None),
         Property.owner_city != ''
     )
@@ -430,40 +548,25 @@ async def get_owner_cities(
     )
     if cached is not None:
         return cached
-    # 10s statement timeout; return [] on timeout
+    # Options time budget (statement_timeouts); return [] on timeout
     try:
-        db.execute(text("SET statement_timeout = '10s'"))
-        try:
-            query = query.with_entities(Property.owner_city).distinct()
-            rows = query.all()
-            result = sorted([r[0] for r in rows if r[0]])
-            options_cache.set(
-                "owner-cities",
-                result,
-                municipality=municipality,
-                unit_type=unit_type,
-                zoning=zoning,
-                property_age=property_age,
-                time_since_sale=time_since_sale,
-                annual_tax=annual_tax,
-                owner_state=owner_state,
-            )
-            return result
-        except OperationalError as oe:
-            err = str(oe).lower()
-            if "canceling" in err or "timeout" in err or "statement_timeout" in err:
-                return []
-            raise
-        finally:
-            try:
-                db.execute(text("SET statement_timeout = '0'"))
-            except Exception:
-                pass
-    except OperationalError as oe:
-        err = str(oe).lower()
-        if "canceling" in err or "timeout" in err or "statement_timeout" in err:
-            return []
-        raise
+        async with statement_timeouts.scope(db, "options"):
+            rows = (await db.execute(query.distinct())).all()
+    except StatementTimeout:
+        return []
+    result = sorted([r[0] for r in rows if r[0]])
+    options_cache.set(
+        "owner-cities",
+        result,
+        municipality=municipality,
+        unit_type=unit_type,
+        zoning=zoning,
+        property_age=property_age,
+        time_since_sale=time_since_sale,
+        annual_tax=annual_tax,
+        owner_state=owner_state,
+    )
+    return result
 
 @router.get("/owner-states", response_model=List[str])
 async def get_owner_states(
@@ -474,13 +577,13 @@ async def get_owner_states(
     time_since_sale: Optional[str] = Query(None, description="Filter by time since sale"),
     annual_tax: Optional[str] = Query(None, description="Filter by annual tax range"),
     owner_city: Optional[str] = Query(None, description="Filter by owner mailing city"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get list of all unique owner mailing states, optionally filtered by other selections"""
     from api.routes.search import apply_filters_to_query
     
-    # Build query on full Property table to allow filtering
-    query = db.query(Property).filter(
+    # Build query on the Property table to allow filtering
+    query = select(Property.owner_state).filter(
         Property.owner_state.isnot(None),
         Property.owner_state != ''
     )
@@ -533,40 +636,25 @@ async def get_owner_states(
     )
     if cached is not None:
         return cached
-    # 10s statement timeout; return [] on timeout
+    # Options time budget (statement_timeouts); return [] on timeout
     try:
-        db.execute(text("SET statement_timeout = '10s'"))
-        try:
-            query = query.with_entities(Property.owner_state).distinct()
-            rows = query.all()
-            result = sorted([r[0] for r in rows if r[0]])
-            options_cache.set(
-                "owner-states",
-                result,
-                municipality=municipality,
-                unit_type=unit_type,
-                zoning=zoning,
-                property_age=property_age,
-                time_since_sale=time_since_sale,
-                annual_tax=annual_tax,
-                owner_city=owner_city,
-            )
-            return result
-        except OperationalError as oe:
-            err = str(oe).lower()
-            if "canceling" in err or "timeout" in err or "statement_timeout" in err:
-                return []
-            raise
-        finally:
-            try:
-                db.execute(text("SET statement_timeout = '0'"))
-            except Exception:
-                pass
-    except OperationalError as oe:
-        err = str(oe).lower()
-        if "canceling" in err or "timeout" in err or "statement_timeout" in err:
-            return []
-        raise
+        async with statement_timeouts.scope(db, "options"):
+            rows = (await db.execute(query.distinct())).all()
+    except StatementTimeout:
+        return []
+    result = sorted([r[0] for r in rows if r[0]])
+    options_cache.set(
+        "owner-states",
+        result,
+        municipality=municipality,
+        unit_type=unit_type,
+        zoning=zoning,
+        property_age=property_age,
+        time_since_sale=time_since_sale,
+        annual_tax=annual_tax,
+        owner_city=owner_city,
+    )
+    return result
 
 @router.get("/owner-addresses", response_model=List[str])
 async def get_owner_addresses(
@@ -580,15 +668,15 @@ async def get_owner_addresses(
     owner_city: Optional[str] = Query(None, description="Filter by owner mailing city"),
     owner_state: Optional[str] = Query(None, description="Filter by owner mailing state"),
     limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get autocomplete suggestions for owner mailing addresses, optionally filtered by other selections"""
     from api.routes.search import apply_filters_to_query
     
     search_term = f"%{q}%"
     
-    # Build query on full Property table to allow filtering
-    query = db.query(Property).filter(
+    # Build query on the Property table to allow filtering
+    query = select(Property.owner_address).filter(
         Property.owner_address.isnot(None),
         Property.owner_address != '',
         Property.owner_address.ilike(search_term)
@@ -632,7 +720,6 @@ async def get_owner_addresses(
     )
     
     # SELECT DISTINCT owner_address only (no full row load), then sort and limit
-    query = query.with_entities(Property.owner_address).distinct()
-    rows = query.all()
+    rows = (await db.execute(query.distinct())).all()
     addresses = sorted([r[0] for r in rows if r[0]])
     return addresses[:limit]
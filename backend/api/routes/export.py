@@ -1,46 +1,128 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from typing import Optional, List
-from database import get_db
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Query as ORMQuery, Session
+from sqlalchemy import func, or_, case
+from typing import Callable, Optional, List
+from database import get_db, read_session, SessionLocal
 from models import Property
+from services.copy_export import stream_copy, compile_for_copy, copy_csv_sql, copy_jsonl_sql, copy_geojsonseq_sql, copy_to_file
+from services.export_jobs import export_jobs
+from services.flatgeobuf import FlatGeobufWriter
+from services.result_sets import result_sets
+from api.routes.search import apply_search_filters, search_filter_params
+from pydantic import BaseModel
 import csv
+import functools
+import importlib.util
 import io
+import itertools
 import json
-from datetime import datetime
+import os
+import tempfile
+from datetime import date, datetime
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
 
 router = APIRouter()
 
-@router.get("/csv")
-async def export_csv(
-    filter_type: Optional[str] = Query(None),
+# Rows per server-side cursor fetch and per streamed chunk
+STREAM_BATCH_ROWS = 2000
+
+# Excel sheets hold 1,048,576 rows including the header
+EXCEL_MAX_DATA_ROWS = 1048575
+# Rows inspected to size Excel columns
+EXCEL_WIDTH_SAMPLE_ROWS = 500
+# Bytes per chunk when streaming an export that is built in a temp file first
+FILE_CHUNK_BYTES = 64 * 1024
+
+# (header, Property attribute) for the tabular exports, in column order
+EXPORT_COLUMNS = [
+    ('Parcel ID', 'parcel_id'),
+    ('Address', 'address'),
+    ('Municipality', 'municipality'),
+    ('Zip Code', 'zip_code'),
+    ('Owner Name', 'owner_name'),
+    ('Owner Address', 'owner_address'),
+    ('Owner City', 'owner_city'),
+    ('Owner State', 'owner_state'),
+    ('Owner Zip', 'owner_zip'),
+    ('Assessed Value', 'assessed_value'),
+    ('Land Value', 'land_value'),
+    ('Building Value', 'building_value'),
+    ('Property Type', 'property_type'),
+    ('Land Use', 'land_use'),
+    ('Lot Size (sqft)', 'lot_size_sqft'),
+    ('Building Area (sqft)', 'building_area_sqft'),
+    ('Year Built', 'year_built'),
+    ('Bedrooms', 'bedrooms'),
+    ('Bathrooms', 'bathrooms'),
+    ('Last Sale Date', 'last_sale_date'),
+    ('Last Sale Price', 'last_sale_price'),
+    ('Estimated Equity', 'equity_amount'),
+    ('Is Absentee Owner', 'is_absentee'),
+    ('Is Vacant', 'is_vacant'),
+    ('Days Since Sale', 'days_since_sale'),
+]
+
+# /json (and GeoJSON, FlatGeobuf, ...) key for the EXPORT_COLUMNS attributes named differently
+EXPORT_JSON_KEYS = {
+    'is_absentee': 'is_absentee_owner',
+    'equity_amount': 'equity_estimate',
+}
+
+def export_filter_params(
+    filter_type: Optional[str] = Query(None, description="Preset list: high-equity, low-equity, vacant, absentee-owners, recently-sold"),
     min_equity: Optional[float] = None,
-    municipality: Optional[str] = None,
-    property_type: Optional[str] = None,
     include_vacant: Optional[bool] = None,
     include_absentee: Optional[bool] = None,
-    min_value: Optional[float] = None,
-    max_value: Optional[float] = None,
-    min_lot_size: Optional[float] = None,
-    max_lot_size: Optional[float] = None,
-    db: Session = Depends(get_db)
+    result_set: Optional[str] = Query(None, description="Result handle from POST /api/search/result-sets: export exactly those rows, in order (search filters are ignored)"),
+    search_filters: dict = Depends(search_filter_params),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Export filters: every /api/search/ parameter (or a saved result handle) plus the export-only list presets and flags."""
+    if result_set is not None:
+        if result_sets.get(db, result_set) is None:
+            raise HTTPException(status_code=404, detail="Result set not found (it may have expired)")
+        search_filters = {}
+    else:
+        # Build the filters once up front (no session needed) so an oversized bbox is a 400
+        # here rather than an error halfway through a streamed response
+        apply_search_filters(ORMQuery(Property), **search_filters)
+    return dict(
+        filter_type=filter_type, min_equity=min_equity, include_vacant=include_vacant,
+        include_absentee=include_absentee, result_set=result_set, **search_filters,
+    )
+
+def _export_session(filters: dict) -> Session:
+    """Session for running an export: the read replica when usable, but the primary for a result set (UNLOGGED, not replicated)."""
+    return SessionLocal() if filters.get('result_set') is not None else read_session()
+
+def get_export_db(filters: dict = Depends(export_filter_params)):
+    db = _export_session(filters)
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _apply_export_filters(
+    query,
+    filter_type: Optional[str] = None,
+    min_equity: Optional[float] = None,
+    include_vacant: Optional[bool] = None,
+    include_absentee: Optional[bool] = None,
+    result_set: Optional[str] = None,
+    **search_filters,
 ):
-    """Export properties to CSV"""
-    query = db.query(Property)
-    
-    # Apply filters
+    """Filters shared by all exports: the list presets, then a saved result set or the same filters as /api/search/."""
     if filter_type == "high-equity" and min_equity:
         query = query.filter(
-            Property.equity_estimate.isnot(None),
-            Property.equity_estimate >= min_equity
+            Property.equity_amount >= min_equity
         )
     elif filter_type == "high-equity":
         query = query.filter(
-            Property.equity_estimate.isnot(None),
-            Property.equity_estimate >= 50000
+            Property.equity_amount >= 50000
         )
     elif filter_type == "vacant":
         query = query.filter(Property.is_vacant == 1)
@@ -50,172 +132,116 @@ async def export_csv(
         query = query.filter(Property.last_sale_date.isnot(None))
     elif filter_type == "low-equity":
         query = query.filter(
-            Property.equity_estimate.isnot(None),
-            Property.equity_estimate <= 10000
+            Property.equity_amount <= 10000
         )
     
-    if municipality:
-        query = query.filter(func.lower(func.trim(Property.municipality)) == municipality.strip().lower())
-    
-    if property_type:
-        query = query.filter(Property.property_type.ilike(f"%{property_type}%"))
-    
-    if min_value is not None:
-        query = query.filter(Property.assessed_value >= min_value)
-    if max_value is not None:
-        query = query.filter(Property.assessed_value <= max_value)
-    
-    if min_lot_size is not None:
-        query = query.filter(Property.lot_size_sqft >= min_lot_size)
-    if max_lot_size is not None:
-        query = query.filter(Property.lot_size_sqft <= max_lot_size)
-    
     if include_vacant is not None:
         query = query.filter(Property.is_vacant == (1 if include_vacant else 0))
     
     if include_absentee is not None:
         query = query.filter(Property.is_absentee == (1 if include_absentee else 0))
     
-    properties = query.limit(10000).all()  # Limit to prevent memory issues
-    
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow([
-        'Parcel ID',
-        'Address',
-        'Municipality',
-        'Zip Code',
-        'Owner Name',
-        'Owner Address',
-        'Owner City',
-        'Owner State',
-        'Owner Zip',
-        'Assessed Value',
-        'Land Value',
-        'Building Value',
-        'Property Type',
-        'Land Use',
-        'Lot Size (sqft)',
-        'Building Area (sqft)',
-        'Year Built',
-        'Bedrooms',
-        'Bathrooms',
-        'Last Sale Date',
-        'Last Sale Price',
-        'Estimated Equity',
-        'Is Absentee Owner',
-        'Is Vacant',
-        'Days Since Sale'
-    ])
-    
-    # Write data
-    for prop in properties:
-        writer.writerow([
-            prop.parcel_id,
-            prop.address or '',
-            prop.municipality or '',
-            prop.zip_code or '',
-            prop.owner_name or '',
-            prop.owner_address or '',
-            prop.owner_city or '',
-            prop.owner_state or '',
-            prop.owner_zip or '',
-            prop.assessed_value or '',
-            prop.land_value or '',
-            prop.building_value or '',
-            prop.property_type or '',
-            prop.land_use or '',
-            prop.lot_size_sqft or '',
-            prop.building_area_sqft or '',
-            prop.year_built or '',
-            prop.bedrooms or '',
-            prop.bathrooms or '',
-            prop.last_sale_date.isoformat() if prop.last_sale_date else '',
-            prop.last_sale_price or '',
-            prop.equity_estimate or '',
-            'Yes' if prop.is_absentee == 1 else 'No',
-            'Yes' if prop.is_vacant == 1 else 'No',
-            prop.days_since_sale or ''
-        ])
-    
-    output.seek(0)
-    
+    if result_set is not None:
+        return result_sets.restrict(query, result_set)
+    return apply_search_filters(query, **search_filters)
+
+@router.get("/csv")
+async def export_csv(
+    filters: dict = Depends(export_filter_params),
+    method: str = Query("cursor", pattern="^(cursor|copy)$", description="cursor = stream rows through Python; copy = Postgres COPY (fastest for large exports)"),
+):
+    """Export properties to CSV. Streams every matching row (no row cap) with constant memory."""
     filename = f"ct_properties_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     
-    # Encode CSV string to bytes for proper blob handling
-    csv_bytes = output.getvalue().encode('utf-8')
-    
+    if method == "copy":
+        content = stream_copy(lambda db: copy_csv_sql(compile_for_copy(db, _export_select(db, filters, json_keys=False))), functools.partial(_export_session, filters))
+    else:
+        content = _stream_csv(filters)
     return StreamingResponse(
-        iter([csv_bytes]),
+        content,
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
+def _stream_csv(filters: dict):
+    """
+    Yield the CSV export in chunks of STREAM_BATCH_ROWS rows.
+    Uses its own session and a server-side cursor (yield_per), so only one batch of plain
+    column tuples is in memory at a time regardless of how many parcels match.
+    Starlette iterates this sync generator in a worker thread.
+    """
+    db = _export_session(filters)
+    try:
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow([header for header, _name in EXPORT_COLUMNS])
+        for row_count, row in enumerate(_export_rows(db, filters), start=1):
+            writer.writerow(row)
+            if row_count % STREAM_BATCH_ROWS == 0:
+                yield output.getvalue().encode('utf-8')
+                output.seek(0)
+                output.truncate(0)
+        yield output.getvalue().encode('utf-8')
+    finally:
+        db.close()
+
+def _export_rows(db: Session, filters: dict, limit: Optional[int] = None):
+    """Formatted EXPORT_COLUMNS rows for the CSV/Excel exports, fetched through a server-side cursor."""
+    query = db.query(*[getattr(Property, name) for _header, name in EXPORT_COLUMNS])
+    query = _apply_export_filters(query, **filters)
+    if limit is not None:
+        query = query.limit(limit)
+    for row in query.yield_per(STREAM_BATCH_ROWS):
+        yield [_format_cell(name, value) for (_header, name), value in zip(EXPORT_COLUMNS, row)]
+
+def _format_cell(name: str, value):
+    """Format one CSV/Excel export cell (blank for empty values, Yes/No flags, ISO dates)."""
+    if name in ('is_absentee', 'is_vacant'):
+        return 'Yes' if value == 1 else 'No'
+    if name == 'last_sale_date':
+        return value.isoformat() if value else ''
+    return value or ''
+
+@router.get("/jsonl")
+async def export_jsonl(
+    filters: dict = Depends(export_filter_params),
+):
+    """Export properties as JSON lines (one object per line, same keys as /json) via Postgres COPY. No row cap."""
+    filename = f"ct_properties_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    
+    return StreamingResponse(
+        stream_copy(lambda db: copy_jsonl_sql(compile_for_copy(db, _export_select(db, filters, json_keys=True))), functools.partial(_export_session, filters)),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+def _export_select(db: Session, filters: dict, json_keys: bool):
+    """
+    Export columns as labelled SQL expressions (COPY and GeoJSON exports), formatted in Postgres.
+    CSV: labelled with EXPORT_COLUMNS headers, flags as Yes/No.
+    JSON: labelled with the /json keys, flags as booleans.
+    """
+    columns = []
+    for header, name in EXPORT_COLUMNS:
+        column = getattr(Property, name)
+        if name in ('is_absentee', 'is_vacant'):
+            if json_keys:
+                columns.append((func.coalesce(column, 0) == 1).label(EXPORT_JSON_KEYS.get(name, name)))
+            else:
+                columns.append(case((column == 1, 'Yes'), else_='No').label(header))
+        else:
+            columns.append(column.label(EXPORT_JSON_KEYS.get(name, name) if json_keys else header))
+    return _apply_export_filters(db.query(*columns), **filters)
+
 @router.get("/json")
 async def export_json(
-    filter_type: Optional[str] = Query(None),
-    min_equity: Optional[float] = None,
-    municipality: Optional[str] = None,
-    property_type: Optional[str] = None,
-    include_vacant: Optional[bool] = None,
-    include_absentee: Optional[bool] = None,
-    min_value: Optional[float] = None,
-    max_value: Optional[float] = None,
-    min_lot_size: Optional[float] = None,
-    max_lot_size: Optional[float] = None,
+    filters: dict = Depends(export_filter_params),
     limit: int = Query(1000, le=10000),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_export_db)
 ):
     """Export properties to JSON"""
     query = db.query(Property)
-    
-    # Apply filters (same as CSV/Excel)
-    if filter_type == "high-equity" and min_equity:
-        query = query.filter(
-            Property.equity_estimate.isnot(None),
-            Property.equity_estimate >= min_equity
-        )
-    elif filter_type == "high-equity":
-        query = query.filter(
-            Property.equity_estimate.isnot(None),
-            Property.equity_estimate >= 50000
-        )
-    elif filter_type == "vacant":
-        query = query.filter(Property.is_vacant == 1)
-    elif filter_type == "absentee-owners":
-        query = query.filter(Property.is_absentee == 1)
-    elif filter_type == "recently-sold":
-        query = query.filter(Property.last_sale_date.isnot(None))
-    elif filter_type == "low-equity":
-        query = query.filter(
-            Property.equity_estimate.isnot(None),
-            Property.equity_estimate <= 10000
-        )
-    
-    if municipality:
-        query = query.filter(func.lower(func.trim(Property.municipality)) == municipality.strip().lower())
-    
-    if property_type:
-        query = query.filter(Property.property_type.ilike(f"%{property_type}%"))
-    
-    if min_value is not None:
-        query = query.filter(Property.assessed_value >= min_value)
-    if max_value is not None:
-        query = query.filter(Property.assessed_value <= max_value)
-    
-    if min_lot_size is not None:
-        query = query.filter(Property.lot_size_sqft >= min_lot_size)
-    if max_lot_size is not None:
-        query = query.filter(Property.lot_size_sqft <= max_lot_size)
-    
-    if include_vacant is not None:
-        query = query.filter(Property.is_vacant == (1 if include_vacant else 0))
-    
-    if include_absentee is not None:
-        query = query.filter(Property.is_absentee == (1 if include_absentee else 0))
+    query = _apply_export_filters(query, **filters)
     
     properties = query.limit(limit).all()
     
@@ -244,7 +270,7 @@ async def export_json(
             'bathrooms': prop.bathrooms,
             'last_sale_date': prop.last_sale_date.isoformat() if prop.last_sale_date else None,
             'last_sale_price': prop.last_sale_price,
-            'equity_estimate': prop.equity_estimate,
+            'equity_estimate': prop.equity_amount,
             'is_absentee_owner': prop.is_absentee == 1,
             'is_vacant': prop.is_vacant == 1,
             'days_since_sale': prop.days_since_sale
@@ -264,164 +290,335 @@ async def export_json(
 
 @router.get("/excel")
 async def export_excel(
-    filter_type: Optional[str] = Query(None),
-    min_equity: Optional[float] = None,
-    municipality: Optional[str] = None,
-    property_type: Optional[str] = None,
-    include_vacant: Optional[bool] = None,
-    include_absentee: Optional[bool] = None,
-    min_value: Optional[float] = None,
-    max_value: Optional[float] = None,
-    min_lot_size: Optional[float] = None,
-    max_lot_size: Optional[float] = None,
-    db: Session = Depends(get_db)
+    filters: dict = Depends(export_filter_params),
 ):
-    """Export properties to Excel"""
-    query = db.query(Property)
-    
-    # Apply filters (same as CSV/JSON)
-    if filter_type == "high-equity" and min_equity:
-        query = query.filter(
-            Property.equity_estimate.isnot(None),
-            Property.equity_estimate >= min_equity
-        )
-    elif filter_type == "high-equity":
-        query = query.filter(
-            Property.equity_estimate.isnot(None),
-            Property.equity_estimate >= 50000
-        )
-    elif filter_type == "vacant":
-        query = query.filter(Property.is_vacant == 1)
-    elif filter_type == "absentee-owners":
-        query = query.filter(Property.is_absentee == 1)
-    elif filter_type == "recently-sold":
-        query = query.filter(Property.last_sale_date.isnot(None))
-    elif filter_type == "low-equity":
-        query = query.filter(
-            Property.equity_estimate.isnot(None),
-            Property.equity_estimate <= 10000
-        )
-    
-    if municipality:
-        query = query.filter(func.lower(func.trim(Property.municipality)) == municipality.strip().lower())
-    
-    if property_type:
-        query = query.filter(Property.property_type.ilike(f"%{property_type}%"))
-    
-    if min_value is not None:
-        query = query.filter(Property.assessed_value >= min_value)
-    if max_value is not None:
-        query = query.filter(Property.assessed_value <= max_value)
-    
-    if min_lot_size is not None:
-        query = query.filter(Property.lot_size_sqft >= min_lot_size)
-    if max_lot_size is not None:
-        query = query.filter(Property.lot_size_sqft <= max_lot_size)
-    
-    if include_vacant is not None:
-        query = query.filter(Property.is_vacant == (1 if include_vacant else 0))
-    
-    if include_absentee is not None:
-        query = query.filter(Property.is_absentee == (1 if include_absentee else 0))
-    
-    properties = query.limit(10000).all()  # Limit to prevent memory issues
-    
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Properties"
-    
-    # Define headers
-    headers = [
-        'Parcel ID',
-        'Address',
-        'Municipality',
-        'Zip Code',
-        'Owner Name',
-        'Owner Address',
-        'Owner City',
-        'Owner State',
-        'Owner Zip',
-        'Assessed Value',
-        'Land Value',
-        'Building Value',
-        'Property Type',
-        'Land Use',
-        'Lot Size (sqft)',
-        'Building Area (sqft)',
-        'Year Built',
-        'Bedrooms',
-        'Bathrooms',
-        'Last Sale Date',
-        'Last Sale Price',
-        'Estimated Equity',
-        'Is Absentee Owner',
-        'Is Vacant',
-        'Days Since Sale'
-    ]
+    """Export properties to Excel (write-only workbook; up to Excel's row limit)."""
+    filename = f"ct_properties_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
     
-    # Style header row
+    return StreamingResponse(
+        _stream_file_export(_write_xlsx, filters, 'xlsx'),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+def _stream_file_export(writer, filters: dict, extension: str):
+    """
+    Run writer(db, filters, path, progress) into a temp file, then yield the file in chunks.
+    For formats whose container can only be finished once all rows are in (xlsx zip, GeoPackage
+    SQLite), so the bytes start after the build; both phases run in Starlette's worker thread
+    with flat memory.
+    """
+    with tempfile.TemporaryDirectory(prefix="ctmaps_export_") as tmp_dir:
+        path = os.path.join(tmp_dir, f"export.{extension}")
+        db = _export_session(filters)
+        try:
+            writer(db, filters, path, lambda _rows: None)
+        finally:
+            db.close()
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(FILE_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+
+def _write_xlsx(db: Session, filters: dict, target, progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Write the Excel export to target (path or binary file) and return the number of data rows.
+    Uses openpyxl's write-only mode: rows are serialized to disk as they are appended instead of
+    held as cell objects. Column widths come from the header plus the first EXCEL_WIDTH_SAMPLE_ROWS
+    rows, since write-only sheets need widths before the first row is written.
+    """
+    rows = _export_rows(db, filters, limit=EXCEL_MAX_DATA_ROWS)
+    sample = list(itertools.islice(rows, EXCEL_WIDTH_SAMPLE_ROWS))
+    
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Properties")
+    
+    # Column widths from the sample (cap at 50 characters)
+    for col_idx, (header, _name) in enumerate(EXPORT_COLUMNS):
+        max_length = max([len(header)] + [len(str(row[col_idx])) for row in sample if row[col_idx] != ''])
+        ws.column_dimensions[get_column_letter(col_idx + 1)].width = min(max_length + 2, 50)
+    
+    # Styled header row
     header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
     header_font = Font(bold=True, color="FFFFFF")
     header_alignment = Alignment(horizontal="center", vertical="center")
-    
-    # Write headers
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
+    header_cells = []
+    for header, _name in EXPORT_COLUMNS:
+        cell = WriteOnlyCell(ws, value=header)
         cell.fill = header_fill
         cell.font = header_font
         cell.alignment = header_alignment
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    row_count = 0
+    for row in itertools.chain(sample, rows):
+        ws.append(row)
+        row_count += 1
+        if progress is not None and row_count % STREAM_BATCH_ROWS == 0:
+            progress(row_count)
+    
+    wb.save(target)
+    return row_count
+
+# Geospatial exports: same filters and properties as /jsonl, plus the parcel geometry (EPSG:4326)
+
+@router.get("/geojsonseq")
+async def export_geojsonseq(
+    filters: dict = Depends(export_filter_params),
+):
+    """
+    Export parcels as GeoJSON text sequences (RFC 8142, one Feature per line) via Postgres COPY.
+    Features are built in PostGIS (ST_AsGeoJSON + json_build_object) and streamed with no row cap.
+    """
+    filename = f"ct_properties_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.geojsons"
     
-    # Write data
-    for row_idx, prop in enumerate(properties, start=2):
-        ws.cell(row=row_idx, column=1, value=prop.parcel_id)
-        ws.cell(row=row_idx, column=2, value=prop.address or '')
-        ws.cell(row=row_idx, column=3, value=prop.municipality or '')
-        ws.cell(row=row_idx, column=4, value=prop.zip_code or '')
-        ws.cell(row=row_idx, column=5, value=prop.owner_name or '')
-        ws.cell(row=row_idx, column=6, value=prop.owner_address or '')
-        ws.cell(row=row_idx, column=7, value=prop.owner_city or '')
-        ws.cell(row=row_idx, column=8, value=prop.owner_state or '')
-        ws.cell(row=row_idx, column=9, value=prop.owner_zip or '')
-        ws.cell(row=row_idx, column=10, value=prop.assessed_value or '')
-        ws.cell(row=row_idx, column=11, value=prop.land_value or '')
-        ws.cell(row=row_idx, column=12, value=prop.building_value or '')
-        ws.cell(row=row_idx, column=13, value=prop.property_type or '')
-        ws.cell(row=row_idx, column=14, value=prop.land_use or '')
-        ws.cell(row=row_idx, column=15, value=prop.lot_size_sqft or '')
-        ws.cell(row=row_idx, column=16, value=prop.building_area_sqft or '')
-        ws.cell(row=row_idx, column=17, value=prop.year_built or '')
-        ws.cell(row=row_idx, column=18, value=prop.bedrooms or '')
-        ws.cell(row=row_idx, column=19, value=prop.bathrooms or '')
-        ws.cell(row=row_idx, column=20, value=prop.last_sale_date.isoformat() if prop.last_sale_date else '')
-        ws.cell(row=row_idx, column=21, value=prop.last_sale_price or '')
-        ws.cell(row=row_idx, column=22, value=prop.equity_estimate or '')
-        ws.cell(row=row_idx, column=23, value='Yes' if prop.is_absentee == 1 else 'No')
-        ws.cell(row=row_idx, column=24, value='Yes' if prop.is_vacant == 1 else 'No')
-        ws.cell(row=row_idx, column=25, value=prop.days_since_sale or '')
-    
-    # Auto-adjust column widths
-    for col in ws.columns:
-        max_length = 0
-        col_letter = col[0].column_letter
-        for cell in col:
-            try:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-        ws.column_dimensions[col_letter].width = adjusted_width
-    
-    # Save to BytesIO
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
+    return StreamingResponse(
+        stream_copy(lambda db: _geojsonseq_copy_sql(db, filters), functools.partial(_export_session, filters)),
+        media_type="application/geo+json-seq",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@router.get("/gpkg")
+async def export_geopackage(
+    filters: dict = Depends(export_filter_params),
+):
+    """Export parcels as a GeoPackage (layer 'properties'), written to a temp file and then streamed."""
+    if not _fiona_available():
+        raise HTTPException(status_code=400, detail="GeoPackage exports require fiona/GDAL, which is not installed on this server.")
+    filename = f"ct_properties_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.gpkg"
     
-    filename = f"ct_properties_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    return StreamingResponse(
+        _stream_file_export(EXPORT_JOB_FORMATS['gpkg'][1], filters, 'gpkg'),
+        media_type="application/geopackage+sqlite3",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@router.get("/fgb")
+async def export_flatgeobuf(
+    filters: dict = Depends(export_filter_params),
+):
+    """
+    Export parcels as FlatGeobuf (layer 'properties', no spatial index), streamed from the
+    server-side cursor as features are fetched. See services/flatgeobuf.py.
+    """
+    filename = f"ct_properties_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.fgb"
     
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        _stream_flatgeobuf(filters),
+        media_type="application/octet-stream",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
+
+def _stream_flatgeobuf(filters: dict):
+    """Yield the FlatGeobuf header, then STREAM_BATCH_ROWS encoded features per chunk (own session)."""
+    db = _export_session(filters)
+    try:
+        writer = FlatGeobufWriter('properties', _feature_columns())
+        yield writer.header()
+        batch = []
+        for properties, geometry in _feature_rows(db, filters):
+            batch.append(writer.feature(properties, geometry))
+            if len(batch) >= STREAM_BATCH_ROWS:
+                yield b''.join(batch)
+                batch = []
+        yield b''.join(batch)
+    finally:
+        db.close()
+
+# Background export jobs: POST /jobs queues an export, GET /jobs/{id} reports rows-done progress,
+# GET /jobs/{id}/download serves the finished artifact. See services/export_jobs.py.
+
+class ExportJobResponse(BaseModel):
+    job_id: str
+    format: str
+    status: str  # 'queued', 'running', 'done', or 'failed'
+    rows_done: int
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    status_url: str
+    download_url: Optional[str] = None  # Set once status is 'done'
+
+def _write_csv_file(db: Session, filters: dict, path, progress: Callable[[int], None]) -> int:
+    row_count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([header for header, _name in EXPORT_COLUMNS])
+        for row_count, row in enumerate(_export_rows(db, filters), start=1):
+            writer.writerow(row)
+            if row_count % STREAM_BATCH_ROWS == 0:
+                progress(row_count)
+    return row_count
+
+def _write_jsonl_file(db: Session, filters: dict, path, progress: Callable[[int], None]) -> int:
+    copy_sql = copy_jsonl_sql(compile_for_copy(db, _export_select(db, filters, json_keys=True)))
+    with open(path, 'wb') as f:
+        return copy_to_file(db, copy_sql, f, progress)
+
+def _feature_select(db: Session, filters: dict):
+    """The /json-keyed export columns plus the parcel geometry as GeoJSON text (labelled 'geometry')."""
+    return _export_select(db, filters, json_keys=True).add_columns(
+        func.ST_AsGeoJSON(Property.geometry).label('geometry')
+    )
+
+def _geojsonseq_copy_sql(db: Session, filters: dict) -> str:
+    query = _feature_select(db, filters)
+    property_keys = [column['name'] for column in query.column_descriptions if column['name'] != 'geometry']
+    return copy_geojsonseq_sql(compile_for_copy(db, query), property_keys)
+
+def _feature_columns() -> List[tuple]:
+    """(key, Python type) of the _feature_rows properties, in column order; flags are bools."""
+    columns = []
+    for _header, name in EXPORT_COLUMNS:
+        key = EXPORT_JSON_KEYS.get(name, name)
+        if name in ('is_absentee', 'is_vacant'):
+            columns.append((key, bool))
+        else:
+            columns.append((key, getattr(Property, name).type.python_type))
+    return columns
+
+def _feature_rows(db: Session, filters: dict):
+    """(properties dict, GeoJSON geometry dict or None) per parcel, keyed like /json."""
+    for row in _feature_select(db, filters).yield_per(STREAM_BATCH_ROWS):
+        properties = dict(row._mapping)
+        geometry = properties.pop('geometry')
+        yield properties, json.loads(geometry) if geometry else None
+
+def _write_geojson_file(db: Session, filters: dict, path, progress: Callable[[int], None]) -> int:
+    row_count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"type": "FeatureCollection", "features": [\n')
+        for row_count, (properties, geometry) in enumerate(_feature_rows(db, filters), start=1):
+            if row_count > 1:
+                f.write(',\n')
+            f.write(json.dumps({"type": "Feature", "geometry": geometry, "properties": properties}, default=str))
+            if row_count % STREAM_BATCH_ROWS == 0:
+                progress(row_count)
+        f.write('\n]}\n')
+    return row_count
+
+def _write_geojsonseq_file(db: Session, filters: dict, path, progress: Callable[[int], None]) -> int:
+    with open(path, 'wb') as f:
+        return copy_to_file(db, _geojsonseq_copy_sql(db, filters), f, progress)
+
+def _fiona_available() -> bool:
+    # fiona (GDAL) is in both requirements files; checked so a trimmed install answers 400, not 500
+    return importlib.util.find_spec("fiona") is not None
+
+def _write_geopackage_file(db: Session, filters: dict, path, progress: Callable[[int], None]) -> int:
+    """Write a GeoPackage export with fiona, STREAM_BATCH_ROWS features per write."""
+    import fiona
+    
+    # GeoPackage has no boolean field type; flags are written as 0/1
+    fiona_types = {bool: 'int', str: 'str', int: 'int', float: 'float', date: 'date'}
+    schema = {
+        'geometry': 'Unknown',
+        'properties': {key: fiona_types[python_type] for key, python_type in _feature_columns()},
+    }
+    
+    row_count = 0
+    batch = []
+    with fiona.open(path, 'w', driver='GPKG', crs='EPSG:4326', schema=schema, layer='properties') as layer:
+        for row_count, (properties, geometry) in enumerate(_feature_rows(db, filters), start=1):
+            for key, value in properties.items():
+                if isinstance(value, bool):
+                    properties[key] = int(value)
+                elif isinstance(value, date):
+                    properties[key] = value.isoformat()
+            batch.append({'geometry': geometry, 'properties': properties})
+            if len(batch) >= STREAM_BATCH_ROWS:
+                layer.writerecords(batch)
+                batch = []
+                progress(row_count)
+        if batch:
+            layer.writerecords(batch)
+    return row_count
+
+def _write_flatgeobuf_file(db: Session, filters: dict, path, progress: Callable[[int], None]) -> int:
+    row_count = 0
+    writer = FlatGeobufWriter('properties', _feature_columns())
+    with open(path, 'wb') as f:
+        f.write(writer.header())
+        for row_count, (properties, geometry) in enumerate(_feature_rows(db, filters), start=1):
+            f.write(writer.feature(properties, geometry))
+            if row_count % STREAM_BATCH_ROWS == 0:
+                progress(row_count)
+    return row_count
+
+# format -> (file extension, writer(db, filters, path, progress) -> rows)
+EXPORT_JOB_FORMATS = {
+    'csv': ('csv', _write_csv_file),
+    'xlsx': ('xlsx', _write_xlsx),
+    'jsonl': ('jsonl', _write_jsonl_file),
+    'geojson': ('geojson', _write_geojson_file),
+    'geojsonseq': ('geojsons', _write_geojsonseq_file),
+    'gpkg': ('gpkg', _write_geopackage_file),
+    'fgb': ('fgb', _write_flatgeobuf_file),
+}
+
+def _run_export_job(writer, filters: dict, path, progress: Callable[[int], None]) -> int:
+    """Run one export writer on its own session (called in an export job worker thread)."""
+    db = _export_session(filters)
+    try:
+        return writer(db, filters, path, progress)
+    finally:
+        db.close()
+
+def _job_response(job: dict) -> ExportJobResponse:
+    status_url = f"/api/export/jobs/{job['job_id']}"
+    return ExportJobResponse(
+        job_id=job['job_id'],
+        format=job['format'],
+        status=job['status'],
+        rows_done=job['rows_done'],
+        error=job['error'],
+        created_at=job['created_at'],
+        started_at=job['started_at'],
+        finished_at=job['finished_at'],
+        status_url=status_url,
+        download_url=f"{status_url}/download" if job['status'] == 'done' else None,
+    )
+
+@router.post("/jobs", response_model=ExportJobResponse, status_code=202)
+async def create_export_job(
+    export_format: str = Query(..., alias="format", pattern="^(csv|xlsx|jsonl|geojson|geojsonseq|gpkg|fgb)$"),
+    filters: dict = Depends(export_filter_params),
+):
+    """
+    Queue a background export. Takes the same filter query parameters as the other exports.
+    Poll status_url for rows_done; download_url is set when the file is ready.
+    """
+    if export_format == 'gpkg' and not _fiona_available():
+        raise HTTPException(status_code=400, detail="GeoPackage exports require fiona/GDAL, which is not installed on this server.")
+    extension, writer = EXPORT_JOB_FORMATS[export_format]
+    job = export_jobs.submit(
+        export_format, extension, functools.partial(_run_export_job, writer, filters), params=filters
+    )
+    return _job_response(job)
+
+@router.get("/jobs/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(job_id: str):
+    """Status and progress of a background export."""
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found (it may have expired)")
+    return _job_response(job)
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(job_id: str):
+    """Download a finished background export."""
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found (it may have expired)")
+    if job['status'] != 'done':
+        raise HTTPException(status_code=409, detail=f"Export job is {job['status']}")
+    path = export_jobs.artifact_path(job)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Export file has expired")
+    created = datetime.fromisoformat(job['created_at']).strftime('%Y%m%d_%H%M%S')
+    extension = EXPORT_JOB_FORMATS[job['format']][0]
+    return FileResponse(path, filename=f"ct_properties_export_{created}.{extension}")
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session, defer
 from sqlalchemy import func, or_, and_
 from typing import Optional, List
-from database import get_db
+from database import get_read_db
 from models import Property
+from services.lead_lists import RECENT_SALE_DAYS, lead_count
+from services.statement_timeouts import statement_timeouts
 from api.routes.properties import PropertyResponse
+from api.routes.search import page_geometries
 from pydantic import BaseModel
 from datetime import date, timedelta
 import json
@@ -16,34 +19,48 @@ class FilterResponse(BaseModel):
     total: int
     filter_type: str
 
+def get_filter_db(request: Request, db: Session = Depends(get_read_db)) -> Session:
+    """Read session bounded by the search time budget for the whole request"""
+    statement_timeouts.apply(db, "search", request)
+    return db
+
+def _property_query(db: Session):
+    # Geometry is fetched as GeoJSON in one bulk query by _format_properties; skip the raw column here
+    return db.query(Property).options(defer(Property.geometry))
+
+def _lead_total(db: Session, category: Optional[str], query) -> int:
+    """Precomputed lead_category_counts total for category, else count the query"""
+    total = lead_count(db, category) if category else None
+    return total if total is not None else query.count()
+
 @router.get("/high-equity", response_model=FilterResponse)
 async def high_equity_properties(
     min_equity: float = Query(50000, description="Minimum equity in dollars"),
     min_equity_percent: Optional[float] = Query(None, description="Minimum equity percentage"),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=500),
-    db: Session = Depends(get_db)
+    geometry_mode: Optional[str] = Query("full", description="Geometry in response: 'centroid' (Point) or 'full' (polygon)"),
+    db: Session = Depends(get_filter_db)
 ):
     """Find properties with high equity (assessment value significantly higher than last sale price)"""
-    query = db.query(Property).filter(
-        Property.equity_estimate.isnot(None),
-        Property.equity_estimate >= min_equity
-    )
+    # equity_amount is NULL unless both assessed value and last sale price are set
+    query = _property_query(db).filter(Property.equity_amount >= min_equity)
     
     if min_equity_percent and min_equity_percent > 0:
-        # Filter by percentage if last sale price exists
+        # Filter by percentage if last sale price exists (absolute difference, as two indexed ranges)
         query = query.filter(
             or_(
                 Property.last_sale_price.is_(None),
-                func.abs(Property.assessed_value - Property.last_sale_price) / Property.last_sale_price * 100 >= min_equity_percent
+                Property.equity_pct >= min_equity_percent,
+                Property.equity_pct <= -min_equity_percent
             )
         )
     
     total = query.count()
     skip = (page - 1) * page_size
-    properties = query.order_by(Property.equity_estimate.desc()).offset(skip).limit(page_size).all()
+    properties = query.order_by(Property.equity_amount.desc()).offset(skip).limit(page_size).all()
     
-    results = _format_properties(properties, db)
+    results = _format_properties(properties, db, geometry_mode)
     
     return FilterResponse(
         properties=results,
@@ -57,7 +74,8 @@ async def vacant_properties(
     include_structures: bool = Query(True, description="Include vacant structures"),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=500),
-    db: Session = Depends(get_db)
+    geometry_mode: Optional[str] = Query("full", description="Geometry in response: 'centroid' (Point) or 'full' (polygon)"),
+    db: Session = Depends(get_filter_db)
 ):
     """Find vacant properties (lots or structures)"""
     conditions = []
@@ -85,13 +103,15 @@ async def vacant_properties(
     if not conditions:
         return FilterResponse(properties=[], total=0, filter_type="vacant")
     
-    query = db.query(Property).filter(or_(*conditions))
+    query = _property_query(db).filter(or_(*conditions))
     
-    total = query.count()
+    category = "vacant" if len(conditions) == 2 else ("vacant_lots" if include_lots else "vacant_structures")
+    total = _lead_total(db, category, query)
     skip = (page - 1) * page_size
-    properties = query.offset(skip).limit(page_size).all()
+    # id order follows the idx_property_lead_vacant partial index
+    properties = query.order_by(Property.id).offset(skip).limit(page_size).all()
     
-    results = _format_properties(properties, db)
+    results = _format_properties(properties, db, geometry_mode)
     
     return FilterResponse(
         properties=results,
@@ -103,16 +123,18 @@ async def vacant_properties(
 async def absentee_owner_properties(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=500),
-    db: Session = Depends(get_db)
+    geometry_mode: Optional[str] = Query("full", description="Geometry in response: 'centroid' (Point) or 'full' (polygon)"),
+    db: Session = Depends(get_filter_db)
 ):
     """Find properties with absentee owners (owner address differs from property address)"""
-    query = db.query(Property).filter(Property.is_absentee == 1)
+    query = _property_query(db).filter(Property.is_absentee == 1)
     
-    total = query.count()
+    total = _lead_total(db, "absentee_owners", query)
     skip = (page - 1) * page_size
-    properties = query.offset(skip).limit(page_size).all()
+    # id order follows the idx_property_lead_absentee partial index
+    properties = query.order_by(Property.id).offset(skip).limit(page_size).all()
     
-    results = _format_properties(properties, db)
+    results = _format_properties(properties, db, geometry_mode)
     
     return FilterResponse(
         properties=results,
@@ -127,12 +149,13 @@ async def recently_sold_properties(
     max_price: Optional[float] = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=500),
-    db: Session = Depends(get_db)
+    geometry_mode: Optional[str] = Query("full", description="Geometry in response: 'centroid' (Point) or 'full' (polygon)"),
+    db: Session = Depends(get_filter_db)
 ):
     """Find properties sold within the specified number of days"""
     cutoff_date = date.today() - timedelta(days=days)
     
-    query = db.query(Property).filter(
+    query = _property_query(db).filter(
         Property.last_sale_date.isnot(None),
         Property.last_sale_date >= cutoff_date
     )
@@ -142,11 +165,14 @@ async def recently_sold_properties(
     if max_price:
         query = query.filter(Property.last_sale_price <= max_price)
     
-    total = query.count()
+    # The precomputed count covers the default window without price bounds
+    category = "recently_sold" if days == RECENT_SALE_DAYS and not min_price and not max_price else None
+    total = _lead_total(db, category, query)
     skip = (page - 1) * page_size
-    properties = query.order_by(Property.last_sale_date.desc()).offset(skip).limit(page_size).all()
+    # (last_sale_date DESC, id) follows the idx_property_lead_recent_sale partial index
+    properties = query.order_by(Property.last_sale_date.desc(), Property.id).offset(skip).limit(page_size).all()
     
-    results = _format_properties(properties, db)
+    results = _format_properties(properties, db, geometry_mode)
     
     return FilterResponse(
         properties=results,
@@ -159,20 +185,18 @@ async def low_equity_properties(
     max_equity: float = Query(10000, description="Maximum equity in dollars"),
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=500),
-    db: Session = Depends(get_db)
+    geometry_mode: Optional[str] = Query("full", description="Geometry in response: 'centroid' (Point) or 'full' (polygon)"),
+    db: Session = Depends(get_filter_db)
 ):
     """Find properties with low equity (potentially underwater)"""
-    query = db.query(Property).filter(
-        Property.last_sale_price.isnot(None),
-        Property.assessed_value.isnot(None),
-        Property.assessed_value - Property.last_sale_price <= max_equity
-    )
+    # equity_amount is NULL unless both assessed value and last sale price are set
+    query = _property_query(db).filter(Property.equity_amount <= max_equity)
     
     total = query.count()
     skip = (page - 1) * page_size
-    properties = query.order_by(Property.assessed_value - Property.last_sale_price).offset(skip).limit(page_size).all()
+    properties = query.order_by(Property.equity_amount).offset(skip).limit(page_size).all()
     
-    results = _format_properties(properties, db)
+    results = _format_properties(properties, db, geometry_mode)
     
     return FilterResponse(
         properties=results,
@@ -180,14 +204,14 @@ async def low_equity_properties(
         filter_type="low_equity"
     )
 
-def _format_properties(properties, db):
-    """Helper function to format properties with geometry"""
+def _format_properties(properties, db, geometry_mode: Optional[str] = "full"):
+    """Helper function to format properties with geometry (one bulk geometry query for the page, no N+1)"""
+    geom_map = {row.id: row.geom for row in page_geometries(db, properties, geometry_mode)}
+    
     results = []
     for prop in properties:
         try:
-            geom_result = db.execute(
-                func.ST_AsGeoJSON(prop.geometry)
-            ).scalar()
+            geom_result = geom_map.get(prop.id)
             
             # Create response object manually to avoid from_orm issues (Pydantic v2)
             result = PropertyResponse(
@@ -214,7 +238,7 @@ def _format_properties(properties, db):
                 last_sale_price=prop.last_sale_price,
                 is_absentee=prop.is_absentee or 0,
                 is_vacant=prop.is_vacant or 0,
-                equity_estimate=prop.equity_estimate,
+                equity_estimate=prop.equity_amount,
                 geometry={"type": "Feature", "geometry": json.loads(geom_result) if geom_result else None}
             )
             results.append(result)
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import Integer, func, select
 from typing import Optional, List
-from database import get_db
+from database import get_db, get_async_db
 from models import Property, Sale, PropertyComment
 from pydantic import BaseModel, EmailStr, field_validator
 from datetime import date, datetime
 import json
 import re
+from services.statement_cache import any_of
 
 router = APIRouter()
 
@@ -144,102 +146,175 @@ class PropertyUpdateRequest(BaseModel):
                 raise ValueError('Year built must be between 1800 and 2100')
         return v
 
-@router.get("/{property_id}", response_model=PropertyDetailResponse)
-async def get_property(property_id: int, db: Session = Depends(get_db)):
-    """Get detailed information about a specific property"""
-    property = db.query(Property).filter(Property.id == property_id).first()
-    if not property:
-        raise HTTPException(status_code=404, detail="Property not found")
+# Most ids accepted by /batch (multi-select and hover prefetch)
+MAX_BATCH_IDS = 500
+
+class PropertyBatchRequest(BaseModel):
+    ids: List[int]
+    geometry_mode: Optional[str] = "full"  # 'full' (polygon) or 'centroid' (Point)
+
+class PropertyBatchResponse(BaseModel):
+    properties: List[PropertyDetailResponse]  # In requested order
+    missing_ids: List[int] = []  # Requested ids that do not exist
+
+def _sale_dict(sale: Sale) -> dict:
+    return {
+        "sale_date": sale.sale_date.isoformat() if sale.sale_date else None,
+        "sale_price": sale.sale_price,
+        "buyer_name": sale.buyer_name,
+        "seller_name": sale.seller_name,
+        "deed_type": sale.deed_type
+    }
+
+def _detail_response(property: Property, geom_result: Optional[str], sales: List[Sale]) -> PropertyDetailResponse:
+    """Build a PropertyDetailResponse from a Property, its GeoJSON text and its sales (newest first)."""
+    # Create response object manually to avoid from_orm issues
+    result = PropertyDetailResponse(
+        id=property.id,
+        parcel_id=property.parcel_id,
+        address=property.address,
+        municipality=property.municipality,
+        zip_code=property.zip_code,
+        owner_name=property.owner_name,
+        owner_phone=property.owner_phone,
+        owner_email=property.owner_email,
+        assessed_value=property.assessed_value,
+        land_value=property.land_value,
+        building_value=property.building_value,
+        property_type=property.property_type,
+        land_use=property.land_use,
+        zoning=property.zoning,
+        lot_size_sqft=property.lot_size_sqft,
+        year_built=property.year_built,
+        last_sale_date=property.last_sale_date,
+        last_sale_price=property.last_sale_price,
+        is_absentee=property.is_absentee or 0,
+        is_vacant=property.is_vacant or 0,
+        equity_estimate=property.equity_amount,
+        owner_address=property.owner_address,
+        owner_city=property.owner_city,
+        owner_state=property.owner_state,
+        building_area_sqft=property.building_area_sqft,
+        bedrooms=property.bedrooms,
+        bathrooms=property.bathrooms,
+        stories=property.stories,
+        total_rooms=property.total_rooms,
+        sales_count=property.sales_count or 0,
+        days_since_sale=property.days_since_sale,
+        additional_data=property.additional_data,
+        # Tax Information
+        tax_amount=property.tax_amount,
+        tax_year=property.tax_year,
+        tax_exemptions=property.tax_exemptions,
+        assessment_year=property.assessment_year,
+        # Building Exterior Details
+        exterior_walls=property.exterior_walls,
+        roof_type=property.roof_type,
+        roof_material=property.roof_material,
+        foundation_type=property.foundation_type,
+        exterior_finish=property.exterior_finish,
+        garage_type=property.garage_type,
+        garage_spaces=property.garage_spaces,
+        # Building Interior Details
+        interior_finish=property.interior_finish,
+        heating_type=property.heating_type,
+        cooling_type=property.cooling_type,
+        fireplace_count=property.fireplace_count,
+        geometry={"type": "Feature", "geometry": json.loads(geom_result) if geom_result else None}
+    )
+    result.sales = [_sale_dict(sale) for sale in sales]
+    return result
+
+def _detail_select(ids: List[int], geometry_mode: Optional[str] = "full"):
+    """(Property, GeoJSON text) rows for ids; the raw geometry column is not loaded."""
+    geometry = func.ST_Centroid(Property.geometry) if (geometry_mode or "").lower() == "centroid" else Property.geometry
+    return select(Property, func.ST_AsGeoJSON(geometry)).options(defer(Property.geometry)).where(Property.id == any_of(ids, Integer))
+
+def _sales_select(ids: List[int]):
+    """Sales of the properties in ids, newest first per property."""
+    return select(Sale).where(Sale.property_id == any_of(ids, Integer)).order_by(Sale.property_id, Sale.sale_date.desc())
+
+async def _get_properties_batch(ids: List[int], geometry_mode: Optional[str], db: AsyncSession) -> PropertyBatchResponse:
+    """Detail records for ids in two set-based queries: properties with GeoJSON, then all their sales."""
+    ids = list(dict.fromkeys(ids))  # De-duplicate, keep order
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per batch request")
+    if not ids:
+        return PropertyBatchResponse(properties=[])
     
-    # Get sales history
-    sales = db.query(Sale).filter(Sale.property_id == property_id).order_by(Sale.sale_date.desc()).all()
+    rows = (await db.execute(_detail_select(ids, geometry_mode))).all()
     
-    # Convert geometry to GeoJSON
+    sales_by_property = {}
+    for sale in (await db.scalars(_sales_select(ids))).all():
+        sales_by_property.setdefault(sale.property_id, []).append(sale)
+    
+    by_id = {property.id: (property, geom_result) for property, geom_result in rows}
+    return PropertyBatchResponse(
+        properties=[
+            _detail_response(by_id[property_id][0], by_id[property_id][1], sales_by_property.get(property_id, []))
+            for property_id in ids if property_id in by_id
+        ],
+        missing_ids=[property_id for property_id in ids if property_id not in by_id],
+    )
+
+@router.get("/batch", response_model=PropertyBatchResponse)
+async def get_properties_batch(
+    ids: str = Query(..., description=f"Comma-separated property ids (at most {MAX_BATCH_IDS})"),
+    geometry_mode: Optional[str] = Query("full", description="'full' (polygon) or 'centroid' (Point)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Detail records for several properties in one request (same records as /{property_id})."""
     try:
-        geom_result = db.execute(
-            func.ST_AsGeoJSON(property.geometry)
-        ).scalar()
-        
-        # Create response object manually to avoid from_orm issues
-        result = PropertyDetailResponse(
-            id=property.id,
-            parcel_id=property.parcel_id,
-            address=property.address,
-            municipality=property.municipality,
-            zip_code=property.zip_code,
-            owner_name=property.owner_name,
-            owner_phone=property.owner_phone,
-            owner_email=property.owner_email,
-            assessed_value=property.assessed_value,
-            land_value=property.land_value,
-            building_value=property.building_value,
-            property_type=property.property_type,
-            land_use=property.land_use,
-            zoning=property.zoning,
-            lot_size_sqft=property.lot_size_sqft,
-            year_built=property.year_built,
-            last_sale_date=property.last_sale_date,
-            last_sale_price=property.last_sale_price,
-            is_absentee=property.is_absentee or 0,
-            is_vacant=property.is_vacant or 0,
-            equity_estimate=property.equity_estimate,
-            owner_address=property.owner_address,
-            owner_city=property.owner_city,
-            owner_state=property.owner_state,
-            building_area_sqft=property.building_area_sqft,
-            bedrooms=property.bedrooms,
-            bathrooms=property.bathrooms,
-            stories=property.stories,
-            total_rooms=property.total_rooms,
-            sales_count=property.sales_count or 0,
-            days_since_sale=property.days_since_sale,
-            additional_data=property.additional_data,
-            # Tax Information
-            tax_amount=property.tax_amount,
-            tax_year=property.tax_year,
-            tax_exemptions=property.tax_exemptions,
-            assessment_year=property.assessment_year,
-            # Building Exterior Details
-            exterior_walls=property.exterior_walls,
-            roof_type=property.roof_type,
-            roof_material=property.roof_material,
-            foundation_type=property.foundation_type,
-            exterior_finish=property.exterior_finish,
-            garage_type=property.garage_type,
-            garage_spaces=property.garage_spaces,
-            # Building Interior Details
-            interior_finish=property.interior_finish,
-            heating_type=property.heating_type,
-            cooling_type=property.cooling_type,
-            fireplace_count=property.fireplace_count,
-            geometry={"type": "Feature", "geometry": json.loads(geom_result) if geom_result else None}
-        )
+        id_list = [int(part) for part in ids.split(',') if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    return await _get_properties_batch(id_list, geometry_mode, db)
+
+@router.post("/batch", response_model=PropertyBatchResponse)
+async def post_properties_batch(batch_request: PropertyBatchRequest, db: AsyncSession = Depends(get_async_db)):
+    """Same as GET /batch with the ids in the body (for long id lists)."""
+    return await _get_properties_batch(batch_request.ids, batch_request.geometry_mode, db)
+
+def _property_detail(property, geom_result: Optional[str], sales: List[Sale]) -> PropertyDetailResponse:
+    """_detail_response, reporting build errors as 500"""
+    try:
+        return _detail_response(property, geom_result, sales)
     except Exception as e:
         import traceback
         print(f"Error processing property {property.id}: {e}")
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error processing property: {str(e)}")
-    result.sales = [
-        {
-            "sale_date": sale.sale_date.isoformat() if sale.sale_date else None,
-            "sale_price": sale.sale_price,
-            "buyer_name": sale.buyer_name,
-            "seller_name": sale.seller_name,
-            "deed_type": sale.deed_type
-        }
-        for sale in sales
-    ]
+
+def _load_property_detail(db: Session, property_id: int) -> PropertyDetailResponse:
+    """Detail record for one property on a sync session (after updates)."""
+    row = db.execute(_detail_select([property_id])).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Property not found")
+    property, geom_result = row
+    sales = db.scalars(_sales_select([property_id])).all()
+    return _property_detail(property, geom_result, sales)
+
+@router.get("/{property_id}", response_model=PropertyDetailResponse)
+async def get_property(property_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get detailed information about a specific property"""
+    row = (await db.execute(_detail_select([property_id]))).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Property not found")
+    property, geom_result = row
     
-    return result
+    # Get sales history
+    sales = (await db.scalars(_sales_select([property_id]))).all()
+    
+    return _property_detail(property, geom_result, sales)
 
 @router.get("/parcel/{parcel_id}", response_model=PropertyDetailResponse)
-async def get_property_by_parcel(parcel_id: str, db: Session = Depends(get_db)):
+async def get_property_by_parcel(parcel_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get property by parcel ID"""
-    property = db.query(Property).filter(Property.parcel_id == parcel_id).first()
-    if not property:
+    property_id = await db.scalar(select(Property.id).where(Property.parcel_id == parcel_id).limit(1))
+    if property_id is None:
         raise HTTPException(status_code=404, detail="Property not found")
     
-    return await get_property(property.id, db)
+    return await get_property(property_id, db)
 
 @router.get("/", response_model=List[PropertyResponse])
 async def list_properties(
@@ -252,7 +327,7 @@ async def list_properties(
     query = db.query(Property)
     
     if municipality:
-        query = query.filter(func.lower(func.trim(Property.municipality)) == municipality.strip().lower())
+        query = query.filter(Property.municipality_norm == municipality.strip().lower())
     
     properties = query.offset(skip).limit(limit).all()
     
@@ -286,7 +361,7 @@ async def list_properties(
                 last_sale_price=prop.last_sale_price,
                 is_absentee=prop.is_absentee or 0,
                 is_vacant=prop.is_vacant or 0,
-                equity_estimate=prop.equity_estimate,
+                equity_estimate=prop.equity_amount,
                 geometry={"type": "Feature", "geometry": json.loads(geom_result) if geom_result else None}
             )
             results.append(result)
@@ -323,7 +398,7 @@ async def update_property(
         db.refresh(property)
         
         # Return updated property using same logic as get_property
-        return await get_property(property_id, db)
+        return _load_property_detail(db, property_id)
         
     except ValueError as e:
         db.rollback()
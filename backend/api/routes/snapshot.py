@@ -0,0 +1,92 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel
+from typing import List, Optional
+from urllib.parse import quote
+from database import read_session
+from services.property_snapshot import property_snapshots, pyarrow_available
+
+router = APIRouter()
+
+class SnapshotPartition(BaseModel):
+    municipality: Optional[str] = None
+    rows: int
+    bytes: int
+    download_url: Optional[str] = None
+
+class SnapshotResponse(BaseModel):
+    build_id: Optional[str] = None  # None until the first build completes
+    created_at: Optional[str] = None
+    row_count: int = 0
+    columns: List[str] = []
+    partitions: List[SnapshotPartition] = []
+    building: bool  # A build is running in this worker
+    download_url: Optional[str] = None  # Whole snapshot as a tar of the Parquet partitions
+
+def _snapshot_response(manifest: Optional[dict]) -> SnapshotResponse:
+    if manifest is None:
+        return SnapshotResponse(building=property_snapshots.building)
+    return SnapshotResponse(
+        build_id=manifest['build_id'],
+        created_at=manifest['created_at'],
+        row_count=manifest['row_count'],
+        columns=manifest['columns'],
+        partitions=[
+            SnapshotPartition(
+                municipality=partition['municipality'],
+                rows=partition['rows'],
+                bytes=partition['bytes'],
+                download_url=f"/api/snapshot/partitions/{quote(partition['municipality'])}" if partition['municipality'] else None,
+            )
+            for partition in manifest['partitions']
+        ],
+        building=property_snapshots.building,
+        download_url="/api/snapshot/download",
+    )
+
+def _current_manifest() -> dict:
+    manifest = property_snapshots.current()
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="No snapshot has been built yet (POST /api/snapshot/build)")
+    return manifest
+
+@router.get("/", response_model=SnapshotResponse)
+async def get_snapshot():
+    """Current Parquet snapshot of the properties table: build time, row counts and download links."""
+    return _snapshot_response(property_snapshots.current())
+
+@router.post("/build", response_model=SnapshotResponse, status_code=202)
+async def build_snapshot():
+    """Start an on-demand snapshot build (normally nightly). The new snapshot replaces the current one when done."""
+    if not pyarrow_available():
+        raise HTTPException(status_code=400, detail="Snapshot builds require pyarrow, which is not installed on this server.")
+    if not property_snapshots.start_build(read_session):
+        raise HTTPException(status_code=409, detail="A snapshot build is already running")
+    return _snapshot_response(property_snapshots.current())
+
+@router.get("/download")
+async def download_snapshot():
+    """
+    Download the whole snapshot as a tar of Hive-partitioned Parquet files
+    (properties/municipality=<town>/part-0.parquet). Extract and open with
+    pyarrow.dataset.dataset("properties", partitioning="hive") or pandas.read_parquet("properties").
+    """
+    manifest = _current_manifest()
+    return StreamingResponse(
+        property_snapshots.iter_archive(manifest),
+        media_type="application/x-tar",
+        headers={"Content-Disposition": f"attachment; filename=ct_properties_snapshot_{manifest['build_id']}.tar"}
+    )
+
+@router.get("/partitions/{municipality}")
+async def download_snapshot_partition(municipality: str):
+    """Download one municipality's Parquet file from the current snapshot."""
+    manifest = _current_manifest()
+    path = property_snapshots.partition_path(manifest, municipality)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No snapshot partition for municipality '{municipality}'")
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.parquet",
+        filename=f"ct_properties_{municipality.strip().replace(' ', '_')}_{manifest['build_id']}.parquet",
+    )
@@ -1,38 +1,187 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from pydantic_settings import BaseSettings
+from typing import Optional
+import logging
 import os
+import time
+import uuid
 from dotenv import load_dotenv
 
+from services.pool_metrics import TimedAsyncAdaptedQueuePool, TimedNullPool, TimedQueuePool, instrument
+from services.statement_cache import count_cache_hits
+
 load_dotenv()
 
 class Settings(BaseSettings):
     database_url: str = os.getenv("DATABASE_URL", "postgresql://localhost:5432/ct_properties")
-    
+    # Optional read replica (streaming standby) for the heavy read endpoints
+    read_database_url: Optional[str] = os.getenv("READ_DATABASE_URL") or None
+    # Reads fall back to the primary while the replica is further behind than this
+    replica_max_lag_seconds: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "30"))
+    # Connection pools, per engine and per worker process (see /health/metrics for waits)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Ping each connection on checkout (one extra round trip); with it off, set
+    # DB_POOL_RECYCLE below the server's/firewall's idle timeout instead
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+    # Connecting through PgBouncer in transaction mode: no app-side pooling (NullPool) and no
+    # reuse of server-side prepared statements, which would not survive switching server connections
+    db_pgbouncer: bool = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+    # Compiled SQL statements kept per engine (SQLAlchemy's default is 500); hit rates in /health/metrics
+    db_query_cache_size: int = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))
+
     class Config:
         env_file = ".env"
         extra = "ignore"  # Ignore extra fields in .env (like NOMINATIM_URL)
 
 settings = Settings()
+logger = logging.getLogger(__name__)
 
-# Add connect_timeout so health check and requests fail fast when DB is unreachable
-db_url = settings.database_url
-if "?" in db_url:
-    db_url += "&connect_timeout=3"
-else:
-    db_url += "?connect_timeout=3"
-
-engine = create_engine(
-    db_url,
-    pool_size=10,  # Support parallel workers
-    max_overflow=20,  # Allow additional connections during peak load
-    pool_pre_ping=True,  # Verify connections before using
-    echo=False
-)
+def _pool_args(async_pool: bool) -> dict:
+    """Pool arguments from settings; timed pool classes feed /health/metrics (services/pool_metrics.py)."""
+    if settings.db_pgbouncer:
+        return {"poolclass": TimedNullPool}
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if async_pool else TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+def _create_sync_engine(url: str, name: str):
+    # Add connect_timeout so health check and requests fail fast when DB is unreachable
+    url += ("&" if "?" in url else "?") + "connect_timeout=3"
+    sync_engine = create_engine(
+        url, pool_logging_name=name, query_cache_size=settings.db_query_cache_size, echo=False,
+        **_pool_args(async_pool=False)
+    )
+    instrument(name, sync_engine)
+    count_cache_hits(name, sync_engine)
+    return sync_engine
+
+engine = _create_sync_engine(settings.database_url, "primary")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for the hot read endpoints: search, autocomplete, options, bounds and
+# property details await their queries instead of blocking the event loop, so one worker serves
+# many concurrent map viewports. Same database; asyncpg takes its connect timeout as an argument.
+def _create_async_engine(url: str, name: str):
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    async_url = async_url.set(query={k: v for k, v in async_url.query.items() if k != "connect_timeout"})
+    connect_args = {"timeout": 3}
+    if settings.db_pgbouncer:
+        # asyncpg caches and names prepared statements per server connection; PgBouncer
+        # hands each transaction a different one, so turn both caches off and use unique names
+        async_url = async_url.update_query_dict({"prepared_statement_cache_size": "0"})
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+        )
+    async_engine = create_async_engine(
+        async_url, pool_logging_name=name, query_cache_size=settings.db_query_cache_size,
+        connect_args=connect_args, echo=False, **_pool_args(async_pool=True)
+    )
+    instrument(name, async_engine.sync_engine)
+    count_cache_hits(name, async_engine.sync_engine)
+    return async_engine
+
+async_engine = _create_async_engine(settings.database_url, "primary_async")
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Read replica (READ_DATABASE_URL): search, autocomplete, filter pages, exports and snapshot
+# builds read from it, so bulk imports writing to the primary do not slow them down. Writes,
+# property details (read-your-writes after an edit) and result sets (UNLOGGED tables are not
+# replicated) stay on the primary. replica_status is refreshed in the background (main.py
+# lifespan); while the replica is unreachable or lags more than REPLICA_MAX_LAG_SECONDS,
+# read sessions go to the primary. Without READ_DATABASE_URL everything uses the primary.
+read_engine = _create_sync_engine(settings.read_database_url, "replica") if settings.read_database_url else None
+async_read_engine = _create_async_engine(settings.read_database_url, "replica_async") if settings.read_database_url else None
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if read_engine else None
+AsyncReadSessionLocal = (
+    async_sessionmaker(async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if async_read_engine else None
+)
+
+# Seconds of replay lag: 0 on a primary, or when the standby has replayed all WAL it has
+# received (an idle primary would otherwise look like steadily growing lag)
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+class ReplicaStatus:
+    """Whether reads may use the replica: reachable and within max_lag_seconds at the last check."""
+
+    # Seconds between background checks
+    CHECK_INTERVAL_SECONDS = 5
+
+    def __init__(self, max_lag_seconds: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.usable = False
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+
+    async def check(self) -> bool:
+        """Measure the replica's lag and update usable."""
+        if async_read_engine is None:
+            return False
+        try:
+            async with async_read_engine.connect() as conn:
+                lag = float(await conn.scalar(_REPLICA_LAG_SQL))
+            self._record(lag <= self.max_lag_seconds, lag, None)
+        except Exception as e:
+            self._record(False, None, str(e))
+        return self.usable
+
+    def _record(self, usable: bool, lag: Optional[float], error: Optional[str]) -> None:
+        if usable != self.usable:
+            if usable:
+                logger.info("Read replica in use (lag %.1fs)", lag)
+            elif error:
+                logger.warning("Read replica unreachable, reads go to the primary: %s", error)
+            else:
+                logger.warning("Read replica %.1fs behind (max %.0fs), reads go to the primary", lag, self.max_lag_seconds)
+        self.usable, self.lag_seconds, self.error = usable, lag, error
+        self.checked_at = time.time()
+
+    def describe(self) -> dict:
+        return {
+            "configured": read_engine is not None,
+            "in_use": self.usable,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "error": self.error,
+        }
+
+replica_status = ReplicaStatus(settings.replica_max_lag_seconds)
+
+def read_session():
+    """Session for read-only work: on the replica when it is usable, else the primary."""
+    if ReadSessionLocal is not None and replica_status.usable:
+        return ReadSessionLocal()
+    return SessionLocal()
+
+def async_read_session() -> AsyncSession:
+    """AsyncSession for read-only work: on the replica when it is usable, else the primary."""
+    if AsyncReadSessionLocal is not None and replica_status.usable:
+        return AsyncReadSessionLocal()
+    return AsyncSessionLocal()
+
 Base = declarative_base()
 
 def get_db():
@@ -41,3 +190,18 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db():
+    db = read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db():
+    async with async_read_session() as db:
+        yield db
@@ -0,0 +1,58 @@
+"""
+Production server profile: gunicorn supervising uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Workers default to the CPUs available to the container (its cgroup CPU limit, else the
+CPU affinity mask); set WEB_CONCURRENCY to override. The app is imported once in the master
+(preload_app) and forked, so workers share the imported modules' memory. Per-host state the
+workers must agree on (options cache, analytics) lives in the shared SQLite store
+(services/local_store.py); result sets and export jobs are already shared.
+
+Development keeps `uvicorn main:app --reload` (docker-compose.yml).
+"""
+import math
+import os
+
+
+def _available_cpus() -> int:
+    # cgroup v2 CPU quota (docker --cpus / deploy.resources.limits.cpus), e.g. "200000 100000"
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY") or _available_cpus())
+preload_app = True
+
+# Searches and options queries are capped by statement timeouts well below this
+timeout = 120
+graceful_timeout = 30
+keepalive = 75
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # The master imported the app (and created the engines) before forking; drop any pooled
+    # connections it holds without closing them, so each worker opens its own.
+    # (Threads do not survive the fork; services/tracing.py starts its listener in each worker
+    # on the first recorded event.)
+    from database import async_engine, async_read_engine, engine, read_engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    if read_engine is not None:
+        read_engine.dispose(close=False)
+        async_read_engine.sync_engine.dispose(close=False)
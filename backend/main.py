@@ -1,14 +1,19 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 import asyncio
 import logging
+import os
 
 from sqlalchemy.exc import OperationalError, DBAPIError
 
-from api.routes import properties, search, filters, export, analytics, autocomplete, remediation
-from database import engine, Base
+from api.routes import properties, search, filters, export, analytics, autocomplete, remediation, snapshot
+from database import engine, async_engine, async_read_engine, replica_status, Base
+from services.query_cancellation import ClientDisconnected, CLIENT_CLOSED_REQUEST
+from services.pool_metrics import pool_metrics
+from services.statement_cache import statement_cache_metrics
+from services.statement_timeouts import StatementTimeout, is_statement_timeout, statement_timeouts
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -102,6 +107,12 @@ async def health_monitor_task():
             logger.error(f"Error in health monitor: {e}")
             await asyncio.sleep(60)
 
+async def replica_monitor_task():
+    """Re-measure read replica lag so read sessions switch between replica and primary."""
+    while True:
+        await replica_status.check()
+        await asyncio.sleep(replica_status.CHECK_INTERVAL_SECONDS)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown"""
@@ -117,18 +128,25 @@ async def lifespan(app: FastAPI):
         logger.warning("Startup DB check/setup failed (app will still serve; /health will work): %s", e)
         health_status["database"] = False
 
-    # Start health monitoring task
-    monitor_task = asyncio.create_task(health_monitor_task())
+    # Start health monitoring task (and replica lag checks when READ_DATABASE_URL is set)
+    monitor_tasks = [asyncio.create_task(health_monitor_task())]
+    if async_read_engine is not None:
+        await replica_status.check()
+        monitor_tasks.append(asyncio.create_task(replica_monitor_task()))
     
     yield
     
     # Shutdown
     logger.info("Shutting down CT Property Search API...")
-    monitor_task.cancel()
-    try:
-        await monitor_task
-    except asyncio.CancelledError:
-        pass
+    for monitor_task in monitor_tasks:
+        monitor_task.cancel()
+        try:
+            await monitor_task
+        except asyncio.CancelledError:
+            pass
+    await async_engine.dispose()
+    if async_read_engine is not None:
+        await async_read_engine.dispose()
 
 app = FastAPI(
     title="CT Property Search API",
@@ -160,12 +178,35 @@ app.include_router(export.router, prefix="/api/export", tags=["export"])
 app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
 app.include_router(autocomplete.router, prefix="/api/autocomplete", tags=["autocomplete"])
 app.include_router(remediation.router, prefix="/api/remediation", tags=["remediation"])
+app.include_router(snapshot.router, prefix="/api/snapshot", tags=["snapshot"])
+
+
+@app.exception_handler(ClientDisconnected)
+async def client_disconnected_handler(request, exc):
+    """Client aborted the request (stale search/autocomplete); its queries were already cancelled."""
+    return Response(status_code=CLIENT_CLOSED_REQUEST)
+
+
+@app.exception_handler(StatementTimeout)
+async def statement_timeout_handler(request, exc):
+    """A query ran out of its route's time budget (services/statement_timeouts.py)."""
+    return JSONResponse(
+        status_code=504,
+        content={"detail": f"{exc}. Narrow the search (smaller area or more filters) and try again."},
+    )
 
 
 @app.exception_handler(OperationalError)
 @app.exception_handler(DBAPIError)
 async def database_exception_handler(request, exc):
     """Return 503 with clear message when database is unreachable or errors."""
+    route_class = getattr(request.state, "statement_timeout_class", None)
+    if route_class is not None and is_statement_timeout(exc):
+        # Budget applied by a dependency (statement_timeouts.apply) rather than a scope()
+        statement_timeouts.record_timeout(route_class)
+        return await statement_timeout_handler(
+            request, StatementTimeout(route_class, statement_timeouts.budget_ms(route_class))
+        )
     logger.error(f"Database error on {request.url.path}: {exc}")
     return JSONResponse(
         status_code=503,
@@ -207,6 +248,21 @@ async def health():
     return {"status": "ok", "api": "operational"}
 
 
+@app.get("/health/metrics")
+async def health_metrics():
+    """
+    Operational counters for monitoring: statement time budgets and timeouts per route class
+    (all workers); connection pool occupancy and checkout waits, and compiled statement cache
+    hit rates (this worker, see pid).
+    """
+    return {
+        "pid": os.getpid(),
+        "statement_timeouts": statement_timeouts.metrics(),
+        "pools": pool_metrics(),
+        "statement_cache": statement_cache_metrics(),
+    }
+
+
 @app.get("/health/ready")
 async def health_ready():
     """Readiness check including DB - use for UI banner (database connected/disconnected)."""
@@ -251,6 +307,8 @@ async def health_ready():
         "database": "connected" if db_healthy else "disconnected",
         "api": "operational"
     }
+    if async_read_engine is not None:
+        response["read_replica"] = replica_status.describe()
     if not db_healthy:
         response["diagnostics"] = {
             "issue": "Database connection failed",
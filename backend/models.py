@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Text, Index, DateTime, ForeignKey, UniqueConstraint, UniqueConstraint
+from sqlalchemy import Column, Computed, Integer, String, Float, Date, Text, Index, DateTime, ForeignKey, UniqueConstraint, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
 from geoalchemy2 import Geometry
@@ -70,9 +70,26 @@ class Property(Base):
     sales_count = Column(Integer, default=0)
     
     # Calculated fields for lead generation
-    equity_estimate = Column(Float)  # Estimated equity based on assessment vs last sale
+    equity_estimate = Column(Float)  # Legacy, no longer maintained: readers use equity_amount (below)
     is_vacant = Column(Integer, default=0)  # 1 if vacant lot or vacant structure
-    days_since_sale = Column(Integer)
+    days_since_sale = Column(Integer)  # days_since_sale and sale_bucket: refreshed nightly (services/sale_fields.py)
+    sale_bucket = Column(String)  # time-since-sale range: 0-2y, 2-5y, 5-10y, 10-20y, 20y+, never
+    # Stored generated columns (maintained by Postgres on every insert/update, so imports need no
+    # changes); indexed so the equity filter pages are index range scans instead of full sorts.
+    # Added to existing databases by scripts/data_migration/add_equity_columns.py.
+    equity_amount = Column(Float, Computed("assessed_value - last_sale_price", persisted=True))
+    equity_pct = Column(Float, Computed("(assessed_value - last_sale_price) / NULLIF(last_sale_price, 0) * 100", persisted=True))
+    # Normalized copies of the multi-value filter columns (also generated, so every import write
+    # normalizes them): towns and owner states match with = ANY(:values) on a btree index; zoning,
+    # owner city and unit type ("PROPERTY TYPE<US>LAND USE", US = chr(31)) keep partial matching
+    # with LIKE ANY(:patterns) on GIN trigram indexes. See scripts/data_migration/add_filter_norm_columns.py.
+    municipality_norm = Column(String, Computed("lower(btrim(municipality))", persisted=True))
+    owner_state_norm = Column(String, Computed("upper(btrim(owner_state))", persisted=True))
+    owner_city_norm = Column(String, Computed("upper(btrim(owner_city))", persisted=True))
+    zoning_norm = Column(String, Computed("upper(btrim(zoning))", persisted=True))
+    unit_type_norm = Column(String, Computed(
+        "upper(btrim(coalesce(property_type, ''))) || chr(31) || upper(btrim(coalesce(land_use, '')))", persisted=True
+    ))
     
     # Geometry (PostGIS) - Using GEOMETRY to support both Polygon and MultiPolygon
     geometry = Column(Geometry('GEOMETRY', srid=4326), nullable=False)
@@ -97,6 +114,11 @@ class Property(Base):
         Index('idx_property_owner_state', 'owner_state'),
         Index('idx_property_property_type', 'property_type'),
         Index('idx_property_land_use', 'land_use'),
+        Index('idx_property_equity_amount', 'equity_amount'),
+        Index('idx_property_equity_pct', 'equity_pct'),
+        Index('idx_property_sale_bucket', 'sale_bucket'),
+        Index('idx_property_municipality_norm', 'municipality_norm'),
+        Index('idx_property_owner_state_norm', 'owner_state_norm'),
     )
 
 class Sale(Base):
@@ -131,3 +153,99 @@ class PropertyComment(Base):
         Index('idx_comment_property_id', 'property_id'),
         Index('idx_comment_created_at', 'created_at'),
     )
+
+# Autocomplete dictionaries: one row per distinct key with its property count, a representative
+# property and a map center. Maintained by services/suggestion_dictionaries.py (full rebuild via
+# scripts/data_migration/build_suggestion_dictionaries.py, per-town refresh after each import).
+# GiST trigram indexes on the search columns are added by that migration script.
+
+class DistinctAddress(Base):
+    __tablename__ = "distinct_addresses"
+
+    id = Column(Integer, primary_key=True)
+    address = Column(String, nullable=False)
+    municipality = Column(String, nullable=False)  # TRIM(properties.municipality)
+    search_text = Column(String, nullable=False)  # "address municipality", e.g. "224 OAK AVE Torrington"
+    property_count = Column(Integer, nullable=False, default=0)
+    first_property_id = Column(Integer)
+    center_lat = Column(Float)  # Centroid of the first property
+    center_lng = Column(Float)
+
+    __table_args__ = (
+        UniqueConstraint('address', 'municipality', name='uq_distinct_addresses_address_municipality'),
+        Index('idx_distinct_addresses_municipality', 'municipality'),
+        Index('idx_distinct_addresses_property_count', 'property_count'),
+    )
+
+class DistinctOwner(Base):
+    __tablename__ = "distinct_owners"
+
+    id = Column(Integer, primary_key=True)
+    owner_name = Column(String, nullable=False, unique=True)
+    property_count = Column(Integer, nullable=False, default=0)
+    first_property_id = Column(Integer)
+    center_lat = Column(Float)  # Centroid of all the owner's parcels
+    center_lng = Column(Float)
+
+    __table_args__ = (
+        Index('idx_distinct_owners_property_count', 'property_count'),
+    )
+
+class DistinctOwnerMailing(Base):
+    __tablename__ = "distinct_owner_mailing"
+
+    id = Column(Integer, primary_key=True)
+    owner_address = Column(String, nullable=False)
+    owner_city = Column(String, nullable=False, default='')  # '' instead of NULL so the key stays unique
+    owner_state = Column(String, nullable=False, default='')
+    full_address = Column(String, nullable=False)  # "address, city, state" as shown in suggestions
+    property_count = Column(Integer, nullable=False, default=0)
+    first_property_id = Column(Integer)
+    center_lat = Column(Float)  # Centroid of all parcels mailed to this address
+    center_lng = Column(Float)
+
+    __table_args__ = (
+        UniqueConstraint('owner_address', 'owner_city', 'owner_state', name='uq_distinct_owner_mailing_key'),
+        Index('idx_distinct_owner_mailing_property_count', 'property_count'),
+    )
+
+# Persisted search results (services/result_sets.py): the ordered property ids matching one
+# search, kept for a TTL so re-pagination, counts and exports skip re-running the filters.
+# UNLOGGED: scratch data that is cheap to write and fine to lose on a crash.
+
+class ResultSet(Base):
+    __tablename__ = "result_sets"
+
+    handle = Column(String(32), primary_key=True)  # uuid4 hex
+    filters = Column(JSONB, nullable=False)  # search_filter_params used to build it
+    total = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index('idx_result_sets_expires_at', 'expires_at'),
+        {'prefixes': ['UNLOGGED']},
+    )
+
+class ResultSetItem(Base):
+    __tablename__ = "result_set_items"
+
+    handle = Column(String(32), primary_key=True)
+    position = Column(Integer, primary_key=True)  # 1-based, in result order
+    property_id = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        {'prefixes': ['UNLOGGED']},
+    )
+
+# Per-category totals for the lead lists (services/lead_lists.py), so /api/filters pages need
+# no count(*) over properties. Refreshed nightly by scripts/data_migration/refresh_sale_fields.py
+# and after each town import.
+
+class LeadCategoryCount(Base):
+    __tablename__ = "lead_category_counts"
+
+    category = Column(String, primary_key=True)  # key of services.lead_lists.LEAD_CATEGORIES
+    property_count = Column(Integer, nullable=False)
+    as_of = Column(Date, nullable=False)  # day the count was computed (date-relative categories expire with it)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -10,6 +10,7 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 import re
+import sys
 
 
 def detect_llc(owner_name: str) -> bool:
@@ -201,6 +202,71 @@ def get_database_session():
     return SessionLocal()
 
 
+# Columns the analyses use (load_properties_from_db / load_properties_from_snapshot)
+ANALYSIS_COLUMNS = [
+    'id', 'parcel_id', 'address', 'municipality', 'owner_name', 'owner_address', 'owner_city',
+    'owner_state', 'owner_zip', 'assessed_value', 'land_value', 'building_value', 'total_value',
+    'property_type', 'lot_size_sqft', 'is_vacant', 'is_absentee',
+]
+
+
+def load_properties(
+    municipality: Optional[str] = None,
+    db_session = None
+) -> pd.DataFrame:
+    """
+    Load properties for an analysis: from the Parquet snapshot when one has been built
+    (PROPERTY_SNAPSHOT_DIR), otherwise from the database
+    
+    Args:
+        municipality: Optional municipality filter
+        db_session: Database session for the fallback (creates new if None)
+        
+    Returns:
+        DataFrame with property data
+    """
+    df = load_properties_from_snapshot(municipality=municipality)
+    if df is not None:
+        return df
+    return load_properties_from_db(municipality=municipality, db_session=db_session)
+
+
+def load_properties_from_snapshot(
+    municipality: Optional[str] = None,
+    snapshot_dir: Optional[str] = None
+) -> Optional[pd.DataFrame]:
+    """
+    Load properties from the current Parquet snapshot (services/property_snapshot.py)
+    
+    Reads only the needed columns, and only the town's partition when municipality is set;
+    files are memory-mapped rather than copied through a database cursor.
+    
+    Args:
+        municipality: Optional municipality filter
+        snapshot_dir: Snapshot directory (default: PROPERTY_SNAPSHOT_DIR)
+        
+    Returns:
+        DataFrame with property data, or None if no snapshot has been built
+    """
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from services.property_snapshot import PropertySnapshots, snapshot_partitioning
+    
+    snapshots = PropertySnapshots(snapshot_dir) if snapshot_dir else PropertySnapshots.from_env()
+    manifest = snapshots.current()
+    if manifest is None:
+        return None
+    print(f"  Reading snapshot {manifest['build_id']} ({manifest['row_count']:,} properties)")
+    
+    df = pd.read_parquet(
+        snapshots.build_dir(manifest),
+        columns=ANALYSIS_COLUMNS,
+        partitioning=snapshot_partitioning(),
+        filters=[('municipality', '==', municipality)] if municipality else None,
+        memory_map=True,
+    )
+    return df
+
+
 def load_properties_from_db(
     municipality: Optional[str] = None,
     db_session = None
@@ -17,7 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from scripts.analysis.analysis_utils import (
     get_database_session,
-    load_properties_from_db,
+    load_properties,
     export_to_excel,
     create_summary_sheet,
     format_currency,
@@ -49,11 +49,11 @@ def analyze_top_owners_by_address(
     
     try:
         # Load properties from database
-        print(f"\nLoading properties from database...")
+        print(f"\nLoading properties...")
         if municipality:
             print(f"  Filtering by municipality: {municipality}")
         
-        df = load_properties_from_db(municipality=municipality, db_session=db)
+        df = load_properties(municipality=municipality, db_session=db)
         
         if len(df) == 0:
             print("  ⚠️  No properties found")
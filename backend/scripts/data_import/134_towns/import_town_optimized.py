@@ -21,31 +21,14 @@ from sqlalchemy import text, func
 from geoalchemy2 import WKTElement
 from shapely import wkt
 
-# #region agent log
-# Project root is 5 levels up (script in backend/scripts/data_import/134_towns/)
-_PROJECT_ROOT = Path(__file__).parent.parent.parent.parent.parent
-DEBUG_LOG_PATH = _PROJECT_ROOT / ".cursor" / "debug.log"
-def debug_log(location: str, message: str, data: dict, hypothesis_id: str = None):
-    """Write debug log entry"""
-    try:
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "location": location,
-            "message": message,
-            "data": data,
-            "sessionId": "debug-session",
-            "runId": "run1",
-            "hypothesisId": hypothesis_id
-        }
-        with open(DEBUG_LOG_PATH, 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
-    except Exception:
-        pass
-# #endregion
-
 # Backend is 4 levels up (script in backend/scripts/data_import/134_towns/)
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
+from services.tracing import trace, trace_enabled
+from services.suggestion_dictionaries import snapshot_keys, refresh_municipality
+from services.lead_lists import refresh_lead_counts
+from services.sale_fields import refresh_sale_fields
+
 from models import Property, Base
 from database import engine, SessionLocal
 
@@ -60,7 +43,8 @@ from scripts.data_import.import_bridgeport_cama_2025 import (
 
 # Default paths
 DEFAULT_DATA_DIR = Path("/Users/jacobmermelstein/Desktop/CT Data")
-GEO_EXCEL_DIR = _PROJECT_ROOT / "Analysis scripts" / "Excel geodatabase all towns"
+# Project root is 5 levels up (script in backend/scripts/data_import/134_towns/)
+GEO_EXCEL_DIR = Path(__file__).parents[4] / "Analysis scripts" / "Excel geodatabase all towns"
 PARSE_CACHE_DIR = Path(__file__).parent / "logs" / "parse_cache"
 CACHE_VERSION = 1
 
@@ -518,16 +502,16 @@ def import_town_optimized(
         # Get existing properties
         existing_parcels = set()
         initial_count = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
-        # #region agent log
-        debug_log("import_town_optimized.py:354", "Initial count before processing", {
+        trace("import.initial_count", "Initial count before processing", lambda: {
             "municipality": municipality,
             "initial_count": initial_count
-        }, "H1")
-        # #endregion
+        })
         for prop in db.query(Property.parcel_id).filter(func.lower(Property.municipality) == municipality.lower()).all():
             if prop.parcel_id:
                 existing_parcels.add(str(prop.parcel_id).strip())
         print(f"  Found {len(existing_parcels):,} existing properties in database")
+        # Owner/mailing keys before this import, so the dictionary refresh also recounts removed keys
+        suggestion_keys_before = snapshot_keys(db, municipality) if not dry_run else None
         
         # Prepare bulk insert/update data
         properties_to_insert = []
@@ -593,15 +577,13 @@ def import_town_optimized(
                         old_municipality = existing.municipality
                         # CRITICAL FIX: Don't update if municipality differs - this would move properties between towns!
                         if old_municipality and old_municipality.lower() != municipality.lower():
-                            # #region agent log
-                            debug_log("import_town_optimized.py:410", "Skipping update - parcel_id exists with different municipality", {
+                            trace("import.update.skip_other_municipality", "Skipping update - parcel_id exists with different municipality", lambda: {
                                 "municipality": municipality,
                                 "parcel_id": parcel_id,
                                 "old_municipality": old_municipality,
                                 "new_municipality": municipality,
                                 "action": "SKIPPED"
-                            }, "H3")
-                            # #endregion
+                            })
                             not_added_records.append(_not_added_row(record, municipality, f'Parcel exists in different municipality ({old_municipality})'))
                             continue  # Skip - don't move property between towns
                         # Only update fields that have non-NULL values to avoid overwriting existing data
@@ -618,15 +600,13 @@ def import_town_optimized(
                                     update_data[k] = v
                                 elif not isinstance(v, str):
                                     update_data[k] = v
-                        # #region agent log
                         if old_municipality != municipality:
-                            debug_log("import_town_optimized.py:430", "Municipality change detected in update (same town, different casing)", {
+                            trace("import.update.municipality_case_change", "Municipality change detected in update (same town, different casing)", lambda: {
                                 "municipality": municipality,
                                 "parcel_id": parcel_id,
                                 "old_municipality": old_municipality,
                                 "new_municipality": municipality
-                            }, "H3")
-                        # #endregion
+                            })
                         properties_to_update.append(update_data)
                 else:
                     # Will insert
@@ -659,41 +639,37 @@ def import_town_optimized(
             inserted = 0
             for i in range(0, len(properties_to_insert), BATCH_SIZE):
                 batch = properties_to_insert[i:i+BATCH_SIZE]
-                count_before = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
-                # #region agent log
-                debug_log("import_town_optimized.py:457", "Before bulk insert batch", {
+                # Per-batch counts are only for tracing; skip the extra COUNT queries when tracing is off
+                count_before = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count() if trace_enabled() else None
+                trace("import.bulk_insert.before", "Before bulk insert batch", lambda: {
                     "municipality": municipality,
                     "batch_num": i//BATCH_SIZE + 1,
                     "batch_size": len(batch),
                     "count_before": count_before
-                }, "H1")
-                # #endregion
+                })
                 try:
                     db.bulk_insert_mappings(Property, batch)
                     db.commit()
                     inserted += len(batch)
-                    count_after = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
-                    # #region agent log
-                    debug_log("import_town_optimized.py:465", "After bulk insert batch commit", {
-                        "municipality": municipality,
-                        "batch_num": i//BATCH_SIZE + 1,
-                        "count_before": count_before,
-                        "count_after": count_after,
-                        "expected_increase": len(batch),
-                        "actual_increase": count_after - count_before
-                    }, "H1")
-                    # #endregion
+                    if trace_enabled():
+                        count_after = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
+                        trace("import.bulk_insert.after_commit", "After bulk insert batch commit", lambda: {
+                            "municipality": municipality,
+                            "batch_num": i//BATCH_SIZE + 1,
+                            "count_before": count_before,
+                            "count_after": count_after,
+                            "expected_increase": len(batch),
+                            "actual_increase": count_after - count_before
+                        })
                     print(f"  ✅ Inserted batch {i//BATCH_SIZE + 1}: {len(batch):,} (Total: {inserted:,})")
                 except Exception as e:
                     db.rollback()
-                    # #region agent log
-                    debug_log("import_town_optimized.py:475", "Bulk insert failed, rolling back", {
+                    trace("import.bulk_insert.failed", "Bulk insert failed, rolling back", lambda: {
                         "municipality": municipality,
                         "batch_num": i//BATCH_SIZE + 1,
                         "error": str(e),
                         "count_before_rollback": count_before
-                    }, "H2")
-                    # #endregion
+                    })
                     # Fall back to individual inserts with duplicate handling
                     print(f"  ⚠️  Batch insert failed, using individual inserts for batch {i//BATCH_SIZE + 1}...")
                     for prop_data in batch:
@@ -708,28 +684,24 @@ def import_town_optimized(
                                 # Check if it's in the same municipality
                                 if existing_global.municipality and existing_global.municipality.lower() == municipality.lower():
                                     # Same municipality - update it
-                                    # #region agent log
-                                    debug_log("import_town_optimized.py:487", "Duplicate parcel_id found in same municipality - updating", {
+                                    trace("import.individual_insert.update_duplicate", "Duplicate parcel_id found in same municipality - updating", lambda: {
                                         "municipality": municipality,
                                         "parcel_id": prop_data.get('parcel_id'),
                                         "existing_municipality": existing_global.municipality
-                                    }, "H4")
-                                    # #endregion
+                                    })
                                     for key, value in prop_data.items():
                                         if key != 'parcel_id':
                                             setattr(existing_global, key, value)
                                     # Don't increment inserted since we're updating, not inserting
                                 else:
                                     # Different municipality - skip it (parcel_id conflict)
-                                    # #region agent log
-                                    debug_log("import_town_optimized.py:495", "Skipping parcel_id that exists in different municipality", {
+                                    trace("import.individual_insert.skip_other_municipality", "Skipping parcel_id that exists in different municipality", lambda: {
                                         "municipality": municipality,
                                         "parcel_id": prop_data.get('parcel_id'),
                                         "existing_municipality": existing_global.municipality,
                                         "new_municipality": municipality,
                                         "action": "SKIPPED"
-                                    }, "H4")
-                                    # #endregion
+                                    })
                                     continue  # Skip - parcel_id already exists in different town
                             else:
                                 # No existing property - safe to insert
@@ -747,24 +719,21 @@ def import_town_optimized(
                                 # Some other error
                                 if inserted < 10:
                                     print(f"    ⚠️  Error inserting {prop_data.get('parcel_id', 'unknown')}: {ex}")
-                            # #region agent log
-                            debug_log("import_town_optimized.py:502", "Individual insert error", {
+                            trace("import.individual_insert.error", "Individual insert error", lambda: {
                                 "municipality": municipality,
                                 "parcel_id": prop_data.get('parcel_id'),
                                 "error": str(ex)
-                            }, "H4")
-                            # #endregion
+                            })
                     db.commit()
-                    count_after_individual = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
-                    # #region agent log
-                    debug_log("import_town_optimized.py:510", "After individual inserts commit", {
-                        "municipality": municipality,
-                        "batch_num": i//BATCH_SIZE + 1,
-                        "count_before": count_before,
-                        "count_after": count_after_individual,
-                        "inserted_count": inserted
-                    }, "H1")
-                    # #endregion
+                    if trace_enabled():
+                        count_after_individual = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
+                        trace("import.individual_insert.after_commit", "After individual inserts commit", lambda: {
+                            "municipality": municipality,
+                            "batch_num": i//BATCH_SIZE + 1,
+                            "count_before": count_before,
+                            "count_after": count_after_individual,
+                            "inserted_count": inserted
+                        })
         
         # Bulk update
         if not dry_run and properties_to_update:
@@ -773,59 +742,75 @@ def import_town_optimized(
             updated = 0
             for i in range(0, len(properties_to_update), BATCH_SIZE):
                 batch = properties_to_update[i:i+BATCH_SIZE]
-                count_before_update = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
-                # Check municipality changes in batch
-                municipality_changes = []
-                for update_item in batch[:5]:  # Sample first 5
-                    existing_prop = db.query(Property).filter(Property.id == update_item['id']).first()
-                    if existing_prop:
-                        old_muni = existing_prop.municipality
-                        new_muni = update_item.get('municipality')
-                        if old_muni != new_muni:
-                            municipality_changes.append({"id": update_item['id'], "old": old_muni, "new": new_muni})
-                # #region agent log
-                debug_log("import_town_optimized.py:520", "Before bulk update batch", {
-                    "municipality": municipality,
-                    "batch_num": i//BATCH_SIZE + 1,
-                    "batch_size": len(batch),
-                    "count_before": count_before_update,
-                    "municipality_changes_sample": municipality_changes
-                }, "H2")
-                # #endregion
+                # Per-batch counts and the municipality-change sample are only for tracing
+                count_before_update = None
+                if trace_enabled():
+                    count_before_update = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
+                    # Check municipality changes in batch
+                    municipality_changes = []
+                    for update_item in batch[:5]:  # Sample first 5
+                        existing_prop = db.query(Property).filter(Property.id == update_item['id']).first()
+                        if existing_prop:
+                            old_muni = existing_prop.municipality
+                            new_muni = update_item.get('municipality')
+                            if old_muni != new_muni:
+                                municipality_changes.append({"id": update_item['id'], "old": old_muni, "new": new_muni})
+                    trace("import.bulk_update.before", "Before bulk update batch", lambda: {
+                        "municipality": municipality,
+                        "batch_num": i//BATCH_SIZE + 1,
+                        "batch_size": len(batch),
+                        "count_before": count_before_update,
+                        "municipality_changes_sample": municipality_changes
+                    })
                 try:
                     db.bulk_update_mappings(Property, batch)
                     db.commit()
                     updated += len(batch)
-                    count_after_update = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
-                    # #region agent log
-                    debug_log("import_town_optimized.py:532", "After bulk update batch commit", {
-                        "municipality": municipality,
-                        "batch_num": i//BATCH_SIZE + 1,
-                        "count_before": count_before_update,
-                        "count_after": count_after_update,
-                        "count_change": count_after_update - count_before_update
-                    }, "H2")
-                    # #endregion
+                    if trace_enabled():
+                        count_after_update = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
+                        trace("import.bulk_update.after_commit", "After bulk update batch commit", lambda: {
+                            "municipality": municipality,
+                            "batch_num": i//BATCH_SIZE + 1,
+                            "count_before": count_before_update,
+                            "count_after": count_after_update,
+                            "count_change": count_after_update - count_before_update
+                        })
                     print(f"  ✅ Updated batch {i//BATCH_SIZE + 1}: {len(batch):,} (Total: {updated:,})")
                 except Exception as e:
                     db.rollback()
-                    count_after_rollback = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
-                    # #region agent log
-                    debug_log("import_town_optimized.py:543", "Bulk update failed, rolled back", {
-                        "municipality": municipality,
-                        "batch_num": i//BATCH_SIZE + 1,
-                        "error": str(e),
-                        "count_before": count_before_update,
-                        "count_after_rollback": count_after_rollback
-                    }, "H2")
-                    # #endregion
+                    if trace_enabled():
+                        count_after_rollback = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
+                        trace("import.bulk_update.failed", "Bulk update failed, rolled back", lambda: {
+                            "municipality": municipality,
+                            "batch_num": i//BATCH_SIZE + 1,
+                            "error": str(e),
+                            "count_before": count_before_update,
+                            "count_after_rollback": count_after_rollback
+                        })
                     print(f"  ⚠️  Error updating batch: {e}")
         
+        # Refresh autocomplete dictionaries for this town, then its sale fields and the lead list counts
+        if not dry_run and (properties_to_insert or properties_to_update):
+            try:
+                refresh_municipality(db, municipality, suggestion_keys_before)
+                db.commit()
+                print("  ✅ Refreshed autocomplete dictionaries")
+            except Exception as e:
+                db.rollback()
+                print(f"  ⚠️  Autocomplete dictionary refresh failed (run build_suggestion_dictionaries.py): {e}")
+            try:
+                refresh_sale_fields(db, municipality=municipality)
+                refresh_lead_counts(db)
+                db.commit()
+                print("  ✅ Refreshed sale fields and lead list counts")
+            except Exception as e:
+                db.rollback()
+                print(f"  ⚠️  Sale field / lead count refresh failed (run refresh_sale_fields.py): {e}")
+        
         # Get final count in database (for both dry_run and actual import)
         if not dry_run:
             final_db_count = db.query(Property).filter(func.lower(Property.municipality) == municipality.lower()).count()
-            # #region agent log
-            debug_log("import_town_optimized.py:502", "Final count after all operations", {
+            trace("import.final_count", "Final count after all operations", lambda: {
                 "municipality": municipality,
                 "initial_count": initial_count,
                 "final_count": final_db_count,
@@ -833,8 +818,7 @@ def import_town_optimized(
                 "updated": len(properties_to_update),
                 "expected_final": initial_count + len(properties_to_insert),
                 "count_change": final_db_count - initial_count
-            }, "H1")
-            # #endregion
+            })
         else:
             final_db_count = len(properties_to_insert) + len(properties_to_update)  # Estimate for dry run
         
@@ -47,16 +47,7 @@ from shapely import force_2d
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-# #region agent log
-DEBUG_LOG_PATH = Path("/Users/jacobmermelstein/Desktop/CT Maps/.cursor/debug.log")
-def _debug_log(message: str, data: dict, hypothesis_id: str = "Z"):
-    try:
-        import json as _j
-        with open(DEBUG_LOG_PATH, "a") as f:
-            f.write(_j.dumps({"message": message, "data": data, "hypothesisId": hypothesis_id, "timestamp": time.time(), "sessionId": "geocode-spatial"}) + "\n")
-    except Exception:
-        pass
-# #endregion
+from services.tracing import trace
 
 from models import Property, Base
 from database import engine, SessionLocal
@@ -255,7 +246,7 @@ def geometry_to_wkt_element(geom, source_crs: str = "EPSG:6434"):
         has_z = getattr(wgs84, "has_z", False)
         if has_z:
             wgs84 = force_2d(wgs84)
-            _debug_log("geometry had Z, forced 2D", {"wkt_type": "2D after force_2d"}, "Z")
+            trace("import.geometry.forced_2d", "geometry had Z, forced 2D", lambda: {"wkt_type": "2D after force_2d"})
         wkt = wgs84.wkt
         return WKTElement(wkt, srid=4326)
     except Exception:
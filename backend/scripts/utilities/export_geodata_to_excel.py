@@ -76,7 +76,7 @@ def export_geodata_to_excel(limit: int = 1000, municipality: str = None, output_
             Property.last_sale_date,
             Property.last_sale_price,
             Property.sales_count,
-            Property.equity_estimate,
+            Property.equity_amount,
             Property.is_vacant,
             Property.days_since_sale,
             Property.data_source,
@@ -163,7 +163,7 @@ def export_geodata_to_excel(limit: int = 1000, municipality: str = None, output_
                 'Last Sale Date': prop.last_sale_date.strftime('%Y-%m-%d') if prop.last_sale_date else '',
                 'Last Sale Price': prop.last_sale_price if prop.last_sale_price else '',
                 'Sales Count': prop.sales_count if prop.sales_count else '',
-                'Equity Estimate': prop.equity_estimate if prop.equity_estimate else '',
+                'Equity Estimate': prop.equity_amount if prop.equity_amount else '',
                 'Is Vacant': 'Yes' if prop.is_vacant == 1 else 'No',
                 'Days Since Sale': prop.days_since_sale if prop.days_since_sale else '',
                 'Data Source': prop.data_source or '',
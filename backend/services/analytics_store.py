@@ -0,0 +1,121 @@
+"""
+Usage analytics (search and map-load events, filter/municipality counters) kept in a shared
+SQLite file (see services.local_store), so events tracked by any worker process show up in
+the stats served by every other. Only the most recent events are kept. An event whose write
+fails (e.g. another worker holds the write lock past BUSY_TIMEOUT_SECONDS) is logged and
+dropped rather than failing the tracking request.
+"""
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from services.local_store import LocalStore, shared_store_dir
+
+# Recent events kept per kind
+MAX_SEARCHES = 1000
+MAX_MAP_LOADS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    query TEXT,
+    filter_type TEXT,
+    municipality TEXT,
+    result_count INTEGER NOT NULL,
+    ip TEXT
+);
+CREATE TABLE IF NOT EXISTS map_loads (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+"""
+
+_SEARCH_COLUMNS = ["timestamp", "query", "filter_type", "municipality", "result_count", "ip"]
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsStore:
+    """Appends events and counters; reads recent events back as dicts."""
+
+    def __init__(self, store: LocalStore):
+        self._store = store
+
+    @classmethod
+    def from_env(cls) -> "AnalyticsStore":
+        """Build on <SHARED_STORE_DIR>/analytics.sqlite3."""
+        return cls(LocalStore(shared_store_dir() / "analytics.sqlite3", _SCHEMA))
+
+    def record_search(self, search: Dict[str, Any]) -> None:
+        """Store a search event (keys as in _SEARCH_COLUMNS) and bump its filter/municipality counters."""
+        try:
+            conn = self._store.connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    f"INSERT INTO searches ({', '.join(_SEARCH_COLUMNS)}) VALUES ({', '.join('?' * len(_SEARCH_COLUMNS))})",
+                    [search.get(column) for column in _SEARCH_COLUMNS],
+                )
+                if search.get("filter_type"):
+                    self._increment(conn, "filter_usage", search["filter_type"])
+                if search.get("municipality"):
+                    self._increment(conn, "municipality_searches", search["municipality"])
+                self._increment(conn, "totals", "results", search["result_count"])
+                conn.execute("DELETE FROM searches WHERE id <= (SELECT MAX(id) FROM searches) - ?", (MAX_SEARCHES,))
+        except sqlite3.Error as e:
+            logger.warning("Analytics search event dropped: %s", e)
+
+    def record_map_load(self, map_load: Dict[str, Any]) -> None:
+        try:
+            conn = self._store.connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT INTO map_loads (timestamp, data) VALUES (?, ?)",
+                    (map_load["timestamp"], json.dumps(map_load, default=str)),
+                )
+                conn.execute("DELETE FROM map_loads WHERE id <= (SELECT MAX(id) FROM map_loads) - ?", (MAX_MAP_LOADS,))
+        except sqlite3.Error as e:
+            logger.warning("Analytics map load event dropped: %s", e)
+
+    def searches_since(self, cutoff: datetime) -> List[Dict[str, Any]]:
+        rows = self._store.connection().execute(
+            f"SELECT {', '.join(_SEARCH_COLUMNS)} FROM searches WHERE timestamp >= ? ORDER BY id",
+            (cutoff.isoformat(),),
+        )
+        return [dict(zip(_SEARCH_COLUMNS, row)) for row in rows]
+
+    def map_loads_since(self, cutoff: datetime) -> List[Dict[str, Any]]:
+        rows = self._store.connection().execute(
+            "SELECT data FROM map_loads WHERE timestamp >= ? ORDER BY id", (cutoff.isoformat(),)
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def top_counts(self, kind: str, limit: int) -> List[Tuple[str, int]]:
+        """Highest counters of one kind ("filter_usage" or "municipality_searches")."""
+        rows = self._store.connection().execute(
+            "SELECT key, count FROM counters WHERE kind = ? ORDER BY count DESC, key LIMIT ?", (kind, limit)
+        )
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def _increment(conn, kind: str, key: str, amount: int = 1) -> None:
+        conn.execute(
+            "INSERT INTO counters (kind, key, count) VALUES (?, ?, ?) "
+            "ON CONFLICT (kind, key) DO UPDATE SET count = count + excluded.count",
+            (kind, key, amount),
+        )
+
+
+# Singleton used by routes
+analytics_store = AnalyticsStore.from_env()
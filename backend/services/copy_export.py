@@ -0,0 +1,166 @@
+"""
+Bulk export through Postgres COPY ... TO STDOUT.
+COPY formats rows inside the server, so large exports skip SQLAlchemy row objects and
+Python-side CSV/JSON encoding entirely. stream_copy() runs psycopg2's copy_expert in a
+background thread and hands its output to the HTTP response through a bounded queue,
+which keeps memory flat and lets a slow client apply backpressure to the COPY.
+"""
+import queue
+import threading
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+
+# Bytes buffered before a chunk is handed to the response
+COPY_CHUNK_BYTES = 64 * 1024
+# Chunks buffered between COPY and the response (bounds memory to ~4 MB per export)
+COPY_QUEUE_CHUNKS = 64
+
+_DONE = object()
+
+
+def compile_for_copy(db: Session, query) -> str:
+    """Render an ORM query as SQL with its parameters quoted by psycopg2 (COPY takes no bind params)."""
+    compiled = query.statement.compile(dialect=db.get_bind().dialect)
+    with db.connection().connection.driver_connection.cursor() as cursor:
+        return cursor.mogrify(str(compiled), compiled.params).decode("utf-8")
+
+
+def copy_csv_sql(select_sql: str) -> str:
+    """COPY a SELECT out as CSV with a header row (column labels become the headers)."""
+    return f"COPY ({select_sql}) TO STDOUT WITH (FORMAT csv, HEADER)"
+
+
+def copy_jsonl_sql(select_sql: str) -> str:
+    """
+    COPY a SELECT out as JSON lines, one object per row keyed by column label.
+    CSV format with control-character quote/delimiter (which row_to_json always escapes)
+    passes the JSON through unchanged; text format would double every backslash.
+    """
+    return (
+        f"COPY (SELECT row_to_json(t) FROM ({select_sql}) t) TO STDOUT "
+        "WITH (FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02')"
+    )
+
+
+def copy_geojsonseq_sql(select_sql: str, property_keys, geometry_key: str = "geometry") -> str:
+    """
+    COPY a SELECT out as GeoJSON text sequences (RFC 8142): one RS-prefixed Feature per line.
+    geometry_key names a column already holding ST_AsGeoJSON text; property_keys (in order)
+    become the Feature properties. Output passes through CSV format as in copy_jsonl_sql.
+    """
+    properties = ", ".join(f't."{key}"' for key in property_keys)
+    return (
+        f"COPY (SELECT chr(30) || json_build_object("
+        f"'type', 'Feature', "
+        f"'geometry', t.\"{geometry_key}\"::json, "
+        f"'properties', (SELECT row_to_json(p) FROM (SELECT {properties}) p)"
+        f")::text FROM ({select_sql}) t) TO STDOUT "
+        "WITH (FORMAT csv, QUOTE E'\\x01', DELIMITER E'\\x02')"
+    )
+
+
+class _CountingWriter:
+    """File wrapper for copy_expert that counts output lines and reports them every PROGRESS_LINES."""
+
+    PROGRESS_LINES = 10000
+
+    def __init__(self, target: BinaryIO, progress: Optional[Callable[[int], None]]):
+        self._target = target
+        self._progress = progress
+        self.lines = 0
+        self._next_report = self.PROGRESS_LINES
+
+    def write(self, data) -> int:
+        self.lines += data.count(b"\n")
+        if self._progress is not None and self.lines >= self._next_report:
+            self._progress(self.lines)
+            self._next_report = self.lines + self.PROGRESS_LINES
+        return self._target.write(data)
+
+
+def copy_to_file(db: Session, copy_sql: str, target: BinaryIO, progress: Optional[Callable[[int], None]] = None) -> int:
+    """Run a COPY ... TO STDOUT on db's connection into a binary file. Returns lines written."""
+    writer = _CountingWriter(target, progress)
+    with db.connection().connection.driver_connection.cursor() as cursor:
+        cursor.copy_expert(copy_sql, writer)
+    return writer.lines
+
+
+class _QueueWriter:
+    """File-like target for copy_expert: batches COPY output into chunks on a bounded queue."""
+
+    def __init__(self, chunks: "queue.Queue", stop: threading.Event):
+        self._chunks = chunks
+        self._stop = stop
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) >= COPY_CHUNK_BYTES:
+            self.flush()
+        return len(data)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def put(self, item) -> None:
+        # Block while the response catches up, but give up once the response is gone
+        while True:
+            if self._stop.is_set():
+                raise BrokenPipeError("export response closed")
+            try:
+                self._chunks.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+
+def stream_copy(build_copy_sql: Callable[[Session], str], session_factory: Callable[[], Session] = SessionLocal) -> Iterator[bytes]:
+    """
+    Yield the output of the COPY statement returned by build_copy_sql(db).
+    Uses its own session from session_factory; if the client goes away mid-export the COPY is cancelled and
+    the connection is discarded rather than returned to the pool mid-protocol.
+    """
+    db = session_factory()
+    chunks: "queue.Queue" = queue.Queue(maxsize=COPY_QUEUE_CHUNKS)
+    stop = threading.Event()
+    thread = None
+    completed = False
+    try:
+        copy_sql = build_copy_sql(db)
+        driver_connection = db.connection().connection.driver_connection
+        writer = _QueueWriter(chunks, stop)
+
+        def run_copy():
+            try:
+                with driver_connection.cursor() as cursor:
+                    cursor.copy_expert(copy_sql, writer)
+                writer.flush()
+                writer.put(_DONE)
+            except Exception as e:
+                if not stop.is_set():
+                    writer.put(e)
+
+        thread = threading.Thread(target=run_copy, name="copy-export", daemon=True)
+        thread.start()
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                completed = True
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        if thread is not None and thread.is_alive():
+            driver_connection.cancel()
+            thread.join()
+        if thread is not None and not completed:
+            db.connection().invalidate()
+        db.close()
@@ -0,0 +1,144 @@
+"""
+Background export jobs: large exports run in a worker pool and write to a local artifacts
+directory instead of holding an HTTP request open until the file is done.
+Job state lives in a JSON sidecar next to each artifact (<job_id>.json), so every uvicorn
+worker sharing the directory can report status and serve downloads, not just the one that
+started the job. Artifacts and sidecars are deleted once older than the retention period.
+
+Configure with environment variables:
+  EXPORT_ARTIFACTS_DIR     where artifacts are written (default: <tmp>/ctmaps_exports)
+  EXPORT_JOB_WORKERS       concurrent export jobs per process (default 2)
+  EXPORT_RETENTION_HOURS   how long finished artifacts are kept (default 24)
+"""
+import concurrent.futures
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sidecar progress writes are throttled to at most one per interval
+PROGRESS_WRITE_INTERVAL_SECONDS = 1.0
+
+_JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# (path, progress callback) -> rows written
+ExportWriter = Callable[[Path, Callable[[int], None]], int]
+
+
+class ExportJobs:
+    """Runs export writers in a thread pool and tracks them through sidecar files."""
+
+    def __init__(self, artifacts_dir: str, max_workers: int = 2, retention_seconds: float = 24 * 3600):
+        self._dir = Path(artifacts_dir)
+        self._retention = retention_seconds
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export-job")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ExportJobs":
+        """Build from EXPORT_ARTIFACTS_DIR / EXPORT_JOB_WORKERS / EXPORT_RETENTION_HOURS."""
+        return cls(
+            artifacts_dir=os.getenv("EXPORT_ARTIFACTS_DIR") or os.path.join(tempfile.gettempdir(), "ctmaps_exports"),
+            max_workers=int(os.getenv("EXPORT_JOB_WORKERS", "2")),
+            retention_seconds=float(os.getenv("EXPORT_RETENTION_HOURS", "24")) * 3600,
+        )
+
+    def submit(self, export_format: str, extension: str, writer: ExportWriter, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue writer to produce <job_id>.<extension>; returns the new job's state."""
+        self.cleanup_expired()
+        self._dir.mkdir(parents=True, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "format": export_format,
+            "status": "queued",
+            "rows_done": 0,
+            "params": params or {},
+            "artifact": f"{job_id}.{extension}",
+            "error": None,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        self._write_state(job)
+        self._executor.submit(self._run, dict(job), writer)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of a job, or None if unknown or expired."""
+        if not _JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            with open(self._state_path(job_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def artifact_path(self, job: Dict[str, Any]) -> Path:
+        return self._dir / job["artifact"]
+
+    def cleanup_expired(self) -> int:
+        """Delete artifacts and sidecars older than the retention period. Returns files removed."""
+        if not self._dir.exists():
+            return 0
+        cutoff = time.time() - self._retention
+        removed = 0
+        for path in self._dir.iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _run(self, job: Dict[str, Any], writer: ExportWriter) -> None:
+        job.update(status="running", started_at=datetime.now().isoformat())
+        self._write_state(job)
+        last_write = [0.0]
+
+        def progress(rows_done: int) -> None:
+            job["rows_done"] = rows_done
+            now = time.monotonic()
+            if now - last_write[0] >= PROGRESS_WRITE_INTERVAL_SECONDS:
+                last_write[0] = now
+                self._write_state(job)
+
+        path = self.artifact_path(job)
+        try:
+            rows = writer(path, progress)
+            job.update(status="done", rows_done=rows)
+        except Exception as e:
+            logger.exception("Export job %s (%s) failed", job["job_id"], job["format"])
+            job.update(status="failed", error=str(e))
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        job["finished_at"] = datetime.now().isoformat()
+        self._write_state(job)
+
+    def _state_path(self, job_id: str) -> Path:
+        return self._dir / f"{job_id}.json"
+
+    def _write_state(self, job: Dict[str, Any]) -> None:
+        # Write-then-rename so readers in other workers never see a partial file
+        path = self._state_path(job["job_id"])
+        tmp_path = path.with_suffix(f".json.{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(job, f, default=str)
+            os.replace(tmp_path, path)
+
+
+# Singleton used by routes
+export_jobs = ExportJobs.from_env()
@@ -0,0 +1,155 @@
+"""
+Streaming FlatGeobuf encoder (https://flatgeobuf.org) for the /api/export/fgb download.
+
+A FlatGeobuf file is the magic bytes, a size-prefixed FlatBuffers header, an optional packed
+R-tree index and then size-prefixed features. The index has to precede the features, so a
+file written with one (GDAL's default) can only be sent once every feature is known. This
+writer leaves the index out (index_node_size 0) and the feature count unknown (0), which
+the format allows, so each feature is encoded and sent as soon as it is fetched:
+
+    writer = FlatGeobufWriter("properties", [("parcel_id", str), ("assessed_value", float)])
+    yield writer.header()
+    for properties, geometry in rows:
+        yield writer.feature(properties, geometry)
+
+GDAL/QGIS and the flatgeobuf JS/Python readers read such files; they scan instead of using
+a spatial index. Geometry is GeoJSON-shaped (dicts from ST_AsGeoJSON), in EPSG:4326.
+"""
+import struct
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import flatbuffers
+import numpy as np
+
+MAGIC_BYTES = b"fgb\x03fgb\x00"
+
+# FlatGeobuf GeometryType
+_GEOMETRY_TYPES = {
+    "Point": 1,
+    "LineString": 2,
+    "Polygon": 3,
+    "MultiPoint": 4,
+    "MultiLineString": 5,
+    "MultiPolygon": 6,
+    "GeometryCollection": 7,
+}
+
+# FlatGeobuf ColumnType per Python type, with the little-endian encoding of a value
+_BOOL, _LONG, _DOUBLE, _STRING, _DATETIME = 2, 7, 10, 11, 13
+_COLUMN_TYPES = {bool: _BOOL, int: _LONG, float: _DOUBLE, str: _STRING, date: _DATETIME, datetime: _DATETIME}
+_NUMBER_FORMATS = {_BOOL: "<B", _LONG: "<q", _DOUBLE: "<d"}
+
+# Header.index_node_size: 0 = no spatial index
+_NO_INDEX = 0
+_DEFAULT_INDEX_NODE_SIZE = 16
+
+
+class FlatGeobufWriter:
+    """Encodes one layer: header() once, then feature() per row, each returning bytes to send."""
+
+    def __init__(self, name: str, columns: List[Tuple[str, type]]):
+        self.name = name
+        self.columns = [(column_name, _COLUMN_TYPES[python_type]) for column_name, python_type in columns]
+
+    def header(self) -> bytes:
+        """Magic bytes and the layer header (column schema, CRS, no index, unknown feature count)."""
+        builder = flatbuffers.Builder(1024)
+        column_offsets = []
+        for column_name, column_type in self.columns:
+            name = builder.CreateString(column_name)
+            builder.StartObject(11)
+            builder.PrependUOffsetTRelativeSlot(0, name, 0)
+            builder.PrependUint8Slot(1, column_type, 0)
+            column_offsets.append(builder.EndObject())
+        builder.StartVector(4, len(column_offsets), 4)
+        for offset in reversed(column_offsets):
+            builder.PrependUOffsetTRelative(offset)
+        columns = builder.EndVector()
+
+        org = builder.CreateString("EPSG")
+        builder.StartObject(6)
+        builder.PrependUOffsetTRelativeSlot(0, org, 0)
+        builder.PrependInt32Slot(1, 4326, 0)
+        crs = builder.EndObject()
+
+        name = builder.CreateString(self.name)
+        # Header slots: 0 name, 7 columns, 9 index_node_size, 10 crs (1 is the envelope)
+        builder.StartObject(14)
+        builder.PrependUOffsetTRelativeSlot(0, name, 0)
+        builder.PrependUOffsetTRelativeSlot(7, columns, 0)
+        builder.PrependUint16Slot(9, _NO_INDEX, _DEFAULT_INDEX_NODE_SIZE)
+        builder.PrependUOffsetTRelativeSlot(10, crs, 0)
+        builder.FinishSizePrefixed(builder.EndObject())
+        return MAGIC_BYTES + bytes(builder.Output())
+
+    def feature(self, properties: Dict[str, Any], geometry: Optional[dict]) -> bytes:
+        """One size-prefixed feature; properties are keyed by column name (None values are omitted)."""
+        builder = flatbuffers.Builder(1024)
+        geometry_offset = _build_geometry(builder, geometry) if geometry else None
+        properties_offset = builder.CreateByteVector(self._encode_properties(properties))
+        builder.StartObject(3)
+        if geometry_offset is not None:
+            builder.PrependUOffsetTRelativeSlot(0, geometry_offset, 0)
+        builder.PrependUOffsetTRelativeSlot(1, properties_offset, 0)
+        builder.FinishSizePrefixed(builder.EndObject())
+        return bytes(builder.Output())
+
+    def _encode_properties(self, properties: Dict[str, Any]) -> bytes:
+        # Each present value: ushort column index, then the value (strings and dates length-prefixed)
+        parts = []
+        for index, (column_name, column_type) in enumerate(self.columns):
+            value = properties.get(column_name)
+            if value is None:
+                continue
+            parts.append(struct.pack("<H", index))
+            if column_type in _NUMBER_FORMATS:
+                parts.append(struct.pack(_NUMBER_FORMATS[column_type], value))
+            else:
+                encoded = (value.isoformat() if column_type == _DATETIME else str(value)).encode("utf-8")
+                parts.append(struct.pack("<I", len(encoded)))
+                parts.append(encoded)
+        return b"".join(parts)
+
+
+def _build_geometry(builder: flatbuffers.Builder, geometry: dict) -> int:
+    """Geometry table for a GeoJSON geometry; multi-polygons and collections nest their parts."""
+    geometry_type = geometry["type"]
+    parts = None
+    xy = ends = None
+    if geometry_type == "MultiPolygon":
+        parts = [{"type": "Polygon", "coordinates": polygon} for polygon in geometry["coordinates"]]
+    elif geometry_type == "GeometryCollection":
+        parts = geometry["geometries"]
+    else:
+        coordinates = geometry["coordinates"]
+        if geometry_type == "Point":
+            lines = [[coordinates]]
+        elif geometry_type in ("LineString", "MultiPoint"):
+            lines = [coordinates]
+        else:  # Polygon rings, MultiLineString lines
+            lines = coordinates
+        points = [point[:2] for line in lines for point in line]
+        xy = np.asarray(points, dtype="<f8").reshape(-1)
+        if len(lines) > 1:
+            ends = np.cumsum([len(line) for line in lines]).astype("<u4")
+
+    if parts is not None:
+        part_offsets = [_build_geometry(builder, part) for part in parts]
+        builder.StartVector(4, len(part_offsets), 4)
+        for offset in reversed(part_offsets):
+            builder.PrependUOffsetTRelative(offset)
+        parts_offset = builder.EndVector()
+    else:
+        xy_offset = builder.CreateNumpyVector(xy)
+        ends_offset = builder.CreateNumpyVector(ends) if ends is not None else None
+
+    builder.StartObject(8)
+    if parts is not None:
+        builder.PrependUOffsetTRelativeSlot(7, parts_offset, 0)
+    else:
+        if ends_offset is not None:
+            builder.PrependUOffsetTRelativeSlot(0, ends_offset, 0)
+        builder.PrependUOffsetTRelativeSlot(1, xy_offset, 0)
+    builder.PrependUint8Slot(6, _GEOMETRY_TYPES[geometry_type], 0)
+    return builder.EndObject()
@@ -0,0 +1,77 @@
+"""
+Partial indexes and precomputed counts for the lead lists (/api/filters/vacant,
+/absentee-owners, /recently-sold). Each list filters on a low-cardinality flag or a sale
+date, so a partial index holding only that category's rows, in the list's sort order,
+turns its pages into short index scans; its total comes from lead_category_counts instead
+of a count(*) over the table.
+
+- LEAD_INDEXES: created by scripts/data_migration/add_lead_indexes.py.
+- refresh_lead_counts(db): recompute every category's count in one pass over properties
+  (migration script, nightly refresh_sale_fields.py, and after each town import).
+- lead_count(db, category): the stored count, or None if missing or stale.
+
+Functions execute on a Session or Connection and do not commit; the caller owns the transaction.
+"""
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+# Window (days) of the precomputed recently-sold count: the /recently-sold default
+RECENT_SALE_DAYS = 365
+
+# (name, definition). Keys match the ORDER BY of each list; INCLUDE columns cover its
+# remaining filters, so counts and pages can be index-only scans once the table is vacuumed.
+LEAD_INDEXES = [
+    ("idx_property_lead_vacant", "(id) INCLUDE (building_area_sqft) WHERE is_vacant = 1"),
+    ("idx_property_lead_absentee", "(id) WHERE is_absentee = 1"),
+    ("idx_property_lead_recent_sale", "(last_sale_date DESC, id) INCLUDE (last_sale_price) WHERE last_sale_date IS NOT NULL"),
+]
+
+# Category -> predicate over properties (must match the filters in api/routes/filters.py)
+LEAD_CATEGORIES = {
+    "vacant": "is_vacant = 1",
+    "vacant_lots": "is_vacant = 1 AND (building_area_sqft IS NULL OR building_area_sqft = 0)",
+    "vacant_structures": "is_vacant = 1 AND building_area_sqft > 0",
+    "absentee_owners": "is_absentee = 1",
+    "recently_sold": "last_sale_date >= :recent_cutoff",
+}
+
+# Categories whose membership depends on today's date: their counts are only valid on the day computed
+_DATED_CATEGORIES = {"recently_sold"}
+
+
+def refresh_lead_counts(db) -> Dict[str, int]:
+    """Recompute and store every category count. Returns the counts by category."""
+    today = date.today()
+    columns = ", ".join(
+        f"COUNT(*) FILTER (WHERE {predicate}) AS {category}"
+        for category, predicate in LEAD_CATEGORIES.items()
+    )
+    row = db.execute(
+        text(f"SELECT {columns} FROM properties"),
+        {"recent_cutoff": today - timedelta(days=RECENT_SALE_DAYS)},
+    ).mappings().one()
+    counts = {category: row[category] for category in LEAD_CATEGORIES}
+    db.execute(
+        text("""
+            INSERT INTO lead_category_counts (category, property_count, as_of, refreshed_at)
+            SELECT category, property_count, :as_of, now()
+            FROM unnest(CAST(:categories AS text[]), CAST(:property_counts AS integer[])) AS c(category, property_count)
+            ON CONFLICT (category) DO UPDATE
+            SET property_count = EXCLUDED.property_count, as_of = EXCLUDED.as_of, refreshed_at = EXCLUDED.refreshed_at
+        """),
+        {"categories": list(counts), "property_counts": list(counts.values()), "as_of": today},
+    )
+    return counts
+
+
+def lead_count(db, category: str) -> Optional[int]:
+    """Stored count for a category, or None if it was never computed (or is from an earlier day, for dated ones)."""
+    row = db.execute(
+        text("SELECT property_count, as_of FROM lead_category_counts WHERE category = :category"),
+        {"category": category},
+    ).first()
+    if row is None or (category in _DATED_CATEGORIES and row.as_of != date.today()):
+        return None
+    return row.property_count
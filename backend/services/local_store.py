@@ -0,0 +1,58 @@
+"""
+Host-local SQLite files shared by every worker process (gunicorn/uvicorn workers on one
+machine or container). Used for state that must agree across workers but does not belong in
+Postgres: the options cache and the analytics event store.
+
+Connections are opened lazily per process and thread, so nothing is inherited across a
+gunicorn preload fork. Files run in WAL mode (readers never block the single writer) with
+memory-mapped reads, so cache hits come straight from the page cache.
+
+Configure with environment variables:
+  SHARED_STORE_DIR     where the SQLite files live (default: <tmp>/ctmaps_store)
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+# Memory map up to 64 MB of each file for reads
+MMAP_SIZE_BYTES = 64 * 1024 * 1024
+# How long a writer waits for another worker's write lock before giving up
+BUSY_TIMEOUT_SECONDS = 2.0
+
+
+def shared_store_dir() -> Path:
+    return Path(os.getenv("SHARED_STORE_DIR") or os.path.join(tempfile.gettempdir(), "ctmaps_store"))
+
+
+class LocalStore:
+    """One SQLite file; connection() returns this thread's connection (autocommit)."""
+
+    def __init__(self, path: Path, schema: str):
+        self.path = Path(path)
+        self._schema = schema
+        self._local = threading.local()
+        self._schema_ready_pid = None
+        self._schema_lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+        self._ensure_schema(conn)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        # Once per process; the statements are idempotent, so workers racing here is harmless
+        with self._schema_lock:
+            if self._schema_ready_pid != os.getpid():
+                conn.executescript(self._schema)
+                self._schema_ready_pid = os.getpid()
@@ -1,24 +1,47 @@
 """
-In-memory TTL cache for options/autocomplete endpoints (towns, zoning, unit types, owner cities/states).
+TTL cache for options/autocomplete endpoints (towns, zoning, unit types, owner cities/states).
 Reduces repeated heavy DISTINCT queries and prevents timeouts after the first load.
+Entries live in a shared SQLite file (see services.local_store), so every worker process on
+the host reads the same cache instead of each warming its own. Values are stored as JSON.
 No external services (e.g. Redis) required.
 """
-import threading
+import json
+import logging
+import sqlite3
 import time
 from typing import Any, Callable, Optional
 
+from fastapi.encoders import jsonable_encoder
+
+from services.local_store import LocalStore, shared_store_dir
+
+logger = logging.getLogger(__name__)
+
 # Default TTL: 10 minutes. Options data changes infrequently.
 DEFAULT_TTL_SECONDS = 600
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS options_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_options_cache_expires_at ON options_cache (expires_at);
+"""
+
 
 class OptionsCache:
-    """Thread-safe in-memory cache with TTL. Key -> (value, expiry_ts)."""
+    """Cross-process cache with TTL. Key -> (JSON value, expiry wall-clock timestamp)."""
 
-    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = 500):
+    def __init__(self, store: LocalStore, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = 500):
+        self._store = store
         self._ttl = ttl_seconds
         self._max_entries = max_entries
-        self._store: Dict[str, Tuple[Any, float]] = {}
-        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "OptionsCache":
+        """Build on <SHARED_STORE_DIR>/options_cache.sqlite3."""
+        return cls(LocalStore(shared_store_dir() / "options_cache.sqlite3", _SCHEMA), ttl_seconds=DEFAULT_TTL_SECONDS)
 
     def _make_key(self, endpoint: str, **params: Optional[str]) -> str:
         """Build a stable cache key from endpoint name and optional query params."""
@@ -29,28 +52,35 @@ class OptionsCache:
         return "|".join(parts)
 
     def get(self, endpoint: str, **params: Optional[str]) -> Optional[Any]:
-        """Return cached value if present and not expired."""
+        """Return cached value if present and not expired (None on a miss or if the store is unavailable)."""
         key = self._make_key(endpoint, **params)
-        with self._lock:
-            entry = self._store.get(key)
-            if not entry:
-                return None
-            value, expiry = entry
-            if time.monotonic() > expiry:
-                del self._store[key]
-                return None
-            return value
+        try:
+            row = self._store.connection().execute(
+                "SELECT value FROM options_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Options cache read failed: %s", e)
+            return None
+        return json.loads(row[0]) if row else None
 
     def set(self, endpoint: str, value: Any, **params: Optional[str]) -> None:
-        """Store value with TTL. Evict oldest entries if over max_entries."""
+        """Store value with TTL. Drop expired entries, then the soonest-expiring beyond max_entries."""
         key = self._make_key(endpoint, **params)
-        expiry = time.monotonic() + self._ttl
-        with self._lock:
-            if len(self._store) >= self._max_entries and key not in self._store:
-                # Evict oldest by expiry
-                oldest = min(self._store.items(), key=lambda x: x[1][1])
-                del self._store[oldest[0]]
-            self._store[key] = (value, expiry)
+        now = time.time()
+        try:
+            conn = self._store.connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO options_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(jsonable_encoder(value)), now + self._ttl),
+            )
+            conn.execute("DELETE FROM options_cache WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM options_cache WHERE key IN "
+                "(SELECT key FROM options_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (self._max_entries,),
+            )
+        except sqlite3.Error as e:
+            logger.warning("Options cache write failed: %s", e)
 
     def get_or_compute(
         self,
@@ -68,4 +98,4 @@ class OptionsCache:
 
 
 # Singleton used by routes
-options_cache = OptionsCache(ttl_seconds=DEFAULT_TTL_SECONDS)
+options_cache = OptionsCache.from_env()
@@ -0,0 +1,124 @@
+"""
+Connection pool instrumentation for the engines in database.py: how long checkouts wait for
+a connection, pool timeouts, and pre-ping failures, plus the pools' current occupancy.
+GET /health/metrics reports them so pool sizes (DB_POOL_SIZE / DB_MAX_OVERFLOW) can be tuned
+from data. Pools live in each worker process, so each worker reports its own.
+
+The pool classes below only time _do_get (the wait for a pooled or new connection); stats
+are keyed by the pool's logging name, which survives engine.dispose() recreating the pool.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+# Checkouts waiting longer than this are counted as slow (pool exhausted or slow connect)
+SLOW_CHECKOUT_SECONDS = 0.1
+
+
+class PoolStats:
+    """Counters for one engine's pool (thread-safe; updated on every checkout)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.slow_checkouts = 0
+        self.pool_timeouts = 0
+        self.pre_ping_failures = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+            if wait_seconds >= SLOW_CHECKOUT_SECONDS:
+                self.slow_checkouts += 1
+
+    def record_pool_timeout(self) -> None:
+        with self._lock:
+            self.pool_timeouts += 1
+
+    def record_pre_ping_failure(self) -> None:
+        with self._lock:
+            self.pre_ping_failures += 1
+
+
+_stats: Dict[str, PoolStats] = {}
+_engines: Dict[str, Any] = {}
+
+
+def _stats_for(name: str) -> PoolStats:
+    return _stats.setdefault(name, PoolStats(name))
+
+
+class _TimedCheckout:
+    def _do_get(self):
+        stats = _stats_for(self._orig_logging_name)
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            stats.record_pool_timeout()
+            raise
+        stats.record_checkout(time.perf_counter() - start)
+        return record
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+# Pool loggers are named after the class's module; keep their dispose/recreate chatter at the
+# level SQLAlchemy sets for its own pools (WARN unless echo_pool) rather than the app's INFO
+for _pool_class in (TimedQueuePool, TimedAsyncAdaptedQueuePool, TimedNullPool):
+    logging.getLogger(f"{__name__}.{_pool_class.__name__}").setLevel(logging.WARN)
+
+
+def instrument(name: str, engine) -> None:
+    """Register a sync Engine (or an AsyncEngine's sync_engine) created with pool_logging_name=name."""
+    _engines[name] = engine
+    _stats_for(name)
+
+    @event.listens_for(engine, "handle_error")
+    def _count_pre_ping_failure(context):
+        if context.is_pre_ping:
+            _stats_for(name).record_pre_ping_failure()
+
+
+def pool_metrics() -> List[Dict[str, Any]]:
+    """Occupancy and checkout counters for every instrumented pool in this process."""
+    metrics = []
+    for name, engine in _engines.items():
+        pool = engine.pool
+        stats = _stats_for(name)
+        queued = isinstance(pool, QueuePool)
+        metrics.append({
+            "pool": name,
+            "class": type(pool).__name__,
+            "size": pool.size() if queued else None,
+            "checked_out": pool.checkedout() if queued else None,
+            "idle": pool.checkedin() if queued else None,
+            "overflow": max(pool.overflow(), 0) if queued else None,
+            "checkouts": stats.checkouts,
+            "wait_ms_avg": round(stats.wait_seconds_total / stats.checkouts * 1000, 2) if stats.checkouts else 0.0,
+            "wait_ms_max": round(stats.wait_seconds_max * 1000, 2),
+            "slow_checkouts": stats.slow_checkouts,
+            "pool_timeouts": stats.pool_timeouts,
+            "pre_ping_failures": stats.pre_ping_failures,
+        })
+    return metrics
@@ -0,0 +1,247 @@
+"""
+Columnar snapshot of the properties table for analytics: Parquet files partitioned by
+municipality (Hive layout, municipality=<town>/part-0.parquet), so notebooks and the analysis
+scripts read a local dataset (pyarrow.dataset / pandas.read_parquet, memory-mapped) instead of
+pulling every parcel out of Postgres on each run.
+
+Each build goes to its own directory and only becomes current once complete (current.json
+is replaced atomically), so downloads in progress never see a half-written snapshot. The
+previous build is kept for in-flight downloads; older ones are removed.
+
+Build nightly with scripts/data_migration/build_property_snapshot.py (cron), or on demand
+with POST /api/snapshot/build. Configure with environment variables:
+  PROPERTY_SNAPSHOT_DIR    where snapshots are written (default: <tmp>/ctmaps_snapshot)
+"""
+import importlib.util
+import io
+import json
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import quote
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Property
+
+logger = logging.getLogger(__name__)
+
+# Rows per server-side cursor fetch and per Parquet row group flush
+SNAPSHOT_BATCH_ROWS = 20000
+# Builds kept on disk (current + previous, so in-flight downloads finish)
+SNAPSHOT_KEEP_BUILDS = 2
+# Partition directory for parcels without a municipality (Hive convention)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Property columns in the snapshot: everything scalar except owner contact details (kept
+# out of bulk downloads, as in the exports), the geometry, the raw additional_data JSON and
+# the *_norm filter columns (copies of other columns). The parcel centroid is included for
+# mapping. municipality is the partition key.
+_EXCLUDED_COLUMNS = {
+    "owner_phone", "owner_email", "geometry", "additional_data", "municipality",
+    "municipality_norm", "owner_state_norm", "owner_city_norm", "zoning_norm", "unit_type_norm",
+}
+SNAPSHOT_COLUMNS = [c.name for c in Property.__table__.columns if c.name not in _EXCLUDED_COLUMNS]
+
+
+def pyarrow_available() -> bool:
+    # pyarrow is needed to build snapshots; serving existing ones only reads files
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    arrow_types = {str: pa.string(), int: pa.int64(), float: pa.float64(), date: pa.date32()}
+    fields = [
+        pa.field(name, arrow_types[getattr(Property, name).type.python_type])
+        for name in SNAPSHOT_COLUMNS
+    ]
+    fields += [pa.field("centroid_lat", pa.float64()), pa.field("centroid_lng", pa.float64())]
+    return pa.schema(fields)
+
+
+def snapshot_partitioning():
+    """pyarrow partitioning for reading a snapshot directory (municipality as a plain string column)."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(pa.schema([pa.field("municipality", pa.string())]), flavor="hive")
+
+
+class PropertySnapshots:
+    """Builds and locates municipality-partitioned Parquet snapshots under one directory."""
+
+    def __init__(self, snapshot_dir: str):
+        self._dir = Path(snapshot_dir)
+        self._build_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "PropertySnapshots":
+        """Build from PROPERTY_SNAPSHOT_DIR."""
+        return cls(os.getenv("PROPERTY_SNAPSHOT_DIR") or os.path.join(tempfile.gettempdir(), "ctmaps_snapshot"))
+
+    @property
+    def building(self) -> bool:
+        return self._build_lock.locked()
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        """Manifest of the current snapshot, or None if none has been built."""
+        try:
+            with open(self._dir / "current.json", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def build_dir(self, manifest: Dict[str, Any]) -> Path:
+        return self._dir / manifest["build_id"]
+
+    def partition_path(self, manifest: Dict[str, Any], municipality: str) -> Optional[Path]:
+        """Parquet file for one municipality (case-insensitive), or None if not in the snapshot."""
+        for partition in manifest["partitions"]:
+            if (partition["municipality"] or "").lower() == municipality.strip().lower():
+                return self.build_dir(manifest) / partition["path"]
+        return None
+
+    def start_build(self, session_factory: Callable[[], Session]) -> bool:
+        """Build in a background thread. Returns False if a build is already running in this process."""
+        if not self._build_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            db = session_factory()
+            try:
+                self._build_locked(db)
+            except Exception:
+                logger.exception("Property snapshot build failed")
+            finally:
+                db.close()
+                self._build_lock.release()
+
+        threading.Thread(target=run, name="property-snapshot", daemon=True).start()
+        return True
+
+    def build(self, db: Session, progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        """Build a snapshot from db, make it current, and return its manifest (blocking)."""
+        with self._build_lock:
+            return self._build_locked(db, progress)
+
+    def _build_locked(self, db: Session, progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+        import pyarrow.parquet as pq
+
+        schema = _arrow_schema()
+        build_id = datetime.now().strftime("%Y%m%dT%H%M%S%f") + "-" + uuid.uuid4().hex[:8]
+        build_dir = self._dir / build_id
+        build_dir.mkdir(parents=True)
+
+        # Ordered by town so one partition file is open at a time
+        town = func.nullif(func.trim(Property.municipality), "")
+        query = (
+            db.query(
+                town.label("municipality"),
+                *[getattr(Property, name) for name in SNAPSHOT_COLUMNS],
+                func.ST_Y(func.ST_Centroid(Property.geometry)).label("centroid_lat"),
+                func.ST_X(func.ST_Centroid(Property.geometry)).label("centroid_lng"),
+            )
+            .order_by(town, Property.id)
+        )
+
+        partitions: List[Dict[str, Any]] = []
+        writer = None
+        current_town = object()
+        columns: Dict[str, list] = {name: [] for name in schema.names}
+        total_rows = 0
+        try:
+            for row in query.yield_per(SNAPSHOT_BATCH_ROWS):
+                if row[0] != current_town:
+                    if writer is not None:
+                        self._flush(writer, columns, schema)
+                        writer.close()
+                    current_town = row[0]
+                    relative_path = f"municipality={quote(current_town, safe='') if current_town else NULL_PARTITION}/part-0.parquet"
+                    (build_dir / relative_path).parent.mkdir()
+                    writer = pq.ParquetWriter(build_dir / relative_path, schema, compression="zstd")
+                    partitions.append({"municipality": current_town, "path": relative_path, "rows": 0})
+                for name, value in zip(schema.names, row[1:]):
+                    columns[name].append(value)
+                partitions[-1]["rows"] += 1
+                total_rows += 1
+                if len(columns[schema.names[0]]) >= SNAPSHOT_BATCH_ROWS:
+                    self._flush(writer, columns, schema)
+                    if progress is not None:
+                        progress(total_rows)
+            if writer is not None:
+                self._flush(writer, columns, schema)
+                writer.close()
+        except BaseException:
+            if writer is not None:
+                writer.close()
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+
+        for partition in partitions:
+            partition["bytes"] = (build_dir / partition["path"]).stat().st_size
+        manifest = {
+            "build_id": build_id,
+            "created_at": datetime.now().isoformat(),
+            "format": "parquet",
+            "partitioning": "hive",
+            "row_count": total_rows,
+            "columns": ["municipality"] + schema.names,
+            "partitions": partitions,
+        }
+        self._write_json(build_dir / "_manifest.json", manifest)
+        self._write_json(self._dir / "current.json", manifest)
+        self._remove_old_builds(keep=build_id)
+        logger.info("Property snapshot %s built: %d rows in %d partitions", build_id, total_rows, len(partitions))
+        return manifest
+
+    @staticmethod
+    def _flush(writer, columns: Dict[str, list], schema) -> None:
+        import pyarrow as pa
+
+        if columns[schema.names[0]]:
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            for values in columns.values():
+                values.clear()
+
+    def _remove_old_builds(self, keep: str) -> None:
+        # Build ids start with their timestamp, so name order is build order
+        builds = sorted(
+            path for path in self._dir.iterdir()
+            if path.is_dir() and path.name != keep and (path / "_manifest.json").exists()
+        )
+        for path in builds[:-(SNAPSHOT_KEEP_BUILDS - 1)]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any]) -> None:
+        # Write-then-rename so readers in other workers never see a partial file
+        tmp_path = path.with_suffix(f".json.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, path)
+
+    def iter_archive(self, manifest: Dict[str, Any], chunk_bytes: int = 1024 * 1024) -> Iterator[bytes]:
+        """Stream the whole snapshot (manifest + partitions, Hive layout) as an uncompressed tar."""
+        build_dir = self.build_dir(manifest)
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w|", bufsize=chunk_bytes) as archive:
+            for relative_path in ["_manifest.json"] + [p["path"] for p in manifest["partitions"]]:
+                archive.add(build_dir / relative_path, arcname=f"properties/{relative_path}")
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        yield buffer.getvalue()
+
+
+# Singleton used by routes
+property_snapshots = PropertySnapshots.from_env()
@@ -0,0 +1,163 @@
+"""
+Stop abandoned requests from consuming database capacity.
+The frontend aborts stale searches and autocomplete calls (pan, zoom, typing) but a
+running statement keeps its pooled connection busy until it completes. run_cancellable()
+runs a route's blocking DB work in a worker thread while watching for the client to
+disconnect; on disconnect it cancels the session's in-flight statement (the libpq cancel
+request, same effect as pg_cancel_backend) and blocks any further statements on it.
+await_cancellable() does the same for async (asyncpg) work: cancelling the task makes
+asyncpg send the cancel request for its running statement.
+"""
+import asyncio
+import contextlib
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# How often a waiting request checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = 0.25
+
+# Status returned for abandoned requests (nginx's "client closed request"; nobody reads it)
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ClientDisconnected(Exception):
+    """The client went away; the request's queries were cancelled."""
+
+
+class QueryCanceller:
+    """
+    Cancels statements running on the sessions attached to one request.
+    Attach/detach and cancel share a lock, so a cancel can never reach a connection
+    after it has been returned to the pool and handed to another request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connections: Dict[int, Any] = {}
+        self.cancelled = False
+
+    @contextlib.contextmanager
+    def attach(self, db: Session) -> Iterator[None]:
+        """Make db's statements cancellable for the duration of the block (checks out its connection)."""
+        connection = db.connection()
+        driver_connection = connection.connection.driver_connection
+        with self._lock:
+            if self.cancelled:
+                raise ClientDisconnected()
+            self._connections[id(driver_connection)] = driver_connection
+        event.listen(connection, "before_cursor_execute", self._refuse_after_cancel)
+        try:
+            yield
+        finally:
+            event.remove(connection, "before_cursor_execute", self._refuse_after_cancel)
+            with self._lock:
+                self._connections.pop(id(driver_connection), None)
+
+    def _refuse_after_cancel(self, *args) -> None:
+        # Statements issued between the cancel and the worker noticing it never reach Postgres
+        if self.cancelled:
+            raise ClientDisconnected()
+
+    def cancel(self) -> int:
+        """Cancel in-flight statements on all attached sessions. Returns how many were signalled."""
+        with self._lock:
+            self.cancelled = True
+            for driver_connection in self._connections.values():
+                try:
+                    driver_connection.cancel()
+                except Exception as e:
+                    logger.warning("Query cancel failed: %s", e)
+            return len(self._connections)
+
+
+class TaskCanceller:
+    """QueryCanceller counterpart for asyncio tasks doing async DB work: cancel() cancels the tasks."""
+
+    def __init__(self, tasks):
+        self._tasks = list(tasks)
+        self.cancelled = False
+
+    def cancel(self) -> int:
+        self.cancelled = True
+        return sum(1 for task in self._tasks if task.cancel())
+
+
+async def run_cancellable(
+    request: Request,
+    db: Session,
+    fn: Callable[..., T],
+    *args: Any,
+    executor: Optional[Any] = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Run fn(*args, **kwargs) (blocking work on db) in a worker thread. If the client disconnects
+    first, cancel db's statement, wait for the worker to unwind, and raise ClientDisconnected.
+    """
+    canceller = QueryCanceller()
+
+    def work() -> T:
+        with canceller.attach(db):
+            return fn(*args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor, work)
+    await wait_or_cancel(request, canceller, [future])
+    return future.result()
+
+
+async def await_cancellable(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await async DB work as a task. If the client disconnects first, cancel the task (and with
+    it the running statement), wait for it to unwind, and raise ClientDisconnected.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        await wait_or_cancel(request, TaskCanceller([task]), [task])
+    finally:
+        # The request itself was cancelled (server shutdown): do not leave the query running
+        task.cancel()
+    return task.result()
+
+
+async def wait_or_cancel(
+    request: Request,
+    canceller: QueryCanceller,
+    futures,
+    timeout: Optional[float] = None,
+):
+    """
+    Wait for futures (up to timeout) while polling the client connection. On disconnect, cancel
+    canceller's statements, wait for the futures to finish, and raise ClientDisconnected.
+    Returns (done, pending) like asyncio.wait.
+    """
+    futures = set(futures)
+    deadline = None if timeout is None else asyncio.get_running_loop().time() + timeout
+    pending = futures
+    while pending:
+        wait_for = DISCONNECT_POLL_SECONDS
+        if deadline is not None:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            wait_for = min(wait_for, remaining)
+        _done, pending = await asyncio.wait(pending, timeout=wait_for)
+        if pending and await request.is_disconnected():
+            cancelled = canceller.cancel()
+            logger.info("Client disconnected from %s; cancelled %d statement(s)", request.url.path, cancelled)
+            # Workers still hold their sessions; let them unwind before the request cleans up
+            await asyncio.wait(pending)
+            for future in pending:
+                if not future.cancelled():
+                    future.exception()  # Expected (cancelled statement); retrieved so asyncio does not log it
+            raise ClientDisconnected()
+    return futures - pending, pending
@@ -0,0 +1,109 @@
+"""
+Persisted search results ("result handles"). Materializing a search stores its ordered matching
+property ids once (result_set_items, an UNLOGGED table); later pages, the total and exports read
+by handle, turning each into a primary-key range lookup instead of re-running the filters.
+Living in Postgres, a handle works from every uvicorn worker.
+
+A result set expires once unused for the TTL (each access extends it); expired sets are
+removed whenever a new one is created.
+
+Configure with environment variables:
+  RESULT_SET_TTL_MINUTES   idle lifetime of a result set (default 30)
+  RESULT_SET_MAX_ROWS      largest search that can be materialized (default 250000)
+"""
+import os
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from models import Property, ResultSet, ResultSetItem
+
+_HANDLE_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ResultSetTooLarge(Exception):
+    """The search matches more rows than RESULT_SET_MAX_ROWS."""
+
+
+class ResultSets:
+    """Creates, reads and expires materialized search results."""
+
+    def __init__(self, ttl_seconds: float = 30 * 60, max_rows: int = 250000):
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+
+    @classmethod
+    def from_env(cls) -> "ResultSets":
+        """Build from RESULT_SET_TTL_MINUTES / RESULT_SET_MAX_ROWS."""
+        return cls(
+            ttl_seconds=float(os.getenv("RESULT_SET_TTL_MINUTES", "30")) * 60,
+            max_rows=int(os.getenv("RESULT_SET_MAX_ROWS", "250000")),
+        )
+
+    def create(self, db: Session, query, filters: Dict[str, Any]) -> ResultSet:
+        """
+        Store the ids matched by query (a filtered Property query) in id order and commit.
+        Raises ResultSetTooLarge (after rolling back) if more than max_rows match.
+        """
+        self.cleanup_expired(db)
+        handle = uuid.uuid4().hex
+        ids = query.with_entities(Property.id.label("id")).order_by(Property.id).limit(self.max_rows + 1).subquery()
+        total = db.execute(
+            insert(ResultSetItem).from_select(
+                ["handle", "position", "property_id"],
+                select(literal(handle), func.row_number().over(order_by=ids.c.id), ids.c.id),
+            )
+        ).rowcount
+        if total > self.max_rows:
+            db.rollback()
+            raise ResultSetTooLarge(f"Search matches more than {self.max_rows:,} properties; narrow the filters to save it.")
+        result_set = ResultSet(handle=handle, filters=filters, total=total, expires_at=self._expiry())
+        db.add(result_set)
+        db.commit()
+        return result_set
+
+    def get(self, db: Session, handle: str) -> Optional[ResultSet]:
+        """The live result set for handle (extending its expiry), or None if unknown or expired."""
+        if not _HANDLE_PATTERN.match(handle or ""):
+            return None
+        result_set = db.query(ResultSet).filter(ResultSet.handle == handle, ResultSet.expires_at > func.now()).first()
+        if result_set is not None:
+            db.execute(update(ResultSet).where(ResultSet.handle == handle).values(expires_at=self._expiry()))
+            db.commit()
+        return result_set
+
+    def page_ids(self, db: Session, handle: str, offset: int, limit: int) -> List[int]:
+        """Property ids at positions offset+1 .. offset+limit, in result order."""
+        return list(db.execute(
+            select(ResultSetItem.property_id)
+            .where(
+                ResultSetItem.handle == handle,
+                ResultSetItem.position > offset,
+                ResultSetItem.position <= offset + limit,
+            )
+            .order_by(ResultSetItem.position)
+        ).scalars())
+
+    @staticmethod
+    def restrict(query, handle: str):
+        """Limit a query over Property columns to a result set's rows, in result order."""
+        return query.join(
+            ResultSetItem,
+            and_(ResultSetItem.property_id == Property.id, ResultSetItem.handle == handle),
+        ).order_by(ResultSetItem.position)
+
+    def cleanup_expired(self, db: Session) -> None:
+        expired = select(ResultSet.handle).where(ResultSet.expires_at <= func.now())
+        db.execute(delete(ResultSetItem).where(ResultSetItem.handle.in_(expired)))
+        db.execute(delete(ResultSet).where(ResultSet.expires_at <= func.now()))
+
+    def _expiry(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+
+
+# Singleton used by routes
+result_sets = ResultSets.from_env()
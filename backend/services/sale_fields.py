@@ -0,0 +1,95 @@
+"""
+Date-relative derived fields on properties: days_since_sale and sale_bucket (the
+time-since-sale ranges offered by search, as an indexed column so those filters are
+equality checks). Equity is not refreshed here: equity_amount / equity_pct are generated
+columns that Postgres keeps current on every write.
+
+Imports do not compute them, and days_since_sale/sale_bucket drift as days pass, so
+scripts/data_migration/refresh_sale_fields.py recomputes them nightly (cron) in id-range
+batches, writing only rows whose stored values differ from today's. Town imports refresh
+their own rows.
+
+Functions execute on a Session or Connection and do not commit; the caller owns the transaction.
+"""
+from datetime import date
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+
+# (bucket, upper bound in days since sale, inclusive; None = open-ended), in order.
+# Boundaries match the time_since_sale cutoffs: "Last 2 Years" is a sale on or after today - 730 days.
+SALE_BUCKET_RANGES = [
+    ("0-2y", 730),
+    ("2-5y", 1825),
+    ("5-10y", 3650),
+    ("10-20y", 7300),
+    ("20y+", None),
+]
+NEVER_SOLD_BUCKET = "never"
+
+# time_since_sale / sales_history option -> sale_bucket
+TIME_SINCE_SALE_BUCKETS = {
+    "Last 2 Years": "0-2y",
+    "2-5 Years Ago": "2-5y",
+    "5-10 Years Ago": "5-10y",
+    "10-20 Years Ago": "10-20y",
+    "20+ Years Ago": "20y+",
+    "Never Sold": NEVER_SOLD_BUCKET,
+}
+
+
+def _bucket_case(days_sql: str) -> str:
+    whens = " ".join(
+        f"WHEN {days_sql} <= {max_days} THEN '{bucket}'" if max_days is not None else f"ELSE '{bucket}'"
+        for bucket, max_days in SALE_BUCKET_RANGES
+    )
+    return f"CASE WHEN last_sale_date IS NULL THEN '{NEVER_SOLD_BUCKET}' {whens} END"
+
+
+_DAYS = "(CAST(:today AS date) - last_sale_date)"
+
+_REFRESH_UPDATE = f"""
+    UPDATE properties p
+    SET days_since_sale = d.days_since_sale, sale_bucket = d.sale_bucket
+    FROM (
+        SELECT id,
+               {_DAYS} AS days_since_sale,
+               {_bucket_case(_DAYS)} AS sale_bucket
+        FROM properties
+        WHERE TRUE {{scope}}
+    ) d
+    WHERE p.id = d.id
+      AND (p.days_since_sale IS DISTINCT FROM d.days_since_sale
+           OR p.sale_bucket IS DISTINCT FROM d.sale_bucket)
+"""
+
+
+def id_bounds(db) -> Optional[Tuple[int, int]]:
+    """(min id, max id) of properties, or None if the table is empty."""
+    row = db.execute(text("SELECT MIN(id), MAX(id) FROM properties")).first()
+    return None if row[0] is None else (row[0], row[1])
+
+
+def refresh_sale_fields(
+    db,
+    id_start: Optional[int] = None,
+    id_end: Optional[int] = None,
+    municipality: Optional[str] = None,
+    today: Optional[date] = None,
+) -> int:
+    """
+    Recompute the derived fields for properties with id in [id_start, id_end) and/or in one
+    municipality (all rows if neither is given). Returns the number of rows actually changed.
+    """
+    params = {"today": today or date.today()}
+    scope = ""
+    if id_start is not None:
+        scope += " AND id >= :id_start"
+        params["id_start"] = id_start
+    if id_end is not None:
+        scope += " AND id < :id_end"
+        params["id_end"] = id_end
+    if municipality:
+        scope += " AND LOWER(TRIM(municipality)) = LOWER(TRIM(:municipality))"
+        params["municipality"] = municipality
+    return db.execute(text(_REFRESH_UPDATE.format(scope=scope)), params).rowcount
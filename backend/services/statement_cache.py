@@ -0,0 +1,87 @@
+"""
+Statement reuse for the hot read queries. SQLAlchemy caches compiled SQL per engine, keyed
+by the statement's structure, and asyncpg keeps a prepared statement per connection for
+each distinct SQL string. Both only pay off when a query keeps the same shape from request
+to request, so multi-value filters bind one array parameter instead of one clause (or one
+IN placeholder) per value:
+
+    query.filter(func.lower(Property.municipality) == any_of(["hartford", "avon"]))
+    query.filter(Property.zoning.ilike(any_of(["%R-1%", "%R-2%"])))
+
+Both compile to the same SQL for any number of values (`= ANY(%(param)s::TEXT[])`).
+
+count_cache_hits() counts compiled-cache hits and misses per engine; GET /health/metrics reports
+them with the cache size (DB_QUERY_CACHE_SIZE in database.py). Counts are per worker process.
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import Text, any_, event, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+
+def split_values(value: Optional[str]) -> List[str]:
+    """Non-empty, stripped values of a comma-separated query parameter."""
+    if not value:
+        return []
+    return [v.strip() for v in str(value).split(",") if v.strip()]
+
+
+def any_of(values: Iterable[Any], item_type=Text):
+    """ANY(<one array bind parameter>): compare a column with any of values in a fixed-shape predicate."""
+    return any_(literal(list(values), ARRAY(item_type)))
+
+
+class CacheStats:
+    """Compiled-cache outcomes of one engine's statements (thread-safe)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0  # No cache key (e.g. exec_driver_sql) or caching disabled
+        self._lock = threading.Lock()
+
+    def record(self, cache_hit) -> None:
+        with self._lock:
+            if cache_hit == CACHE_HIT:
+                self.hits += 1
+            elif cache_hit == CACHE_MISS:
+                self.misses += 1
+            else:
+                self.uncached += 1
+
+
+_stats: Dict[str, CacheStats] = {}
+_engines: Dict[str, Any] = {}
+
+
+def count_cache_hits(name: str, engine) -> None:
+    """Count compiled-cache hits for a sync Engine (or an AsyncEngine's sync_engine)."""
+    stats = _stats.setdefault(name, CacheStats(name))
+    _engines[name] = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_cache_hit(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            stats.record(context.cache_hit)
+
+
+def statement_cache_metrics() -> List[Dict[str, Any]]:
+    """Compiled-cache hit rate and occupancy for every instrumented engine in this process."""
+    metrics = []
+    for name, engine in _engines.items():
+        stats = _stats[name]
+        cached = stats.hits + stats.misses
+        compiled_cache = engine._compiled_cache
+        metrics.append({
+            "engine": name,
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "uncached": stats.uncached,
+            "hit_rate": round(stats.hits / cached, 4) if cached else None,
+            "entries": len(compiled_cache) if compiled_cache is not None else 0,
+            "capacity": compiled_cache.capacity if compiled_cache is not None else 0,
+        })
+    return metrics
@@ -0,0 +1,143 @@
+"""
+Statement timeout policy: a time budget per route class, applied with SET LOCAL semantics
+(set_config(..., is_local => true)) inside the request's transaction. The setting ends with
+the transaction, so there is no reset round trip and nothing can leak onto a pooled
+connection if the request fails halfway.
+
+    async with statement_timeouts.scope(db, "options"):
+        rows = (await db.execute(query)).all()
+
+A statement that runs out of budget raises StatementTimeout (main.py answers 504 unless the
+route handles it, e.g. options lists return [] instead). Sync request sessions use apply()
+from a dependency instead. Timeouts are counted per route class in the shared store
+(services/local_store.py), so the counts cover every worker; GET /health/metrics reports them.
+
+Configure with environment variables (milliseconds, 0 = no limit):
+  STATEMENT_TIMEOUT_OPTIONS_MS        towns/zoning/unit-type/owner lists (default 10000)
+  STATEMENT_TIMEOUT_AUTOCOMPLETE_MS   each autocomplete source (default 2000; the per-source
+                                      budgets in autocomplete.py take precedence)
+  STATEMENT_TIMEOUT_SEARCH_MS         map search and filter pages (default 55000, under the
+                                      frontend's 60s request timeout)
+"""
+import logging
+import os
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from services.local_store import LocalStore, shared_store_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGETS_MS = {
+    "options": 10000,
+    "autocomplete": 2000,
+    "search": 55000,
+}
+
+# SQLSTATE query_canceled: raised for statement_timeout and for pg_cancel_backend (the
+# client-disconnect cancel), which the message tells apart
+_QUERY_CANCELED = "57014"
+
+_SET_TIMEOUT = text("SELECT set_config('statement_timeout', :timeout, true)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS statement_timeouts (
+    route_class TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+"""
+
+
+class StatementTimeout(Exception):
+    """A statement exceeded its route class's budget."""
+
+    def __init__(self, route_class: str, budget_ms: int):
+        super().__init__(f"Query exceeded the {budget_ms}ms {route_class} time budget")
+        self.route_class = route_class
+        self.budget_ms = budget_ms
+
+
+def is_statement_timeout(exc: BaseException) -> bool:
+    """True for a DB error caused by statement_timeout (psycopg2 or asyncpg)."""
+    if not isinstance(exc, DBAPIError):
+        return False
+    orig = exc.orig
+    sqlstate = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if sqlstate is None and orig is not None:
+        # asyncpg errors arrive wrapped in SQLAlchemy's adapter exception
+        sqlstate = getattr(orig.__cause__, "sqlstate", None)
+    return sqlstate == _QUERY_CANCELED and "statement timeout" in str(orig)
+
+
+class StatementTimeouts:
+    """Per-route-class budgets, scoped to the current transaction, with shared timeout counters."""
+
+    def __init__(self, budgets_ms: Dict[str, int], store: LocalStore):
+        self.budgets_ms = budgets_ms
+        self._store = store
+
+    @classmethod
+    def from_env(cls) -> "StatementTimeouts":
+        """Build from STATEMENT_TIMEOUT_<CLASS>_MS, counting in <SHARED_STORE_DIR>/metrics.sqlite3."""
+        budgets = {
+            route_class: int(os.getenv(f"STATEMENT_TIMEOUT_{route_class.upper()}_MS", str(default)))
+            for route_class, default in DEFAULT_BUDGETS_MS.items()
+        }
+        return cls(budgets, LocalStore(shared_store_dir() / "metrics.sqlite3", _SCHEMA))
+
+    def budget_ms(self, route_class: str, budget_ms: Optional[int] = None) -> int:
+        return self.budgets_ms[route_class] if budget_ms is None else budget_ms
+
+    @asynccontextmanager
+    async def scope(self, db: AsyncSession, route_class: str, budget_ms: Optional[int] = None):
+        """Bound the statements run on db in this block (and the rest of its transaction)."""
+        budget = self.budget_ms(route_class, budget_ms)
+        await db.execute(_SET_TIMEOUT, {"timeout": f"{budget}ms"})
+        try:
+            yield
+        except DBAPIError as e:
+            if is_statement_timeout(e):
+                self.record_timeout(route_class)
+                raise StatementTimeout(route_class, budget) from e
+            raise
+
+    def apply(self, db: Session, route_class: str, request: Optional[Request] = None) -> None:
+        """
+        Bound the rest of a sync Session's transaction (for request-scoped sessions, e.g. a
+        dependency). With request, main.py's database error handler counts a timeout under
+        route_class and answers 504.
+        """
+        budget = self.budget_ms(route_class)
+        db.execute(_SET_TIMEOUT, {"timeout": f"{budget}ms"})
+        if request is not None:
+            request.state.statement_timeout_class = route_class
+
+    def record_timeout(self, route_class: str) -> None:
+        logger.warning("Statement timeout in %s (budget %dms)", route_class, self.budgets_ms.get(route_class, 0))
+        try:
+            self._store.connection().execute(
+                "INSERT INTO statement_timeouts (route_class, count) VALUES (?, 1) "
+                "ON CONFLICT (route_class) DO UPDATE SET count = count + 1",
+                (route_class,),
+            )
+        except sqlite3.Error as e:
+            logger.warning("Could not record statement timeout: %s", e)
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        """Budget and timeouts so far (all workers) per route class."""
+        counts = dict(self._store.connection().execute("SELECT route_class, count FROM statement_timeouts"))
+        return {
+            route_class: {"budget_ms": budget, "timeouts": counts.get(route_class, 0)}
+            for route_class, budget in self.budgets_ms.items()
+        }
+
+
+# Singleton used by routes
+statement_timeouts = StatementTimeouts.from_env()
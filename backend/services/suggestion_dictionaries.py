@@ -0,0 +1,141 @@
+"""
+Maintenance for the autocomplete dictionary tables (distinct_addresses, distinct_owners,
+distinct_owner_mailing). Suggestion queries read these instead of grouping the full
+properties table on every keystroke.
+
+- rebuild_all(db): recompute everything (migration script, or after bulk data fixes).
+- snapshot_keys(db, municipality) + refresh_municipality(db, municipality, previous):
+  incremental refresh after a town import. Owners and mailing addresses span towns, so
+  the refresh recomputes every key that appears in the town before or after the import.
+
+Functions execute on a Session or Connection and do not commit; the caller owns the transaction.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+# GiST trigram indexes: serve ILIKE '%q%' substring matches and <<-> KNN fuzzy ordering.
+# Created by scripts/data_migration/build_suggestion_dictionaries.py (requires pg_trgm).
+TRIGRAM_INDEXES = [
+    ("idx_distinct_addresses_search_trgm", "distinct_addresses", "search_text"),
+    ("idx_distinct_addresses_municipality_trgm", "distinct_addresses", "municipality"),
+    ("idx_distinct_owners_owner_name_trgm", "distinct_owners", "owner_name"),
+    ("idx_distinct_owner_mailing_full_address_trgm", "distinct_owner_mailing", "full_address"),
+]
+
+_ADDRESS_INSERT = """
+    INSERT INTO distinct_addresses (address, municipality, search_text, property_count, first_property_id, center_lat, center_lng)
+    SELECT g.address, g.municipality, g.address || ' ' || g.municipality, g.cnt, g.first_id,
+           ST_Y(ST_Centroid(p.geometry)), ST_X(ST_Centroid(p.geometry))
+    FROM (
+        SELECT address, TRIM(municipality) AS municipality, MIN(id) AS first_id, COUNT(*) AS cnt
+        FROM properties
+        WHERE address IS NOT NULL AND address <> '' {scope}
+        GROUP BY address, TRIM(municipality)
+    ) g
+    JOIN properties p ON p.id = g.first_id
+"""
+
+_OWNER_INSERT = """
+    INSERT INTO distinct_owners (owner_name, property_count, first_property_id, center_lat, center_lng)
+    SELECT owner_name, COUNT(*), MIN(id),
+           ST_Y(ST_Centroid(ST_Collect(geometry))), ST_X(ST_Centroid(ST_Collect(geometry)))
+    FROM properties
+    WHERE owner_name IS NOT NULL AND owner_name <> '' {scope}
+    GROUP BY owner_name
+"""
+
+_MAILING_INSERT = """
+    INSERT INTO distinct_owner_mailing (owner_address, owner_city, owner_state, full_address, property_count, first_property_id, center_lat, center_lng)
+    SELECT owner_address, owner_city, owner_state,
+           CONCAT_WS(', ', owner_address, NULLIF(owner_city, ''), NULLIF(owner_state, '')),
+           COUNT(*), MIN(id),
+           ST_Y(ST_Centroid(ST_Collect(geometry))), ST_X(ST_Centroid(ST_Collect(geometry)))
+    FROM (
+        SELECT id, geometry, owner_address, COALESCE(owner_city, '') AS owner_city, COALESCE(owner_state, '') AS owner_state
+        FROM properties
+        WHERE owner_address IS NOT NULL AND owner_address <> ''
+    ) p
+    WHERE TRUE {scope}
+    GROUP BY owner_address, owner_city, owner_state
+"""
+
+_TOWN_SCOPE = "AND LOWER(TRIM(municipality)) = LOWER(TRIM(:municipality))"
+
+
+def rebuild_all(db) -> Dict[str, int]:
+    """Replace all three dictionaries from properties. Returns row counts per table."""
+    counts = {}
+    for table, insert_sql in (
+        ("distinct_addresses", _ADDRESS_INSERT),
+        ("distinct_owners", _OWNER_INSERT),
+        ("distinct_owner_mailing", _MAILING_INSERT),
+    ):
+        db.execute(text(f"DELETE FROM {table}"))
+        counts[table] = db.execute(text(insert_sql.format(scope=""))).rowcount
+    return counts
+
+
+def snapshot_keys(db, municipality: str) -> Dict[str, List]:
+    """Owner names and mailing keys currently in a town (take before an import modifies it)."""
+    params = {"municipality": municipality}
+    owner_names = [
+        r[0] for r in db.execute(text(
+            f"SELECT DISTINCT owner_name FROM properties WHERE owner_name IS NOT NULL AND owner_name <> '' {_TOWN_SCOPE}"
+        ), params)
+    ]
+    mailing = db.execute(text(
+        "SELECT DISTINCT owner_address, COALESCE(owner_city, ''), COALESCE(owner_state, '') FROM properties "
+        f"WHERE owner_address IS NOT NULL AND owner_address <> '' {_TOWN_SCOPE}"
+    ), params).fetchall()
+    return {
+        "owner_names": owner_names,
+        "mailing_addresses": [r[0] for r in mailing],
+        "mailing_cities": [r[1] for r in mailing],
+        "mailing_states": [r[2] for r in mailing],
+    }
+
+
+def refresh_municipality(db, municipality: str, previous: Optional[Dict[str, List]] = None) -> None:
+    """
+    Recompute dictionary rows touched by one town: all of its addresses, and every owner name
+    and mailing address found in the town now or in `previous` (from snapshot_keys).
+    """
+    params = {"municipality": municipality}
+
+    # Addresses are per town: replace the town's rows
+    db.execute(text("DELETE FROM distinct_addresses WHERE LOWER(municipality) = LOWER(TRIM(:municipality))"), params)
+    db.execute(text(_ADDRESS_INSERT.format(scope=_TOWN_SCOPE)), params)
+
+    current = snapshot_keys(db, municipality)
+    previous = previous or {}
+
+    # Owners: recompute counts/centers over all towns for every affected name
+    owner_names = sorted(set(current["owner_names"]) | set(previous.get("owner_names", [])))
+    if owner_names:
+        names = {"names": owner_names}
+        db.execute(text("DELETE FROM distinct_owners WHERE owner_name = ANY(:names)"), names)
+        db.execute(text(_OWNER_INSERT.format(scope="AND owner_name = ANY(:names)")), names)
+
+    # Mailing addresses: same, keyed on (owner_address, owner_city, owner_state)
+    addresses = current["mailing_addresses"] + previous.get("mailing_addresses", [])
+    cities = current["mailing_cities"] + previous.get("mailing_cities", [])
+    states = current["mailing_states"] + previous.get("mailing_states", [])
+    if addresses:
+        db.execute(text("""
+            CREATE TEMP TABLE IF NOT EXISTS _mailing_keys (owner_address text, owner_city text, owner_state text)
+            ON COMMIT DROP
+        """))
+        db.execute(text("""
+            INSERT INTO _mailing_keys
+            SELECT DISTINCT * FROM unnest(CAST(:addresses AS text[]), CAST(:cities AS text[]), CAST(:states AS text[]))
+        """), {"addresses": addresses, "cities": cities, "states": states})
+        db.execute(text("""
+            DELETE FROM distinct_owner_mailing d
+            USING _mailing_keys k
+            WHERE d.owner_address = k.owner_address AND d.owner_city = k.owner_city AND d.owner_state = k.owner_state
+        """))
+        db.execute(text(_MAILING_INSERT.format(
+            scope="AND (owner_address, owner_city, owner_state) IN (SELECT owner_address, owner_city, owner_state FROM _mailing_keys)"
+        )))
+        db.execute(text("DROP TABLE IF EXISTS _mailing_keys"))
@@ -0,0 +1,180 @@
+"""
+Structured, sampled tracing for hot paths (autocomplete, import scripts).
+Callers never touch the filesystem: events go through a bounded in-memory queue and a
+background listener thread writes them as JSON lines. Off by default; when off, trace()
+returns after a single level check and lazy data callables are never evaluated.
+
+The queue and listener thread are created by the first event recorded in each process, not
+at import: gunicorn imports the app in the master (preload_app) and threads do not survive
+fork, so every worker starts its own listener.
+
+Configure with environment variables:
+  TRACE_LEVEL        OFF (default), DEBUG, INFO, WARNING or ERROR
+  TRACE_SAMPLE_RATE  fraction of events kept, 0.0-1.0 (default 1.0)
+  TRACE_LOG_PATH     JSON-lines output file (default: stderr)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Union
+
+# Events buffered before new ones are dropped (never block the caller)
+DEFAULT_QUEUE_SIZE = 10000
+
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+
+
+class _JsonLineFormatter(logging.Formatter):
+    """One JSON object per event: timestamp, level, location, message, data + extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "location": getattr(record, "trace_location", None),
+            "message": record.getMessage(),
+            "data": getattr(record, "trace_data", None),
+        }
+        event.update(getattr(record, "trace_fields", {}))
+        return json.dumps(event, default=str)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops events when the queue is full instead of raising."""
+
+    def __init__(self, q: "queue.Queue"):
+        super().__init__(q)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class Tracer:
+    """Level-gated, sampled event tracer backed by a QueueHandler/QueueListener pair."""
+
+    def __init__(
+        self,
+        level: Optional[int] = None,
+        sample_rate: float = 1.0,
+        path: Optional[str] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ):
+        self._level = level
+        self._sample_rate = max(0.0, min(1.0, sample_rate))
+        self._path = path
+        self._queue_size = queue_size
+        self._logger = logging.getLogger("ctmaps.trace")
+        self._logger.propagate = False
+        if level is not None:
+            self._logger.setLevel(level)
+        self._handler: Optional[_DroppingQueueHandler] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._pid: Optional[int] = None  # Process that owns the running listener
+        self._start_lock = threading.Lock()
+        atexit.register(self.stop)
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """Build a tracer from TRACE_LEVEL / TRACE_SAMPLE_RATE / TRACE_LOG_PATH."""
+        level = _LEVELS.get(os.getenv("TRACE_LEVEL", "OFF").strip().upper())
+        try:
+            sample_rate = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+        except ValueError:
+            sample_rate = 1.0
+        return cls(level=level, sample_rate=sample_rate, path=os.getenv("TRACE_LOG_PATH") or None)
+
+    def _ensure_started(self) -> None:
+        """Start this process's queue and listener thread (again after a fork)."""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._path:
+                os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+                target: logging.Handler = logging.FileHandler(self._path)
+            else:
+                target = logging.StreamHandler()
+            target.setFormatter(_JsonLineFormatter())
+            event_queue: "queue.Queue" = queue.Queue(maxsize=self._queue_size)
+            # A handler inherited from the parent feeds a queue no thread here reads
+            if self._handler is not None:
+                self._logger.removeHandler(self._handler)
+            self._handler = _DroppingQueueHandler(event_queue)
+            self._logger.addHandler(self._handler)
+            self._listener = logging.handlers.QueueListener(event_queue, target)
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def enabled(self, level: int = logging.DEBUG) -> bool:
+        """True when events at this level are recorded. Use to guard extra work done only for tracing."""
+        return self._level is not None and level >= self._level
+
+    def trace(
+        self,
+        location: str,
+        message: str,
+        data: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None,
+        level: int = logging.DEBUG,
+        **fields: Any,
+    ) -> None:
+        """Record one event. data may be a callable so it is only built for sampled events."""
+        if not self.enabled(level):
+            return
+        if self._sample_rate < 1.0 and random.random() >= self._sample_rate:
+            return
+        if callable(data):
+            data = data()
+        self._ensure_started()
+        self._logger.log(
+            level,
+            message,
+            extra={"trace_location": location, "trace_data": data, "trace_fields": fields},
+        )
+
+    @property
+    def dropped(self) -> int:
+        """Events dropped because the queue was full."""
+        return self._handler.dropped if self._handler else 0
+
+    def stop(self) -> None:
+        """Flush queued events and stop this process's listener thread."""
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+        self._listener = None
+        self._pid = None
+
+
+# Singleton used by routes and scripts
+tracer = Tracer.from_env()
+
+
+def trace(
+    location: str,
+    message: str,
+    data: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None,
+    level: int = logging.DEBUG,
+    **fields: Any,
+) -> None:
+    """Record a trace event on the shared tracer (no-op unless TRACE_LEVEL is set)."""
+    tracer.trace(location, message, data, level, **fields)
+
+
+def trace_enabled(level: int = logging.DEBUG) -> bool:
+    """True when the shared tracer records events at this level."""
+    return tracer.enabled(level)
@@ -289,6 +289,15 @@ export const propertyApi = {
     return response.data
   },
 
+  // Detail records for several properties in one request (multi-select, hover prefetch); max 500 ids
+  getPropertiesBatch: async (
+    ids: number[],
+    geometryMode: 'centroid' | 'full' = 'full'
+  ): Promise<{ properties: PropertyDetail[]; missing_ids: number[] }> => {
+    const response = await apiClient.post('/api/properties/batch', { ids, geometry_mode: geometryMode })
+    return response.data
+  },
+
   getPropertyByParcel: async (parcelId: string): Promise<PropertyDetail> => {
     const response = await apiClient.get(`/api/properties/parcel/${parcelId}`)
     return response.data